@@ -3,6 +3,14 @@ ASGI config for backend project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Serve through this rather than WSGI so /api/grievances/events/ can hold its
+Server-Sent Events streams open without tying up a worker per client. The
+Procfile runs it under gunicorn with uvicorn workers:
+
+    gunicorn backend.asgi:application -k uvicorn_worker.UvicornWorker
+
+Under WSGI the events view answers 501 and clients keep polling.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
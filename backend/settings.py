@@ -47,7 +47,8 @@ REST_FRAMEWORK = {
     ),
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.AllowAny',
-    ]
+    ],
+    'EXCEPTION_HANDLER': 'core.throttling.exception_handler',
 }
 
 MIDDLEWARE = [
@@ -95,6 +96,24 @@ DATABASES = {
     )
 }
 
+# Shared cache (must be shared by all gunicorn workers: SiteSettings invalidation,
+# response caching and throttling rely on it). Redis when REDIS_URL is set
+# (needs the `redis` package), otherwise a table in the main database.
+if os.getenv('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.getenv('REDIS_URL'),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+            'LOCATION': 'django_cache',
+        }
+    }
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -140,6 +159,8 @@ STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 AUTH_USER_MODEL = 'core.CustomUser'
+# Case-insensitive IDs with a single password check (replaces ModelBackend)
+AUTHENTICATION_BACKENDS = ['core.backends.CaseInsensitiveModelBackend']
 
 # Allow React to talk to Django
 CORS_ALLOW_ALL_ORIGINS = False
@@ -156,6 +177,22 @@ CSRF_TRUSTED_ORIGINS = [
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Uploads are stored once per unique content (core/storage.py)
+STORAGES = {
+    'default': {
+        'BACKEND': 'core.storage.ContentAddressedStorage',
+    },
+    'staticfiles': {
+        'BACKEND': STATICFILES_STORAGE,
+    },
+}
+
+# Let the front proxy send media bytes (see core/media.py):
+# 'nginx' -> X-Accel-Redirect to MEDIA_ACCEL_PREFIX (an `internal` location aliased to MEDIA_ROOT)
+# 'sendfile' -> X-Sendfile with the absolute path (Apache mod_xsendfile, lighttpd)
+MEDIA_ACCEL = os.getenv('MEDIA_ACCEL')
+MEDIA_ACCEL_PREFIX = '/protected-media/'
+
 # ==========================================
 # EMAIL CONFIGURATION (Add to settings.py)
 # ==========================================
@@ -163,6 +200,44 @@ EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
 EMAIL_HOST = 'smtp.gmail.com'
 EMAIL_PORT = 587
 EMAIL_USE_TLS = True
+# Seconds per SMTP socket operation, so a hung handshake cannot stall send_outbox forever
+EMAIL_TIMEOUT = int(os.getenv('EMAIL_TIMEOUT', '30'))
+# ==========================================
+# PASSWORD-HASHING ENDPOINTS (core/throttling.py)
+# ==========================================
+# Token buckets: (burst, refill per minute). Per IP is loose because a hostel shares
+# one NAT address; per username is tight (password / OTP guessing).
+HASHING_THROTTLE_RATES = {
+    'ip': (int(os.getenv('HASHING_IP_BURST', '60')), int(os.getenv('HASHING_IP_PER_MINUTE', '60'))),
+    'username': (int(os.getenv('HASHING_USER_BURST', '5')), int(os.getenv('HASHING_USER_PER_MINUTE', '5'))),
+}
+# Site-wide cap on requests hashing at once (default: CPU count). Over it -> 429 at once.
+HASHING_CONCURRENCY = int(os.getenv('HASHING_CONCURRENCY', '0')) or None
+
+# Cache GET responses of the dashboard endpoints (core/caching.py ResponseCache).
+# Only worth it with a memory cache, so it follows REDIS_URL unless set explicitly.
+RESPONSE_CACHE = os.getenv('RESPONSE_CACHE', '1' if os.getenv('REDIS_URL') else '0') == '1'
+
+# Live grievance updates (core/events.py). In-process by default; set this to a Redis URL
+# when running more than one ASGI worker so every worker sees every event.
+EVENTS_REDIS_URL = os.getenv('EVENTS_REDIS_URL')
+
 EMAIL_HOST_USER = os.getenv('EMAIL_HOST_USER')
 EMAIL_HOST_PASSWORD = os.getenv('EMAIL_HOST_PASSWORD')
-DEFAULT_FROM_EMAIL = f'Grievance Admin <{EMAIL_HOST_USER}>'
\ No newline at end of file
+DEFAULT_FROM_EMAIL = f'Grievance Admin <{EMAIL_HOST_USER}>'
+
+# ==========================================
+# AUTO-ESCALATION (core/escalation.py)
+# ==========================================
+# Pending grievances untouched for this long move one level up the chain
+ESCALATION_AFTER_DAYS = 7
+# current handler designation -> next level up (DIRECTOR is the top)
+ESCALATION_CHAIN = {
+    'Chief Warden': 'DSW',
+    'DSW': 'DIRECTOR',
+    'Chief Mess Coordinator': 'AO',
+    'Chief Medical Officer': 'AO',
+    'Chief Sports Coordinator': 'AO',
+    'Dean Academics': 'DIRECTOR',
+    'AO': 'DIRECTOR',
+}
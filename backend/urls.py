@@ -1,10 +1,10 @@
 from django.contrib import admin
-from django.urls import path
+from django.urls import path, re_path
 from django.conf import settings
-from django.conf.urls.static import static
 from core import views
+from core.media import serve_media
 from core.views import site_settings_api
-from core.views import send_otp_api, reset_password_with_otp
+from core.views import send_otp_api, otp_status_api, reset_password_with_otp
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -15,14 +15,27 @@ urlpatterns = [
     path('api/login/', views.login_api),
     path('api/register-student/', views.register_student),
     path('api/register-authority/', views.register_authority),
+    path('api/me/', views.me),
+    path('api/me/grievances/', views.me_grievances),
+    path('api/import/<str:kind>/', views.bulk_import),
     
     # Core Logic
     path('api/grievances/', views.grievance_api),
+    path('api/grievances/export/', views.export_grievances),
+    path('api/grievances/batch/', views.grievance_batch),
+    path('api/grievances/search/', views.search_grievances_api),
+    path('api/grievances/events/', views.grievance_events),
     path('api/stats/', views.dashboard_stats),
+    path('api/stats/performance/', views.authority_performance),
+    path('api/stats/trends/', views.grievance_trends),
+    path('api/stats/cache/', views.response_cache_stats),
     path('api/students/', views.manage_students),
     path('api/authorities/', views.manage_authorities),
     path('api/settings/', site_settings_api),
     path('api/forgot-password/send-otp/', send_otp_api),
+    path('api/forgot-password/status/', otp_status_api),
     path('api/forgot-password/reset/', reset_password_with_otp),
 
-] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
\ No newline at end of file
+    # Uploaded media (works with DEBUG = False; see core/media.py)
+    re_path(r'^%s(?P<path>.+)$' % settings.MEDIA_URL.lstrip('/'), serve_media),
+]
\ No newline at end of file
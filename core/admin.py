@@ -1,8 +1,11 @@
 from django.contrib import admin
-from .models import CustomUser, StudentProfile, AuthorityProfile, Grievance
+from .models import CustomUser, StudentProfile, AuthorityProfile, Grievance, EmailOutbox, Department, Category
 
 # This makes the forms appear in the Admin Panel
 admin.site.register(CustomUser)
 admin.site.register(StudentProfile)
 admin.site.register(AuthorityProfile)
-admin.site.register(Grievance)
\ No newline at end of file
+admin.site.register(Grievance)
+admin.site.register(EmailOutbox)
+admin.site.register(Department)
+admin.site.register(Category)
@@ -0,0 +1,32 @@
+from django.db.models import Aggregate, DurationField, ExpressionWrapper, F
+
+
+def resolution_time():
+    # resolved_at - created_at as an interval / microseconds, depending on the backend
+    return ExpressionWrapper(F('resolved_at') - F('created_at'), output_field=DurationField())
+
+
+class PercentileCont(Aggregate):
+    """
+    PostgreSQL ordered-set aggregate: percentile_cont(p) WITHIN GROUP (ORDER BY expr).
+    Only used when connection.vendor == 'postgresql'; other backends fall back to
+    computing percentiles in Python (see percentile()).
+    """
+    function = 'percentile_cont'
+    name = 'PercentileCont'
+    template = '%(function)s(%(percentile)s) WITHIN GROUP (ORDER BY %(expressions)s)'
+
+    def __init__(self, expression, percentile, **extra):
+        if not 0 <= percentile <= 1:
+            raise ValueError('percentile must be between 0 and 1.')
+        super().__init__(expression, percentile=float(percentile), **extra)
+
+
+def percentile(sorted_values, fraction):
+    """Linear-interpolated percentile (same definition as percentile_cont)."""
+    if not sorted_values:
+        return None
+    position = (len(sorted_values) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
@@ -0,0 +1,69 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.db.models.functions import Upper
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+
+# Enough to see every case variant of one ID (legacy data may hold "n180001" and "N180001")
+MAX_CASE_VARIANTS = 5
+
+
+def get_user_by_username(username, queryset=None):
+    """
+    Case-insensitive username lookup on the UPPER(username) index (user_username_upper_idx);
+    username__iexact can't use it on SQLite. If case variants exist, the exact spelling
+    wins, then the upper-cased ID. Raises DoesNotExist.
+    """
+    UserModel = get_user_model()
+    if queryset is None:
+        queryset = UserModel._default_manager.all()
+    username = username or ''
+    candidates = list(
+        queryset.alias(username_key=Upper('username')).filter(username_key=username.upper())[:MAX_CASE_VARIANTS]
+    )
+    if not candidates:
+        raise UserModel.DoesNotExist
+    by_name = {user.username: user for user in candidates}
+    return by_name.get(username) or by_name.get(username.upper()) or candidates[0]
+
+
+class CaseInsensitiveModelBackend(ModelBackend):
+    """
+    Student / employee IDs are stored upper-case but typed in any case.
+    One indexed lookup and exactly one password hash per attempt, hit or miss.
+    """
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        UserModel = get_user_model()
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+        try:
+            user = get_user_by_username(username)
+        except UserModel.DoesNotExist:
+            # Hash anyway so unknown IDs take as long as wrong passwords (as ModelBackend does)
+            UserModel().set_password(password)
+            return None
+        if user.check_password(password) and self.user_can_authenticate(user):
+            return user
+        return None
+
+
+class ProfileTokenAuthentication(TokenAuthentication):
+    """
+    TokenAuthentication that also joins the caller's student / authority profile,
+    so /api/me/ endpoints know who and what scope from the one token lookup.
+    """
+
+    def authenticate_credentials(self, key):
+        model = self.get_model()
+        try:
+            token = model.objects.select_related(
+                'user', 'user__student_profile', 'user__authority_profile'
+            ).get(key=key)
+        except model.DoesNotExist:
+            raise exceptions.AuthenticationFailed('Invalid token.')
+        if not token.user.is_active:
+            raise exceptions.AuthenticationFailed('User inactive or deleted.')
+        return (token.user, token)
@@ -0,0 +1,116 @@
+from django.db import transaction
+from django.utils import timezone
+
+from .caching import ALL_GRIEVANCES_TAG, handler_list_tag, response_cache, student_list_tag
+from .events import publish_grievance_event
+from .images import optimise_upload
+from .models import DashboardCounters, EmailOutbox, Grievance, SiteSettings
+
+# Statuses an authority can set from the dashboard
+BATCH_STATUSES = ('Resolved', 'Escalated', 'Rejected')
+# Upper bound on ids per request (one IN list, one transaction)
+MAX_BATCH_SIZE = 500
+
+
+def _store_shared_image(original, thumbnail, count):
+    """Stores the image pair once for `count` grievances. Returns (image, thumb) names."""
+    names = []
+    for field_name, content in (('resolved_image', original), ('resolved_image_thumb', thumbnail)):
+        field = Grievance._meta.get_field(field_name)
+        name = field.storage.save(field.generate_filename(None, content.name), content)
+        # Every grievance holds a reference, so deleting one keeps the file for the rest
+        if hasattr(field.storage, 'add_references'):
+            field.storage.add_references(name, count - 1)
+        names.append(name)
+    return names
+
+
+def _release(names):
+    storage = Grievance._meta.get_field('resolved_image').storage
+    for name in names:
+        if name and getattr(storage, 'is_managed', lambda name: False)(name):
+            storage.delete(name)
+
+
+def apply_batch(grievances, ids, status, reply, image=None):
+    """
+    Sets status / reply (and optionally one shared resolution image) on every grievance
+    in `ids` that is inside the `grievances` scope, with one UPDATE in one transaction.
+    Queues one digest mail per affected student. Returns (updated ids, skipped ids).
+    Raises ValueError if `image` is not a readable image.
+    """
+    # CPU work before any row is locked
+    prepared = optimise_upload(image) if image is not None else None
+    now = timezone.now()
+    with transaction.atomic():
+        rows = list(
+            grievances.filter(id__in=ids).select_for_update(of=('self',))
+            .values('id', 'status', 'student_id', 'student__student_id', 'student__user__email',
+                    'category', 'current_handler_designation', 'resolved_image', 'resolved_image_thumb')
+        )
+        if not rows:
+            return [], sorted(set(ids))
+        updated = [row['id'] for row in rows]
+
+        changes = {'status': status, 'authority_reply': reply, 'updated_at': now}
+        if status == 'Resolved':
+            changes['resolved_at'] = now
+        replaced = []
+        if prepared is not None:
+            changes['resolved_image'], changes['resolved_image_thumb'] = _store_shared_image(*prepared, len(rows))
+            replaced = [row[field] for row in rows for field in ('resolved_image', 'resolved_image_thumb')]
+
+        # update() skips save(): signals, auto_now and the image pipeline are handled here
+        Grievance.objects.filter(id__in=updated).update(**changes)
+        _release(replaced)
+
+        was_resolved = sum(1 for row in rows if row['status'] == 'Resolved')
+        DashboardCounters.bump(resolved=(len(rows) if status == 'Resolved' else 0) - was_resolved)
+
+        if SiteSettings.load().email_alerts:
+            notify_students(rows, status, reply)
+
+        # What the post_save signals would have done per row
+        tags = {ALL_GRIEVANCES_TAG, 'stats'}
+        for row in rows:
+            handler = row['current_handler_designation']
+            tags.update((student_list_tag(row['student__student_id']), handler_list_tag(handler)))
+            if row['status'] != status:
+                transaction.on_commit(
+                    lambda g_id=row['id'], student_pk=row['student_id'], handler=handler: publish_grievance_event(
+                        'status_changed', g_id, status, handler, student_pk
+                    )
+                )
+        transaction.on_commit(lambda: response_cache.invalidate(*tags))
+
+    return updated, sorted(set(ids) - set(updated))
+
+
+def notify_students(rows, status, reply):
+    """One digest mail per student, listing all of their grievances in the batch."""
+    by_student = {}
+    for row in rows:
+        if row['student__user__email']:
+            key = (row['student__student_id'], row['student__user__email'])
+            by_student.setdefault(key, []).append((row['id'], row['category']))
+
+    for (roll, email), grievances in by_student.items():
+        lines = "\n".join(f"  #{g_id} - {category}" for g_id, category in sorted(grievances))
+        message = f"""
+Dear Student ({roll}),
+
+The following grievance(s) have been updated:
+
+{lines}
+
+------------------------------------------------
+New Status: {status.upper()}
+Authority Remarks: {reply}
+------------------------------------------------
+
+Please login to the dashboard to view full details.
+
+Regards,
+Smart Grievance Management System
+        """
+        EmailOutbox.enqueue(f"Grievance Update: {len(grievances)} ticket(s) {status}", message, [email])
@@ -0,0 +1,174 @@
+import csv
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import transaction
+
+from .caching import response_cache
+from .models import CustomUser, StudentProfile, AuthorityProfile, DashboardCounters
+
+# Same keys the register_student / register_authority forms send
+COLUMNS = {
+    'students': ['id', 'name', 'email', 'password', 'year', 'branch', 'gender'],
+    'authorities': ['id', 'name', 'email', 'password', 'dept', 'designation', 'gender'],
+}
+OPTIONAL = {'branch'}
+# Column -> (model, field) it is stored in, for the max_length checks
+FIELDS = {
+    'students': {
+        'id': (StudentProfile, 'student_id'), 'name': (CustomUser, 'first_name'), 'email': (CustomUser, 'email'),
+        'year': (StudentProfile, 'year'), 'branch': (StudentProfile, 'branch'), 'gender': (StudentProfile, 'gender'),
+    },
+    'authorities': {
+        'id': (AuthorityProfile, 'employee_id'), 'name': (CustomUser, 'first_name'), 'email': (CustomUser, 'email'),
+        'dept': (AuthorityProfile, 'department'), 'designation': (AuthorityProfile, 'designation'),
+        'gender': (AuthorityProfile, 'gender'),
+    },
+}
+MAX_LENGTHS = {
+    kind: {key: model._meta.get_field(field).max_length for key, (model, field) in fields.items()}
+    for kind, fields in FIELDS.items()
+}
+
+# Rows validated, hashed and inserted per round trip; keeps memory flat for big files
+CHUNK_SIZE = 1000
+# Below this many passwords a process pool costs more than it saves
+PARALLEL_THRESHOLD = 50
+
+
+def _init_worker():
+    import django
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
+    django.setup()
+
+
+def hash_passwords(passwords, workers=None):
+    """PBKDF2 is deliberately slow: spread it over CPU cores for big batches."""
+    if len(passwords) < PARALLEL_THRESHOLD or workers == 1:
+        return [make_password(p) for p in passwords]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        return list(pool.map(make_password, passwords, chunksize=25))
+
+
+def _normalise(kind, row):
+    data = {key: (row.get(key) or '').strip() for key in COLUMNS[kind]}
+    if kind == 'students':
+        # Same as register_student: IDs are stored uppercase
+        data['id'] = data['id'].upper()
+    return data
+
+
+def _row_errors(kind, data):
+    errors = [f"{key} is required" for key in COLUMNS[kind] if key not in OPTIONAL and not data[key]]
+    if data['email']:
+        try:
+            validate_email(data['email'])
+        except ValidationError:
+            errors.append('email is invalid')
+    # Caught here rather than as a DataError that would sink the whole import (PostgreSQL)
+    for key, limit in MAX_LENGTHS[kind].items():
+        if len(data[key]) > limit:
+            errors.append(f'{key} is longer than {limit} characters')
+    return errors
+
+
+def _existing_ids(kind, ids):
+    taken = set(CustomUser.objects.filter(username__in=ids).values_list('username', flat=True))
+    if kind == 'students':
+        taken |= set(StudentProfile.objects.filter(student_id__in=ids).values_list('student_id', flat=True))
+    else:
+        taken |= set(AuthorityProfile.objects.filter(employee_id__in=ids).values_list('employee_id', flat=True))
+    return taken
+
+
+def _insert(kind, rows, workers):
+    hashes = hash_passwords([data['password'] for _, data in rows], workers)
+    users = CustomUser.objects.bulk_create([
+        CustomUser(
+            username=data['id'], email=data['email'], password=hashed,
+            first_name=data['name'], user_type='student' if kind == 'students' else 'authority',
+        )
+        for (_, data), hashed in zip(rows, hashes)
+    ])
+    if kind == 'students':
+        StudentProfile.objects.bulk_create([
+            StudentProfile(user=user, student_id=data['id'], year=data['year'],
+                           branch=data['branch'], gender=data['gender'])
+            for user, (_, data) in zip(users, rows)
+        ])
+    else:
+        AuthorityProfile.objects.bulk_create([
+            AuthorityProfile(user=user, employee_id=data['id'], department=data['dept'],
+                             designation=data['designation'], gender=data['gender'])
+            for user, (_, data) in zip(users, rows)
+        ])
+
+
+def import_csv(kind, csv_file, dry_run=False, workers=None, max_rows=None):
+    """
+    Streams a CSV of students or authorities into the database.
+    Valid rows are created in ONE transaction (bulk_create, passwords hashed in a
+    process pool unless workers=1); invalid rows are skipped and reported by line number.
+    More than `max_rows` valid rows raises ValueError and writes nothing.
+    Returns {'created': n, 'errors': [{'line': .., 'id': .., 'errors': [..]}]}.
+    """
+    if kind not in COLUMNS:
+        raise ValueError(f"Unknown import type: {kind}")
+
+    # Uploaded files are binary; csv wants text
+    if isinstance(csv_file.read(0), bytes):
+        # Django UploadedFile -> its underlying BytesIO / temp file
+        csv_file = io.TextIOWrapper(getattr(csv_file, 'file', csv_file), encoding='utf-8-sig', newline='')
+    reader = csv.DictReader(csv_file)
+    missing = [key for key in COLUMNS[kind] if key not in OPTIONAL and key not in (reader.fieldnames or [])]
+    if missing:
+        raise ValueError(f"CSV is missing columns: {', '.join(missing)}")
+
+    created = 0
+    errors = []
+    seen = set()
+
+    def flush(chunk):
+        nonlocal created
+        taken = _existing_ids(kind, [data['id'] for _, data in chunk])
+        valid = []
+        for line, data in chunk:
+            if data['id'] in taken:
+                errors.append({'line': line, 'id': data['id'], 'errors': ['id already exists']})
+            else:
+                valid.append((line, data))
+        if valid and not dry_run:
+            _insert(kind, valid, workers)
+        created += len(valid)
+
+    with transaction.atomic():
+        chunk = []
+        # Line 1 is the header
+        for line, row in enumerate(reader, start=2):
+            data = _normalise(kind, row)
+            row_errors = _row_errors(kind, data)
+            if data['id'] in seen:
+                row_errors.append('duplicate id in file')
+            if row_errors:
+                errors.append({'line': line, 'id': data['id'], 'errors': row_errors})
+                continue
+            seen.add(data['id'])
+            if max_rows is not None and len(seen) > max_rows:
+                raise ValueError(f"More than {max_rows} rows: use `manage.py import_users` for big files.")
+            chunk.append((line, data))
+            if len(chunk) >= CHUNK_SIZE:
+                flush(chunk)
+                chunk = []
+        if chunk:
+            flush(chunk)
+
+        if not dry_run:
+            # bulk_create skips the post_save signals that normally keep the counters in step
+            DashboardCounters.bump(**{kind: created})
+            transaction.on_commit(lambda: response_cache.invalidate(kind, 'stats'))
+
+    return {'created': created, 'errors': errors, 'dry_run': dry_run}
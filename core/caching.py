@@ -0,0 +1,163 @@
+import hashlib
+import time
+import uuid
+from urllib.parse import quote, urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+class VersionedLocalCache:
+    """
+    Per-process copy of a small, rarely changing value (settings row, lookup table).
+    Re-validated against a version stamp in the shared Django cache at most every
+    `ttl` seconds; publish() changes the stamp so every gunicorn worker reloads
+    on its next check. Inside the TTL a hit costs no I/O at all.
+    """
+
+    def __init__(self, version_key, ttl):
+        self.version_key = version_key
+        self.ttl = ttl
+        self.clear()
+
+    def clear(self):
+        """Drop this process's copy (other workers keep theirs until the stamp changes)."""
+        self.value = None
+        self.version = None
+        self.expires = 0.0
+
+    def publish(self):
+        """Call after changing the underlying data: invalidates every worker."""
+        cache.set(self.version_key, uuid.uuid4().hex, None)
+        self.clear()
+
+    def get(self, loader):
+        now = time.monotonic()
+        if self.value is not None and now < self.expires:
+            return self.value
+
+        version = cache.get(self.version_key)
+        if self.value is not None and version is not None and version == self.version:
+            self.expires = now + self.ttl
+            return self.value
+
+        value = loader()
+        if version is None:
+            # First worker to look: publish a stamp (add() so we never clobber a newer one)
+            cache.add(self.version_key, uuid.uuid4().hex, None)
+            version = cache.get(self.version_key)
+        self.value, self.version, self.expires = value, version, now + self.ttl
+        return value
+
+
+class ResponseCache:
+    """
+    Serialised GET responses in the shared Django cache, keyed by endpoint, role,
+    user_id and the rest of the query string.
+
+    Each entry depends on a few tags ('students', 'grievances:handler:DSW', ...) and
+    remembers their version stamps. invalidate(tag) re-stamps the tag, so exactly
+    the entries built from it miss next time; a lookup is one get_many().
+    Off unless settings.RESPONSE_CACHE is set: on the database cache backend a
+    lookup would cost more queries than most of the responses it saves.
+    """
+
+    def __init__(self, prefix, ttl):
+        self.prefix = prefix
+        self.ttl = ttl
+
+    @property
+    def enabled(self):
+        return getattr(settings, 'RESPONSE_CACHE', False)
+
+    def _tag_key(self, tag):
+        # Designations contain spaces; keep keys memcached-safe
+        return f"{self.prefix}:tag:{quote(tag, safe=':')}"
+
+    def _entry_key(self, endpoint, params):
+        rest = sorted((k, v) for k, v in params.lists() if k not in ('role', 'user_id'))
+        query = hashlib.md5(urlencode(rest, doseq=True).encode(), usedforsecurity=False).hexdigest()
+        role, user_id = quote(params.get('role', '')), quote(params.get('user_id', ''))
+        return f"{self.prefix}:{endpoint}:{role}:{user_id}:{query}"
+
+    def lookup(self, endpoint, params, tags):
+        """
+        Returns (value or None, token). Pass the token to store() with the freshly
+        built value: it holds the stamps read *before* the database was, so a write
+        landing in between leaves the stored entry already stale.
+        """
+        if not self.enabled:
+            return None, None
+        entry_key = self._entry_key(endpoint, params)
+        tag_keys = [self._tag_key(tag) for tag in tags]
+        found = cache.get_many([entry_key, *tag_keys])
+
+        stamps = []
+        for key in tag_keys:
+            stamp = found.get(key)
+            if stamp is None:
+                # First use of this tag: add() so we never clobber a newer stamp
+                cache.add(key, uuid.uuid4().hex, None)
+                stamp = cache.get(key)
+            stamps.append(stamp)
+
+        entry = found.get(entry_key)
+        if entry is not None and entry['stamps'] == stamps:
+            self._count(endpoint, 'hits')
+            return entry['value'], None
+        self._count(endpoint, 'misses')
+        return None, (entry_key, stamps)
+
+    def store(self, token, value):
+        if token is None:
+            return
+        entry_key, stamps = token
+        cache.set(entry_key, {'stamps': stamps, 'value': value}, self.ttl)
+
+    def invalidate(self, *tags):
+        if not self.enabled:
+            return
+        new = uuid.uuid4().hex
+        cache.set_many({self._tag_key(tag): new for tag in tags}, None)
+
+    def _count(self, endpoint, outcome):
+        key = f'{self.prefix}:stats:{endpoint}:{outcome}'
+        # incr() is atomic on Redis; the database cache may drop the odd count under load
+        try:
+            cache.incr(key)
+        except ValueError:
+            if not cache.add(key, 1, None):
+                cache.incr(key)
+
+    def stats(self, endpoints):
+        keys = {
+            (endpoint, outcome): f'{self.prefix}:stats:{endpoint}:{outcome}'
+            for endpoint in endpoints for outcome in ('hits', 'misses')
+        }
+        found = cache.get_many(keys.values())
+        result = {}
+        for (endpoint, outcome), key in keys.items():
+            result.setdefault(endpoint, {})[outcome] = found.get(key, 0)
+        for counts in result.values():
+            total = counts['hits'] + counts['misses']
+            counts['hit_rate'] = round(counts['hits'] / total, 3) if total else None
+        return result
+
+
+# Read endpoints in core/views.py. The TTL only bounds the damage of a write path
+# that forgets to invalidate; normal freshness comes from the tags.
+response_cache = ResponseCache('core:resp', ttl=300)
+CACHED_ENDPOINTS = ['grievances', 'stats', 'students', 'authorities']
+
+# Grievance list tags: every list also depends on 'grievances' (dropped wholesale
+# by batch jobs); admins' unscoped lists on ALL_GRIEVANCES_TAG
+ALL_GRIEVANCES_TAG = 'grievances:all'
+
+
+def student_list_tag(student_id):
+    # Roll number, as in ?user_id=
+    return f'grievances:student:{student_id}'
+
+
+def handler_list_tag(designation):
+    return f'grievances:handler:{designation}'
@@ -0,0 +1,101 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .caching import response_cache
+from .events import publish_grievance_event
+from .models import AuthorityProfile, EmailOutbox, Grievance, GrievanceTombstone, SiteSettings
+
+
+def overdue_grievances(now=None):
+    """Pending grievances that have sat with their current handler past the deadline."""
+    now = now or timezone.now()
+    cutoff = now - timedelta(days=settings.ESCALATION_AFTER_DAYS)
+    return Grievance.objects.filter(status='Pending').filter(
+        Q(escalated_at__lt=cutoff) | Q(escalated_at__isnull=True, created_at__lt=cutoff)
+    )
+
+
+def escalate_overdue(dry_run=False):
+    """
+    Moves every overdue Pending grievance one level up ESCALATION_CHAIN.
+    One UPDATE per chain level (not per row), then one notification mail per
+    new handler designation. Returns {new_handler: [grievance ids]}.
+    """
+    now = timezone.now()
+    moved = {}
+
+    with transaction.atomic():
+        overdue = overdue_grievances(now)
+        for current, next_level in settings.ESCALATION_CHAIN.items():
+            level = overdue.filter(current_handler_designation=current)
+            rows = list(level.select_for_update().values_list('id', 'student_id', 'created_at'))
+            if not rows:
+                continue
+            ids = [g_id for g_id, _, _ in rows]
+            if not dry_run:
+                # Status stays Pending: it is now on the new handler's pending list.
+                # update() skips auto_now, so stamp updated_at for rollups / delta sync.
+                Grievance.objects.filter(id__in=ids).update(
+                    current_handler_designation=next_level, escalated_at=now, updated_at=now
+                )
+                # ...and skips grievance_saved, so record the moves off `current`'s list here
+                GrievanceTombstone.objects.bulk_create([
+                    GrievanceTombstone(grievance_id=g_id, grievance_created_at=created_at,
+                                       handler_designation=current, reassigned=True)
+                    for g_id, _, created_at in rows
+                ])
+                for g_id, student_pk, _ in rows:
+                    transaction.on_commit(
+                        lambda g_id=g_id, student_pk=student_pk, next_level=next_level: publish_grievance_event(
+                            'reassigned', g_id, 'Pending', next_level, student_pk
+                        )
+                    )
+            moved.setdefault(next_level, []).extend(ids)
+
+        if moved and not dry_run:
+            # update() skips the signals; a batch job may as well drop every cached list
+            transaction.on_commit(lambda: response_cache.invalidate('grievances'))
+
+    if moved and not dry_run and SiteSettings.load().email_alerts:
+        notify_handlers(moved)
+    return moved
+
+
+def notify_handlers(moved):
+    """One digest mail per designation, to every authority holding it."""
+    recipients = {}
+    for designation, email in (
+        AuthorityProfile.objects.filter(designation__in=list(moved))
+        .exclude(user__email='').values_list('designation', 'user__email')
+    ):
+        recipients.setdefault(designation, []).append(email)
+
+    categories = dict(
+        Grievance.objects.filter(id__in=[i for ids in moved.values() for i in ids]).values_list('id', 'category')
+    )
+
+    for designation, ids in moved.items():
+        if not recipients.get(designation):
+            continue
+        lines = "\n".join(f"  #{g_id} - {categories.get(g_id, '')}" for g_id in sorted(ids))
+        message = f"""
+Dear {designation},
+
+The following grievances were pending for more than {settings.ESCALATION_AFTER_DAYS} days
+and have been auto-escalated to you:
+
+{lines}
+
+Please login to the dashboard to take action.
+
+Regards,
+Smart Grievance Management System
+        """
+        EmailOutbox.enqueue(
+            f"Auto-Escalation: {len(ids)} grievance(s) assigned to {designation}",
+            message, recipients[designation],
+        )
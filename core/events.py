@@ -0,0 +1,114 @@
+import asyncio
+import json
+import logging
+import threading
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Channel names: one per student, one per handler designation, plus 'all' for admins
+ALL_CHANNEL = 'all'
+
+
+def student_channel(student_pk):
+    # StudentProfile primary key (what Grievance.student_id holds), not the roll number
+    return f'student:{student_pk}'
+
+
+def handler_channel(designation):
+    return f'handler:{designation}'
+
+
+class InMemoryBroker:
+    """
+    Process-local pub/sub: fine for tests, runserver and a single ASGI worker.
+    publish() may be called from any thread (sync views run in a thread pool under ASGI).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = {}  # channel -> set of (loop, queue)
+
+    def publish(self, channel, event):
+        with self._lock:
+            targets = list(self._subscribers.get(channel, ()))
+        for loop, queue in targets:
+            loop.call_soon_threadsafe(queue.put_nowait, event)
+
+    def subscribe(self, channels):
+        # Registered right away (not on first iteration) so nothing published
+        # between subscribing and the first read is lost
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue()
+        entry = (loop, queue)
+        with self._lock:
+            for channel in channels:
+                self._subscribers.setdefault(channel, set()).add(entry)
+
+        async def listen():
+            try:
+                while True:
+                    yield await queue.get()
+            finally:
+                with self._lock:
+                    for channel in channels:
+                        self._subscribers.get(channel, set()).discard(entry)
+        return listen()
+
+
+class RedisBroker:
+    """Cross-process pub/sub for several ASGI workers. Needs the `redis` package."""
+
+    def __init__(self, url):
+        import redis
+        import redis.asyncio
+        self._url = url
+        self._sync = redis.Redis.from_url(url)
+        self._async_module = redis.asyncio
+
+    def publish(self, channel, event):
+        self._sync.publish(channel, json.dumps(event))
+
+    async def subscribe(self, channels):
+        client = self._async_module.Redis.from_url(self._url)
+        pubsub = client.pubsub()
+        await pubsub.subscribe(*channels)
+        try:
+            async for message in pubsub.listen():
+                if message['type'] == 'message':
+                    yield json.loads(message['data'])
+        finally:
+            await pubsub.unsubscribe(*channels)
+            await client.aclose()
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    global _broker
+    with _broker_lock:
+        if _broker is None:
+            url = getattr(settings, 'EVENTS_REDIS_URL', None)
+            _broker = RedisBroker(url) if url else InMemoryBroker()
+        return _broker
+
+
+def publish_grievance_event(event_type, grievance_id, status, handler, student_pk):
+    """Fan one grievance change out to its student, its handler and the admin feed."""
+    event = {
+        'type': event_type,
+        'id': grievance_id,
+        'status': status,
+        'handler': handler,
+    }
+    # Runs after commit: a broker outage must not turn a saved change into a 500.
+    # Live push is best-effort; clients re-sync from GET /api/grievances/?since=
+    try:
+        broker = get_broker()
+        for channel in {student_channel(student_pk), handler_channel(handler), ALL_CHANNEL}:
+            broker.publish(channel, event)
+    except Exception:
+        logger.exception("Could not publish %s event for grievance %s", event_type, grievance_id)
@@ -0,0 +1,86 @@
+import os
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps, features
+
+# Longest edge kept for the stored "original" (phone photos are often 4000px+)
+MAX_DIMENSION = 1600
+# Fixed-size, centre-cropped thumbnails for list views
+THUMB_SIZE = (256, 256)
+
+# WebP is much smaller than JPEG at the same quality; fall back if Pillow lacks it
+if features.check('webp'):
+    OUTPUT_FORMAT, OUTPUT_EXT = 'WEBP', 'webp'
+else:
+    OUTPUT_FORMAT, OUTPUT_EXT = 'JPEG', 'jpg'
+QUALITY = 80
+
+
+def _encode(image, name):
+    buffer = BytesIO()
+    if OUTPUT_FORMAT == 'JPEG' and image.mode != 'RGB':
+        image = image.convert('RGB')
+    # No exif= argument, so the metadata (GPS, camera serial, ...) is dropped
+    image.save(buffer, OUTPUT_FORMAT, quality=QUALITY, optimize=True)
+    return ContentFile(buffer.getvalue(), name=name)
+
+
+def optimise_upload(uploaded_file):
+    """
+    Downscales, strips EXIF and re-encodes an uploaded image.
+    Returns (original, thumbnail) as ContentFiles ready for FieldFile.save().
+    Raises ValueError if the upload is not a readable image.
+    """
+    try:
+        uploaded_file.seek(0)
+        image = Image.open(uploaded_file)
+        image.load()
+    except Exception:
+        raise ValueError('Uploaded file is not a valid image.')
+
+    # Apply the camera's orientation flag before EXIF is thrown away
+    image = ImageOps.exif_transpose(image)
+    has_alpha = image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info)
+    image = image.convert('RGBA' if has_alpha else 'RGB')
+
+    base = os.path.splitext(os.path.basename(uploaded_file.name or 'upload'))[0]
+
+    original = image.copy()
+    original.thumbnail((MAX_DIMENSION, MAX_DIMENSION), Image.LANCZOS)
+    thumbnail = ImageOps.fit(image, THUMB_SIZE, Image.LANCZOS)
+
+    return (
+        _encode(original, f"{base}.{OUTPUT_EXT}"),
+        _encode(thumbnail, f"{base}_thumb.{OUTPUT_EXT}"),
+    )
+
+
+def process_new_images(instance, field_pairs):
+    """
+    For each (image_field, thumb_field) on `instance` holding a fresh, not yet stored
+    upload: store the optimised version instead and generate its thumbnail.
+    Called from the model's save(). Returns the (storage, name) pairs the uploads
+    replace on an existing row, for save() to hand to release_replaced() afterwards.
+    """
+    fresh = [pair for pair in field_pairs if getattr(instance, pair[0]) and not getattr(instance, pair[0])._committed]
+    replaced = []
+    if fresh and not instance._state.adding:
+        # The in-memory field already holds the upload, so ask the row what it pointed at
+        names = [name for pair in fresh for name in pair]
+        old = type(instance)._default_manager.filter(pk=instance.pk).values(*names).first() or {}
+        replaced = [(getattr(instance, name).storage, old[name]) for name in names if old.get(name)]
+
+    for field_name, thumb_name in fresh:
+        field_file = getattr(instance, field_name)
+        original, thumbnail = optimise_upload(field_file.file)
+        field_file.save(original.name, original, save=False)
+        getattr(instance, thumb_name).save(thumbnail.name, thumbnail, save=False)
+    return replaced
+
+
+def release_replaced(replaced):
+    # Same rule as the post_delete receivers: only blob-store files are reference counted
+    for storage, name in replaced:
+        if getattr(storage, 'is_managed', lambda name: False)(name):
+            storage.delete(name)
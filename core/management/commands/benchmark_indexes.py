@@ -0,0 +1,137 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from core.models import CustomUser, StudentProfile, Grievance
+
+HANDLERS = ['Chief Warden', 'Chief Mess Coordinator', 'Dean Academics', 'Chief Medical Officer', 'AO', 'DIRECTOR']
+DEPARTMENTS = ['Hostel', 'Mess', 'Academic', 'Hospital', 'Others', 'Administration']
+STATUSES = ['Pending', 'Resolved', 'Escalated', 'Rejected']
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Seeds a large grievance table inside a transaction, times the dashboard hot-path "
+        "queries with and without the Grievance indexes, then rolls everything back. "
+        "Works on SQLite and PostgreSQL (both have transactional DDL)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--grievances', type=int, default=200000)
+        parser.add_argument('--students', type=int, default=5000)
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"Backend: {connection.vendor}")
+        try:
+            with transaction.atomic():
+                student_ids = self._seed(options['students'], options['grievances'])
+                queries = self._queries(student_ids)
+
+                with_indexes = self._time_all(queries, options['repeat'])
+                self._drop_indexes()
+                without_indexes = self._time_all(queries, options['repeat'])
+
+                self._report(queries, with_indexes, without_indexes)
+                raise Rollback()
+        except Rollback:
+            self.stdout.write("Seed data and index changes rolled back.")
+
+    # ---------------------------------------------------------------
+
+    def _seed(self, student_count, grievance_count):
+        self.stdout.write(f"Seeding {student_count} students and {grievance_count} grievances...")
+        users = CustomUser.objects.bulk_create([
+            # '!' prefix = unusable password, skips PBKDF2 for the benchmark
+            CustomUser(username=f'BENCH{i:06d}', password='!', user_type='student')
+            for i in range(student_count)
+        ], batch_size=1000)
+        students = StudentProfile.objects.bulk_create([
+            StudentProfile(user=user, student_id=f'BENCH{i:06d}', year='E1', gender='Male')
+            for i, user in enumerate(users)
+        ], batch_size=1000)
+
+        rng = random.Random(42)
+        batch = []
+        for i in range(grievance_count):
+            dept_index = rng.randrange(len(DEPARTMENTS))
+            batch.append(Grievance(
+                student=students[rng.randrange(len(students))],
+                category=f"{DEPARTMENTS[dept_index]} - Bench",
+                description='benchmark row',
+                status=rng.choice(STATUSES),
+                department_category=DEPARTMENTS[dept_index],
+                current_handler_designation=HANDLERS[dept_index],
+            ))
+            if len(batch) == 5000:
+                Grievance.objects.bulk_create(batch)
+                batch = []
+        if batch:
+            Grievance.objects.bulk_create(batch)
+
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute(f'ANALYZE {Grievance._meta.db_table}')
+        elif connection.vendor == 'sqlite':
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE')
+
+        return [s.pk for s in students[:50]]
+
+    def _queries(self, student_ids):
+        # The shapes the dashboards actually run
+        return [
+            ('authority dashboard (handler + status, newest 50)', lambda: list(
+                Grievance.objects.filter(current_handler_designation='Chief Warden', status='Pending')
+                .order_by('-created_at').values_list('id', flat=True)[:50]
+            )),
+            ('authority dashboard (handler, newest 50)', lambda: list(
+                Grievance.objects.filter(current_handler_designation='Dean Academics')
+                .order_by('-created_at').values_list('id', flat=True)[:50]
+            )),
+            ('student dashboard (own grievances)', lambda: list(
+                Grievance.objects.filter(student_id=random.choice(student_ids))
+                .order_by('-created_at').values_list('id', flat=True)
+            )),
+            ('admin list page (keyset, newest 50)', lambda: list(
+                Grievance.objects.order_by('-created_at', '-id').values_list('id', flat=True)[:50]
+            )),
+            ('department filter (newest 50)', lambda: list(
+                Grievance.objects.filter(department_category='Mess')
+                .order_by('-created_at').values_list('id', flat=True)[:50]
+            )),
+            ('dashboard_stats resolved count', lambda: (
+                Grievance.objects.filter(status='Resolved').count()
+            )),
+        ]
+
+    def _time_all(self, queries, repeat):
+        timings = []
+        for _, run in queries:
+            run()  # warm up
+            start = time.perf_counter()
+            for _ in range(repeat):
+                run()
+            timings.append((time.perf_counter() - start) * 1000 / repeat)
+        return timings
+
+    def _drop_indexes(self):
+        # Plain DROP INDEX: the SQLite schema editor refuses to run inside atomic()
+        with connection.cursor() as cursor:
+            for index in Grievance._meta.indexes:
+                cursor.execute(f'DROP INDEX {connection.ops.quote_name(index.name)}')
+            if connection.vendor == 'postgresql':
+                cursor.execute(f'ANALYZE {Grievance._meta.db_table}')
+
+    def _report(self, queries, with_indexes, without_indexes):
+        self.stdout.write("")
+        self.stdout.write(f"{'query':<52}{'no index (ms)':>15}{'indexed (ms)':>15}{'speedup':>10}")
+        for (label, _), fast, slow in zip(queries, with_indexes, without_indexes):
+            speedup = slow / fast if fast else 0
+            self.stdout.write(f"{label:<52}{slow:>15.2f}{fast:>15.2f}{speedup:>9.1f}x")
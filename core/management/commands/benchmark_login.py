@@ -0,0 +1,83 @@
+import time
+
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from core.backends import CaseInsensitiveModelBackend
+from core.models import CustomUser
+
+PASSWORD = 'bench-password'
+
+
+class Rollback(Exception):
+    pass
+
+
+def legacy_login(username, password):
+    # What login_api used to do: exact match, then a second full attempt upper-cased
+    backend = ModelBackend()
+    user = backend.authenticate(None, username=username, password=password)
+    if user is None and username:
+        user = backend.authenticate(None, username=username.upper(), password=password)
+    return user
+
+
+def single_hash_login(username, password):
+    return CaseInsensitiveModelBackend().authenticate(None, username=username, password=password)
+
+
+class Command(BaseCommand):
+    help = (
+        "Times successful and failed logins through the old two-attempt path and the "
+        "case-insensitive single-hash backend, on a seeded user table that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=50000)
+        parser.add_argument('--repeat', type=int, default=10)
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"Backend: {connection.vendor}")
+        try:
+            with transaction.atomic():
+                self._seed(options['users'])
+                scenarios = [
+                    ('success, exact case', 'BENCH000042', PASSWORD),
+                    ('success, lower case', 'bench000042', PASSWORD),
+                    ('wrong password, exact case', 'BENCH000042', 'wrong'),
+                    ('wrong password, lower case', 'bench000042', 'wrong'),
+                    ('unknown user', 'nobody', PASSWORD),
+                ]
+                self._report(scenarios, options['repeat'])
+                raise Rollback()
+        except Rollback:
+            self.stdout.write("Seed users rolled back.")
+
+    def _seed(self, count):
+        self.stdout.write(f"Seeding {count} users...")
+        # One real hash shared by every row: seeding stays fast, verifying costs the full PBKDF2
+        hashed = make_password(PASSWORD)
+        CustomUser.objects.bulk_create([
+            CustomUser(username=f'BENCH{i:06d}', password=hashed, user_type='student')
+            for i in range(count)
+        ], batch_size=1000)
+        with connection.cursor() as cursor:
+            cursor.execute(f'ANALYZE {CustomUser._meta.db_table}' if connection.vendor == 'postgresql' else 'ANALYZE')
+
+    def _time(self, login, username, password, repeat):
+        login(username, password)  # warm up
+        start = time.perf_counter()
+        for _ in range(repeat):
+            login(username, password)
+        return (time.perf_counter() - start) * 1000 / repeat
+
+    def _report(self, scenarios, repeat):
+        self.stdout.write("")
+        self.stdout.write(f"{'scenario':<32}{'two attempts (ms)':>20}{'single hash (ms)':>20}{'speedup':>10}")
+        for label, username, password in scenarios:
+            legacy = self._time(legacy_login, username, password, repeat)
+            single = self._time(single_hash_login, username, password, repeat)
+            speedup = legacy / single if single else 0
+            self.stdout.write(f"{label:<32}{legacy:>20.2f}{single:>20.2f}{speedup:>9.1f}x")
@@ -0,0 +1,24 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.rollups import build_rollups
+
+
+class Command(BaseCommand):
+    help = "Updates the daily grievance rollups for every day touched since the last run."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help="Ignore the watermark and rebuild every day.")
+        parser.add_argument('--loop', action='store_true', help="Keep running, every --interval seconds.")
+        parser.add_argument('--interval', type=float, default=300.0)
+
+    def handle(self, *args, **options):
+        full = options['full']
+        while True:
+            days = build_rollups(full=full)
+            self.stdout.write(f"Rebuilt {len(days)} day(s).")
+            if not options['loop']:
+                break
+            full = False
+            time.sleep(options['interval'])
@@ -0,0 +1,31 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.escalation import escalate_overdue
+from core.models import SiteSettings
+
+
+class Command(BaseCommand):
+    help = "Auto-escalates overdue Pending grievances one level up ESCALATION_CHAIN (if enabled in Site Settings)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help="Run even if auto_escalation is switched off.")
+        parser.add_argument('--dry-run', action='store_true', help="Report what would move, change nothing.")
+        parser.add_argument('--loop', action='store_true', help="Keep running, every --interval seconds.")
+        parser.add_argument('--interval', type=float, default=3600.0)
+
+    def handle(self, *args, **options):
+        while True:
+            if options['force'] or SiteSettings.load().auto_escalation:
+                moved = escalate_overdue(dry_run=options['dry_run'])
+                for designation, ids in moved.items():
+                    self.stdout.write(f"{designation}: {len(ids)} escalated")
+                if not moved:
+                    self.stdout.write("Nothing overdue.")
+            else:
+                self.stdout.write("Auto-escalation is disabled in Site Settings.")
+
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,63 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from core.images import optimise_upload
+from core.models import CustomUser, Grievance
+
+# (model, image field, thumbnail field)
+TARGETS = [
+    (Grievance, 'image', 'image_thumb'),
+    (Grievance, 'resolved_image', 'resolved_image_thumb'),
+    (CustomUser, 'profile_pic', 'profile_pic_thumb'),
+]
+
+
+def still_referenced(name):
+    """Legacy files carry no refcount: look for any image or thumbnail column still pointing at `name`."""
+    return any(
+        model.objects.filter(Q(**{field_name: name}) | Q(**{thumb_name: name})).exists()
+        for model, field_name, thumb_name in TARGETS
+    )
+
+
+class Command(BaseCommand):
+    help = "Re-encodes images uploaded before the upload pipeline existed and builds their thumbnails."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--delete-originals', action='store_true',
+            help="Remove the raw upload once the optimised copy is stored and no other row still uses it.",
+        )
+
+    def handle(self, *args, **options):
+        for model, field_name, thumb_name in TARGETS:
+            pending = model.objects.exclude(**{f'{field_name}__in': ['', None]}).filter(
+                Q(**{thumb_name: ''}) | Q(**{f'{thumb_name}__isnull': True})
+            )
+            done = 0
+            for instance in pending.iterator():
+                field_file = getattr(instance, field_name)
+                old_name = field_file.name
+                try:
+                    with field_file.open('rb'):
+                        original, thumbnail = optimise_upload(field_file)
+                except (OSError, ValueError) as e:
+                    self.stderr.write(f"{model.__name__} {instance.pk} {field_name}: {e}")
+                    continue
+
+                field_file.save(original.name, original, save=False)
+                getattr(instance, thumb_name).save(thumbnail.name, thumbnail, save=False)
+                # update() so no save() hooks / signals run for a pure file rewrite
+                model.objects.filter(pk=instance.pk).update(**{
+                    field_name: field_file.name,
+                    thumb_name: getattr(instance, thumb_name).name,
+                })
+                if options['delete_originals'] and old_name != field_file.name:
+                    if field_file.storage.is_managed(old_name) or not still_referenced(old_name):
+                        # Blobs are refcounted by the storage itself
+                        field_file.storage.delete(old_name)
+                    else:
+                        self.stdout.write(f"Kept {old_name}: still used by another row")
+                done += 1
+
+            self.stdout.write(f"{model.__name__}.{field_name}: {done} optimised")
@@ -0,0 +1,37 @@
+from collections import Counter
+
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from core.models import CustomUser, Grievance, StoredBlob
+
+FILE_FIELDS = [
+    (Grievance, ['image', 'image_thumb', 'resolved_image', 'resolved_image_thumb']),
+    (CustomUser, ['profile_pic', 'profile_pic_thumb']),
+]
+
+
+class Command(BaseCommand):
+    help = "Recounts StoredBlob references from the model rows and deletes unreferenced blobs."
+
+    def handle(self, *args, **options):
+        references = Counter()
+        for model, field_names in FILE_FIELDS:
+            for row in model.objects.values_list(*field_names).iterator():
+                references.update(name for name in row if default_storage.is_managed(name))
+
+        fixed = removed = 0
+        with transaction.atomic():
+            for blob in StoredBlob.objects.select_for_update().iterator():
+                actual = references.get(blob.name, 0)
+                if actual == 0:
+                    # delete() drops the row and, on commit, the file
+                    StoredBlob.objects.filter(name=blob.name).update(refcount=1)
+                    default_storage.delete(blob.name)
+                    removed += 1
+                elif actual != blob.refcount:
+                    StoredBlob.objects.filter(name=blob.name).update(refcount=actual)
+                    fixed += 1
+
+        self.stdout.write(f"{fixed} refcounts corrected, {removed} unreferenced blobs removed.")
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from core.caching import response_cache
+from core.models import DashboardCounters
+
+
+class Command(BaseCommand):
+    help = "Verifies DashboardCounters against the live tables and rebuilds it (use --check to only verify)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--check', action='store_true', help="Only report drift, exit non-zero if any.")
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            # Lock the row so concurrent bumps wait for the rebuild
+            stored = DashboardCounters.objects.select_for_update().filter(pk=1).first()
+            live = DashboardCounters.live_counts()
+
+            drift = {}
+            for name, actual in live.items():
+                cached = getattr(stored, name) if stored else None
+                if cached != actual:
+                    drift[name] = (cached, actual)
+
+            if not drift:
+                self.stdout.write(self.style.SUCCESS("Counters match the live tables."))
+                return
+
+            for name, (cached, actual) in drift.items():
+                self.stdout.write(f"{name}: stored={cached} live={actual}")
+
+            if options['check']:
+                raise CommandError("Counters are out of date. Run without --check to rebuild.")
+
+            DashboardCounters.rebuild()
+            transaction.on_commit(lambda: response_cache.invalidate('stats'))
+            self.stdout.write(self.style.SUCCESS("Counters rebuilt."))
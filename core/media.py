@@ -0,0 +1,131 @@
+import mimetypes
+import os
+import re
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import Http404, HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.utils._os import safe_join
+from django.utils.http import http_date, parse_http_date_safe
+from django.views.decorators.http import require_safe
+
+from .streaming import stream_for
+
+# Uploads are never rewritten in place (a new upload gets a new name), so browsers may keep them for a year
+CACHE_CONTROL = 'public, max-age=31536000, immutable'
+CHUNK_SIZE = 64 * 1024
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def _etag(stat):
+    # Strong validator: size + mtime in nanoseconds changes whenever the bytes do
+    return f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+
+
+def _parse_range(header, size):
+    """
+    Returns (start, end) inclusive for a single "bytes=" range, None to ignore the
+    header (serve the whole file), or 'unsatisfiable'.
+    """
+    match = RANGE_RE.match(header.strip())
+    if not match:
+        return None  # multi-range or garbage: a full 200 is a valid answer
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0:
+            return 'unsatisfiable'
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = int(last) if last else size - 1
+    if start >= size or end < start:
+        return 'unsatisfiable'
+    return start, min(end, size - 1)
+
+
+def _read_slice(path, start, length):
+    with open(path, 'rb') as handle:
+        handle.seek(start)
+        while length > 0:
+            chunk = handle.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+@require_safe
+def serve_media(request, path):
+    """
+    Serves MEDIA_ROOT files with DEBUG off: strong ETag, long-lived Cache-Control,
+    304s and single byte ranges. With MEDIA_ACCEL set, the actual transfer is handed
+    to the front proxy (nginx X-Accel-Redirect or Apache/lighttpd X-Sendfile).
+    """
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, path)
+    except SuspiciousFileOperation:
+        raise Http404('Invalid path')
+    try:
+        stat = os.stat(full_path)
+    except OSError:
+        raise Http404('File not found')
+    if not os.path.isfile(full_path):
+        raise Http404('File not found')
+
+    etag = _etag(stat)
+    last_modified = http_date(stat.st_mtime)
+    content_type = mimetypes.guess_type(full_path)[0] or 'application/octet-stream'
+
+    # Conditional GET: If-None-Match wins over If-Modified-Since (RFC 9110)
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if if_none_match:
+        tags = [tag.strip() for tag in if_none_match.split(',')]
+        not_modified = etag in tags or '*' in tags
+    else:
+        since = parse_http_date_safe(request.META.get('HTTP_IF_MODIFIED_SINCE', ''))
+        not_modified = since is not None and int(stat.st_mtime) <= since
+    if not_modified:
+        response = HttpResponseNotModified()
+        response['ETag'] = etag
+        response['Cache-Control'] = CACHE_CONTROL
+        return response
+
+    accel = getattr(settings, 'MEDIA_ACCEL', None)
+    if accel:
+        # Proxy does the bytes (and ranges); we only authorise and set headers
+        response = HttpResponse(content_type=content_type)
+        if accel == 'nginx':
+            response['X-Accel-Redirect'] = settings.MEDIA_ACCEL_PREFIX + path
+        else:
+            response['X-Sendfile'] = full_path
+    else:
+        byte_range = None
+        range_header = request.META.get('HTTP_RANGE')
+        # If-Range: only honour the range if the client's copy is still current
+        if range_header and request.META.get('HTTP_IF_RANGE', etag) in (etag, last_modified):
+            byte_range = _parse_range(range_header, stat.st_size)
+
+        if byte_range == 'unsatisfiable':
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{stat.st_size}'
+            return response
+
+        # Same reader for whole files and ranges, so ASGI gets an async body too (core/streaming.py)
+        start, end = byte_range or (0, stat.st_size - 1)
+        length = end - start + 1
+        body = stream_for(request, _read_slice(full_path, start, length))
+        if byte_range:
+            response = StreamingHttpResponse(body, status=206, content_type=content_type)
+            response['Content-Range'] = f'bytes {start}-{end}/{stat.st_size}'
+        else:
+            response = StreamingHttpResponse(body, content_type=content_type)
+        response['Content-Length'] = str(length)
+
+    response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = etag
+    response['Last-Modified'] = last_modified
+    response['Cache-Control'] = CACHE_CONTROL
+    return response
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_customuser_otp_code_customuser_otp_created_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='grievance',
+            index=models.Index(fields=['current_handler_designation', 'status', '-created_at'], name='grievance_handler_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='grievance',
+            index=models.Index(fields=['student', '-created_at'], name='grievance_student_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='grievance',
+            index=models.Index(fields=['department_category', '-created_at'], name='grievance_dept_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='grievance',
+            index=models.Index(fields=['-created_at', '-id'], name='grievance_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='grievance',
+            index=models.Index(fields=['status'], name='grievance_status_idx'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:39
+
+from django.db import migrations, models
+
+
+def fill_counters(apps, schema_editor):
+    # Seed the rollup row from the existing tables
+    StudentProfile = apps.get_model('core', 'StudentProfile')
+    AuthorityProfile = apps.get_model('core', 'AuthorityProfile')
+    Grievance = apps.get_model('core', 'Grievance')
+    DashboardCounters = apps.get_model('core', 'DashboardCounters')
+    DashboardCounters.objects.update_or_create(pk=1, defaults={
+        'students': StudentProfile.objects.count(),
+        'authorities': AuthorityProfile.objects.count(),
+        'grievances': Grievance.objects.count(),
+        'resolved': Grievance.objects.filter(status='Resolved').count(),
+    })
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_grievance_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DashboardCounters',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('students', models.IntegerField(default=0)),
+                ('authorities', models.IntegerField(default=0)),
+                ('grievances', models.IntegerField(default=0)),
+                ('resolved', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_customuser_otp_email'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customuser',
+            name='profile_pic_thumb',
+            field=models.ImageField(blank=True, null=True, upload_to='profile_pics/thumbs/'),
+        ),
+        migrations.AddField(
+            model_name='grievance',
+            name='image_thumb',
+            field=models.ImageField(blank=True, null=True, upload_to='grievance_imgs/thumbs/'),
+        ),
+        migrations.AddField(
+            model_name='grievance',
+            name='resolved_image_thumb',
+            field=models.ImageField(blank=True, null=True, upload_to='resolved_imgs/thumbs/'),
+        ),
+    ]
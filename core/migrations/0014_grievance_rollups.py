@@ -0,0 +1,56 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_storedblob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GrievanceTombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('grievance_id', models.BigIntegerField()),
+                ('grievance_created_at', models.DateTimeField()),
+                ('deleted_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='JobWatermark',
+            fields=[
+                ('name', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('value', models.DateTimeField()),
+            ],
+        ),
+        migrations.AddField(
+            model_name='grievance',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+        migrations.CreateModel(
+            name='GrievanceDailyStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('department_category', models.CharField(blank=True, max_length=50, null=True)),
+                ('category', models.CharField(max_length=255)),
+                ('status', models.CharField(max_length=20)),
+                ('count', models.IntegerField(default=0)),
+                ('resolution_seconds', models.BigIntegerField(default=0)),
+                ('res_under_1h', models.IntegerField(default=0)),
+                ('res_1h_4h', models.IntegerField(default=0)),
+                ('res_4h_1d', models.IntegerField(default=0)),
+                ('res_1d_3d', models.IntegerField(default=0)),
+                ('res_3d_7d', models.IntegerField(default=0)),
+                ('res_over_7d', models.IntegerField(default=0)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['day', 'department_category'], name='daily_stat_day_dept_idx')],
+                'constraints': [models.UniqueConstraint(fields=('day', 'department_category', 'category', 'status'), name='daily_stat_unique')],
+            },
+        ),
+    ]
@@ -0,0 +1,81 @@
+from django.db import migrations
+
+# Full-text index over Grievance.category + description, kept in sync by the database itself:
+#  - PostgreSQL: a generated tsvector column (category weighted above description) + GIN index
+#  - SQLite: an external-content FTS5 table maintained by triggers
+# Other backends get nothing and core/search.py falls back to icontains.
+# NOTE (SQLite): a later migration that makes Django rebuild core_grievance (e.g. AlterField)
+# drops these triggers - such a migration must re-run SQLITE_BACKWARD + SQLITE_FORWARD.
+
+POSTGRES_FORWARD = [
+    """
+    ALTER TABLE core_grievance ADD COLUMN search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(category, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(description, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX grievance_search_gin ON core_grievance USING GIN (search_vector)",
+]
+POSTGRES_BACKWARD = [
+    "DROP INDEX IF EXISTS grievance_search_gin",
+    "ALTER TABLE core_grievance DROP COLUMN IF EXISTS search_vector",
+]
+
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE core_grievance_fts USING fts5(
+        category, description, content='core_grievance', content_rowid='id',
+        tokenize='porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER core_grievance_fts_ai AFTER INSERT ON core_grievance BEGIN
+        INSERT INTO core_grievance_fts(rowid, category, description)
+        VALUES (new.id, new.category, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER core_grievance_fts_ad AFTER DELETE ON core_grievance BEGIN
+        INSERT INTO core_grievance_fts(core_grievance_fts, rowid, category, description)
+        VALUES ('delete', old.id, old.category, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER core_grievance_fts_au AFTER UPDATE OF category, description ON core_grievance BEGIN
+        INSERT INTO core_grievance_fts(core_grievance_fts, rowid, category, description)
+        VALUES ('delete', old.id, old.category, old.description);
+        INSERT INTO core_grievance_fts(rowid, category, description)
+        VALUES (new.id, new.category, new.description);
+    END
+    """,
+    # Index the rows that already exist
+    "INSERT INTO core_grievance_fts(core_grievance_fts) VALUES ('rebuild')",
+]
+SQLITE_BACKWARD = [
+    "DROP TRIGGER IF EXISTS core_grievance_fts_ai",
+    "DROP TRIGGER IF EXISTS core_grievance_fts_ad",
+    "DROP TRIGGER IF EXISTS core_grievance_fts_au",
+    "DROP TABLE IF EXISTS core_grievance_fts",
+]
+
+
+def _run(statements_by_vendor):
+    def run(apps, schema_editor):
+        for statement in statements_by_vendor.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0014_grievance_rollups'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            _run({'postgresql': POSTGRES_FORWARD, 'sqlite': SQLITE_FORWARD}),
+            _run({'postgresql': POSTGRES_BACKWARD, 'sqlite': SQLITE_BACKWARD}),
+        ),
+    ]
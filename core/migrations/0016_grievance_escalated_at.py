@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0015_grievance_fulltext'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='grievance',
+            name='escalated_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
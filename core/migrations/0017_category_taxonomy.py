@@ -0,0 +1,88 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:51
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+# Same routing the grievance POST used to hard-code
+INITIAL_HANDLERS = {
+    'Hostel': 'Chief Warden',
+    'Mess': 'Chief Mess Coordinator',
+    'Academic': 'Dean Academics',
+    'Hospital': 'Chief Medical Officer',
+    'Sports/Gym': 'Chief Sports Coordinator',
+    'Ragging': 'DIRECTOR',
+    'Others': 'AO',
+    'Administration': 'AO',
+}
+
+
+def parse(full_name):
+    parts = [part.strip() for part in (full_name or '').split(' - ')]
+    return parts[0], (parts[1] if len(parts) > 2 else ''), (parts[-1] if len(parts) > 1 else '')
+
+
+def build_taxonomy(apps, schema_editor):
+    Department = apps.get_model('core', 'Department')
+    Category = apps.get_model('core', 'Category')
+    Grievance = apps.get_model('core', 'Grievance')
+
+    departments = {
+        name: Department.objects.create(name=name, initial_handler=handler)
+        for name, handler in INITIAL_HANDLERS.items()
+    }
+
+    # One Category per distinct string, then one UPDATE per category (not per grievance)
+    for full_name in Grievance.objects.values_list('category', flat=True).distinct():
+        dept_name, location, issue = parse(full_name)
+        department = departments.get(dept_name)
+        category = Category.objects.create(
+            name=full_name, department=department, location=location[:100], issue=issue[:100]
+        )
+        Grievance.objects.filter(category=full_name).update(category_ref=category, department=department)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0016_grievance_escalated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Category',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True)),
+                ('location', models.CharField(blank=True, db_index=True, max_length=100)),
+                ('issue', models.CharField(blank=True, max_length=100)),
+            ],
+            options={
+                'verbose_name_plural': 'categories',
+            },
+        ),
+        migrations.CreateModel(
+            name='Department',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('initial_handler', models.CharField(max_length=100)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='grievance',
+            name='category_ref',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='core.category'),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='department',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='categories', to='core.department'),
+        ),
+        migrations.AddField(
+            model_name='grievance',
+            name='department',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='core.department'),
+        ),
+        migrations.RunPython(build_taxonomy, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:02
+
+from django.db import migrations, models
+
+# Case-insensitive prefix search on name / email (core/views.py roster_page filters on
+# UPPER(col) LIKE 'PREFIX%'). PostgreSQL needs text_pattern_ops for LIKE to use a btree
+# under a non-C collation, which Django's Index can't express portably. SQLite can't use
+# an index for LIKE on an expression, so it gets none (fine for a dev database).
+POSTGRES_FORWARD = [
+    "CREATE INDEX user_first_name_prefix_idx ON core_customuser ((UPPER(first_name)) text_pattern_ops)",
+    "CREATE INDEX user_email_prefix_idx ON core_customuser ((UPPER(email)) text_pattern_ops)",
+]
+POSTGRES_BACKWARD = [
+    "DROP INDEX IF EXISTS user_first_name_prefix_idx",
+    "DROP INDEX IF EXISTS user_email_prefix_idx",
+]
+
+
+def _run(statements_by_vendor):
+    def run(apps, schema_editor):
+        for statement in statements_by_vendor.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0018_user_username_upper_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='authorityprofile',
+            index=models.Index(fields=['department', 'designation'], name='authority_dept_desig_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studentprofile',
+            index=models.Index(fields=['year', 'branch'], name='student_year_branch_idx'),
+        ),
+        migrations.RunPython(
+            _run({'postgresql': POSTGRES_FORWARD}),
+            _run({'postgresql': POSTGRES_BACKWARD}),
+        ),
+    ]
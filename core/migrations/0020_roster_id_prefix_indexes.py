@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:40
+
+from django.db import migrations
+
+# roster_page matches ?q= against UPPER(student_id / employee_id) LIKE 'PREFIX%'
+# (employee IDs keep the case they were typed in). Same text_pattern_ops
+# expression indexes as 0019; none on SQLite.
+POSTGRES_FORWARD = [
+    "CREATE INDEX student_id_prefix_idx ON core_studentprofile ((UPPER(student_id)) text_pattern_ops)",
+    "CREATE INDEX authority_employee_id_prefix_idx ON core_authorityprofile ((UPPER(employee_id)) text_pattern_ops)",
+]
+POSTGRES_BACKWARD = [
+    "DROP INDEX IF EXISTS student_id_prefix_idx",
+    "DROP INDEX IF EXISTS authority_employee_id_prefix_idx",
+]
+
+
+def _run(statements_by_vendor):
+    def run(apps, schema_editor):
+        for statement in statements_by_vendor.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0019_roster_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            _run({'postgresql': POSTGRES_FORWARD}),
+            _run({'postgresql': POSTGRES_BACKWARD}),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0020_roster_id_prefix_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='grievancetombstone',
+            name='handler_designation',
+            field=models.CharField(blank=True, max_length=100, null=True),
+        ),
+        migrations.AddField(
+            model_name='grievancetombstone',
+            name='reassigned',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='grievancetombstone',
+            name='student_id',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='grievancetombstone',
+            index=models.Index(fields=['student_id', 'deleted_at'], name='tombstone_student_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='grievancetombstone',
+            index=models.Index(fields=['handler_designation', 'deleted_at'], name='tombstone_handler_idx'),
+        ),
+    ]
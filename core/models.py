@@ -1,5 +1,10 @@
 from django.db import models
 from django.contrib.auth.models import AbstractUser
+from django.db.models.functions import Upper
+from django.utils import timezone
+
+from .caching import VersionedLocalCache
+from .images import process_new_images, release_replaced
 
 # 1. CENTRAL USER TABLE (Login Credentials)
 class CustomUser(AbstractUser):
@@ -10,11 +15,26 @@ class CustomUser(AbstractUser):
     )
     user_type = models.CharField(max_length=30, choices=USER_TYPE_CHOICES)
     profile_pic = models.ImageField(upload_to='profile_pics/', null=True, blank=True)
+    profile_pic_thumb = models.ImageField(upload_to='profile_pics/thumbs/', null=True, blank=True)
 
     last_password_change = models.DateTimeField(null=True, blank=True)
 
     otp_code = models.CharField(max_length=6, null=True, blank=True)
     otp_created_at = models.DateTimeField(null=True, blank=True)
+    # Outbox row carrying the latest OTP mail (lets the client poll delivery status)
+    otp_email = models.ForeignKey('EmailOutbox', null=True, blank=True, on_delete=models.SET_NULL, related_name='+')
+
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # Case-insensitive login / OTP lookups (core/backends.py)
+            models.Index(Upper('username'), name='user_username_upper_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        # Downscale / re-encode a freshly uploaded photo and build its thumbnail
+        replaced = process_new_images(self, [('profile_pic', 'profile_pic_thumb')])
+        super(CustomUser, self).save(*args, **kwargs)
+        release_replaced(replaced)
 
     def __str__(self):
         return f"{self.username} ({self.user_type})"
@@ -27,6 +47,12 @@ class StudentProfile(models.Model):
     branch = models.CharField(max_length=100, null=True, blank=True) # Ex: CSE
     gender = models.CharField(max_length=10)
 
+    class Meta:
+        indexes = [
+            # Admin directory filters (manage_students ?year=&branch=)
+            models.Index(fields=['year', 'branch'], name='student_year_branch_idx'),
+        ]
+
     def __str__(self):
         return self.student_id
 
@@ -38,17 +64,58 @@ class AuthorityProfile(models.Model):
     designation = models.CharField(max_length=50) # Ex: Warden
     gender = models.CharField(max_length=10)
 
+    class Meta:
+        indexes = [
+            # Admin directory filters (manage_authorities ?department=&designation=)
+            models.Index(fields=['department', 'designation'], name='authority_dept_desig_idx'),
+        ]
+
     def __str__(self):
         return f"{self.designation} - {self.department}"
 
-# 4. THE COMPLAINT (Grievance)
+# 4a. CATEGORY TAXONOMY
+# Each department and its first point of contact in the escalation hierarchy
+class Department(models.Model):
+    name = models.CharField(max_length=50, unique=True)  # Ex: Hostel
+    initial_handler = models.CharField(max_length=100)  # Ex: Chief Warden
+
+    def __str__(self):
+        return self.name
+
+
+# One row per distinct "Dept - Location - Issue" string the students pick
+class Category(models.Model):
+    name = models.CharField(max_length=255, unique=True)  # Ex: Hostel - I1 - Electrical
+    department = models.ForeignKey(Department, null=True, blank=True, on_delete=models.SET_NULL, related_name='categories')
+    location = models.CharField(max_length=100, blank=True, db_index=True)  # Ex: I1
+    issue = models.CharField(max_length=100, blank=True)  # Ex: Electrical
+
+    class Meta:
+        verbose_name_plural = 'categories'
+
+    @staticmethod
+    def parse(full_name):
+        """'Hostel - I1 - Electrical' -> ('Hostel', 'I1', 'Electrical'); 'Mess - Food' -> ('Mess', '', 'Food')"""
+        parts = [part.strip() for part in (full_name or '').split(' - ')]
+        department = parts[0]
+        location = parts[1] if len(parts) > 2 else ''
+        issue = parts[-1] if len(parts) > 1 else ''
+        return department, location, issue
+
+    def __str__(self):
+        return self.name
+
+
+# 4b. THE COMPLAINT (Grievance)
 class Grievance(models.Model):
     student = models.ForeignKey(StudentProfile, on_delete=models.CASCADE)
     category = models.CharField(max_length=255) # E.g. "Hostel - I1 - Electrical"
     description = models.TextField()
     image = models.ImageField(upload_to='grievance_imgs/', blank=True, null=True)
+    image_thumb = models.ImageField(upload_to='grievance_imgs/thumbs/', blank=True, null=True)
 
     resolved_image = models.ImageField(upload_to='resolved_imgs/', blank=True, null=True)
+    resolved_image_thumb = models.ImageField(upload_to='resolved_imgs/thumbs/', blank=True, null=True)
     
     status = models.CharField(max_length=20, default='Pending') # Pending, Resolved, Escalated
     authority_reply = models.TextField(blank=True, null=True)
@@ -60,14 +127,53 @@ class Grievance(models.Model):
     
     # Stores the Department (e.g., "Hostel") to help with lookup
     department_category = models.CharField(max_length=50, blank=True, null=True)
+
+    # Normalised references (category / department_category strings are kept for display & old clients)
+    department = models.ForeignKey(Department, null=True, blank=True, on_delete=models.SET_NULL)
+    category_ref = models.ForeignKey(Category, null=True, blank=True, on_delete=models.SET_NULL)
     
     created_at = models.DateTimeField(auto_now_add=True)
     resolved_at = models.DateTimeField(blank=True, null=True)
+    # Last time auto-escalation moved this to a new handler (core/escalation.py)
+    escalated_at = models.DateTimeField(blank=True, null=True)
+
+    # Bumped on every save(); queryset.update() callers must set it themselves
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        # Shaped for the hot paths: authority dashboards (handler + status, newest first),
+        # student dashboards (own grievances, newest first), admin list / keyset paging
+        # (created_at, id) and the status counts in dashboard_stats.
+        indexes = [
+            models.Index(fields=['current_handler_designation', 'status', '-created_at'], name='grievance_handler_status_idx'),
+            models.Index(fields=['student', '-created_at'], name='grievance_student_created_idx'),
+            models.Index(fields=['department_category', '-created_at'], name='grievance_dept_created_idx'),
+            models.Index(fields=['-created_at', '-id'], name='grievance_created_idx'),
+            models.Index(fields=['status'], name='grievance_status_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        replaced = process_new_images(self, [('image', 'image_thumb'), ('resolved_image', 'resolved_image_thumb')])
+        super(Grievance, self).save(*args, **kwargs)
+        release_replaced(replaced)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember what we loaded so signals can spot status / handler changes without a re-query
+        instance._loaded_status = instance.__dict__.get('status')
+        instance._loaded_handler = instance.__dict__.get('current_handler_designation')
+        return instance
 
     def __str__(self):
         return f"{self.id} - {self.category}"
     
 
+# Per-process copy of the settings row, shared-cache invalidated on save() (core/caching.py)
+SETTINGS_CACHE_TTL = 5
+settings_cache = VersionedLocalCache('core:site_settings:version', SETTINGS_CACHE_TTL)
+
+
 class SiteSettings(models.Model):
     # This ensures we only have one settings row
     allow_registration = models.BooleanField(default=True)
@@ -79,8 +185,168 @@ class SiteSettings(models.Model):
         # Force ID to be 1 (Singleton Pattern)
         self.pk = 1
         super(SiteSettings, self).save(*args, **kwargs)
+        # New stamp -> every worker reloads on its next check
+        settings_cache.publish()
+
+    @classmethod
+    def invalidate(cls):
+        settings_cache.clear()
+
+    @classmethod
+    def load(cls):
+        return settings_cache.get(lambda: cls.objects.get_or_create(pk=1)[0])
+
+
+# Rollup row behind dashboard_stats, kept in step by core/signals.py
+class DashboardCounters(models.Model):
+    students = models.IntegerField(default=0)
+    authorities = models.IntegerField(default=0)
+    grievances = models.IntegerField(default=0)
+    resolved = models.IntegerField(default=0)
+
+    def save(self, *args, **kwargs):
+        # Singleton, same as SiteSettings
+        self.pk = 1
+        super(DashboardCounters, self).save(*args, **kwargs)
+
+    @classmethod
+    def live_counts(cls):
+        return {
+            'students': StudentProfile.objects.count(),
+            'authorities': AuthorityProfile.objects.count(),
+            'grievances': Grievance.objects.count(),
+            'resolved': Grievance.objects.filter(status='Resolved').count(),
+        }
+
+    @classmethod
+    def rebuild(cls):
+        obj = cls(**cls.live_counts())
+        obj.save()
+        return obj
 
     @classmethod
     def load(cls):
-        obj, created = cls.objects.get_or_create(pk=1)
-        return obj
\ No newline at end of file
+        obj = cls.objects.filter(pk=1).first()
+        if obj is None:
+            obj = cls.rebuild()
+        return obj
+
+    @classmethod
+    def bump(cls, **deltas):
+        """Atomically add deltas, e.g. bump(grievances=1, resolved=-1)."""
+        deltas = {name: delta for name, delta in deltas.items() if delta}
+        if not deltas:
+            return
+        updated = cls.objects.filter(pk=1).update(
+            **{name: models.F(name) + delta for name, delta in deltas.items()}
+        )
+        if not updated:
+            # Row missing (fresh DB): build it from the live tables, which already include this change
+            cls.rebuild()
+
+
+# Durable queue of outgoing mail, drained by `manage.py send_outbox` (see core/outbox.py)
+class EmailOutbox(models.Model):
+    STATUS_CHOICES = (
+        ('pending', 'Pending'),
+        ('sent', 'Sent'),
+        ('dead', 'Dead'),  # gave up after MAX_ATTEMPTS
+    )
+    subject = models.CharField(max_length=255)
+    message = models.TextField()
+    recipients = models.TextField()  # comma separated
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    attempts = models.IntegerField(default=0)
+    last_error = models.TextField(blank=True, null=True)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='outbox_due_idx'),
+        ]
+
+    @classmethod
+    def enqueue(cls, subject, message, recipient_list):
+        return cls.objects.create(subject=subject, message=message, recipients=','.join(recipient_list))
+
+    def recipient_list(self):
+        return [address for address in self.recipients.split(',') if address]
+
+    def __str__(self):
+        return f"{self.id} - {self.subject} ({self.status})"
+
+
+# One row per unique uploaded file in the content-addressed store (core/storage.py)
+class StoredBlob(models.Model):
+    name = models.CharField(max_length=255, primary_key=True)  # blobs/ab/cd/<sha256>.<ext>
+    size = models.BigIntegerField()
+    refcount = models.IntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.name} (x{self.refcount})"
+
+
+# Left behind whenever a grievance drops out of a list, so incremental readers
+# (analytics rollups, delta sync) can see it after the fact: deleted outright (gone from
+# every list), or reassigned (gone from handler_designation's list only)
+class GrievanceTombstone(models.Model):
+    grievance_id = models.BigIntegerField()
+    grievance_created_at = models.DateTimeField()
+    student_id = models.BigIntegerField(blank=True, null=True)  # StudentProfile pk; None when reassigned
+    handler_designation = models.CharField(max_length=100, blank=True, null=True)
+    reassigned = models.BooleanField(default=False)
+    deleted_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        # Delta sync reads "left this student's / this designation's list since T"
+        indexes = [
+            models.Index(fields=['student_id', 'deleted_at'], name='tombstone_student_idx'),
+            models.Index(fields=['handler_designation', 'deleted_at'], name='tombstone_handler_idx'),
+        ]
+
+    def __str__(self):
+        if self.reassigned:
+            return f"Grievance {self.grievance_id} moved off {self.handler_designation}"
+        return f"Deleted grievance {self.grievance_id}"
+
+
+# Daily rollup for trend charts, rebuilt per touched day by `manage.py build_rollups`.
+# Day = UTC date the grievance was created.
+class GrievanceDailyStat(models.Model):
+    day = models.DateField()
+    department_category = models.CharField(max_length=50, blank=True, null=True)
+    category = models.CharField(max_length=255)
+    status = models.CharField(max_length=20)
+    count = models.IntegerField(default=0)
+
+    # Resolution-time histogram (rows with status Resolved only)
+    resolution_seconds = models.BigIntegerField(default=0)  # sum, for averages
+    res_under_1h = models.IntegerField(default=0)
+    res_1h_4h = models.IntegerField(default=0)
+    res_4h_1d = models.IntegerField(default=0)
+    res_1d_3d = models.IntegerField(default=0)
+    res_3d_7d = models.IntegerField(default=0)
+    res_over_7d = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'department_category', 'category', 'status'], name='daily_stat_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['day', 'department_category'], name='daily_stat_day_dept_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.category} {self.status}: {self.count}"
+
+
+# Named high-water marks for incremental jobs (e.g. 'rollups')
+class JobWatermark(models.Model):
+    name = models.CharField(max_length=50, primary_key=True)
+    value = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.name} @ {self.value}"
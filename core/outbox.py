@@ -0,0 +1,96 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from .models import EmailOutbox
+
+DEFAULT_BATCH_SIZE = 50
+MAX_ATTEMPTS = 5
+# Retry after 1, 2, 4, 8 ... minutes
+BASE_BACKOFF = timedelta(minutes=1)
+
+
+def backoff_for(attempts):
+    return BASE_BACKOFF * (2 ** (attempts - 1))
+
+
+def deliver_batch(batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Sends up to `batch_size` due outbox rows over ONE mail connection.
+    Failures are retried with exponential backoff, then marked 'dead'.
+    Returns (sent, failed) counts for this batch.
+    """
+    now = timezone.now()
+    sent = failed = 0
+
+    batch = _claim(batch_size, now)
+    if not batch:
+        return 0, 0
+
+    # No transaction or row locks held while talking to SMTP; each result is saved on its own
+    handled = set()
+    connection = get_connection(fail_silently=False)
+    try:
+        connection.open()
+        for item in batch:
+            email = EmailMessage(
+                item.subject, item.message, settings.EMAIL_HOST_USER,
+                item.recipient_list(), connection=connection,
+            )
+            try:
+                email.send()
+            except Exception as e:
+                handled.add(item.id)
+                _mark_failed(item, e, now)
+                failed += 1
+            else:
+                handled.add(item.id)
+                item.status = 'sent'
+                item.sent_at = timezone.now()
+                item.attempts += 1
+                item.last_error = None
+                item.save(update_fields=['status', 'sent_at', 'attempts', 'last_error'])
+                sent += 1
+    except Exception as e:
+        # Could not even connect: every row not yet handled counts as a failed attempt
+        for item in batch:
+            if item.id not in handled:
+                _mark_failed(item, e, now)
+                failed += 1
+    finally:
+        connection.close()
+
+    return sent, failed
+
+
+def _claim(batch_size, now):
+    """
+    Takes due rows for this worker in a short transaction by pushing next_attempt_at
+    past the time the batch can take to send. Other workers skip them meanwhile; if this
+    one dies mid-batch they come due again once the lease runs out.
+    """
+    with transaction.atomic():
+        # skip_locked lets several workers claim side by side (PostgreSQL);
+        # SQLite has no row locks and simply ignores it.
+        batch = list(
+            EmailOutbox.objects.select_for_update(skip_locked=True)
+            .filter(status='pending', next_attempt_at__lte=now)
+            .order_by('next_attempt_at', 'id')[:batch_size]
+        )
+        if batch:
+            lease = timedelta(seconds=(settings.EMAIL_TIMEOUT or 60) * (len(batch) + 1))
+            EmailOutbox.objects.filter(id__in=[item.id for item in batch]).update(next_attempt_at=now + lease)
+    return batch
+
+
+def _mark_failed(item, error, now):
+    item.attempts += 1
+    item.last_error = str(error)
+    if item.attempts >= MAX_ATTEMPTS:
+        item.status = 'dead'
+    else:
+        item.next_attempt_at = now + backoff_for(item.attempts)
+    item.save(update_fields=['attempts', 'last_error', 'status', 'next_attempt_at'])
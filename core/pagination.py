@@ -0,0 +1,94 @@
+import base64
+from datetime import timedelta
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+# Page size used when the client asks for pages but gives no limit
+DEFAULT_PAGE_SIZE = 50
+# Hard cap so a single request never pulls an unbounded slice of the table
+MAX_PAGE_SIZE = 200
+
+
+# Delta sync re-sends rows stamped a little before the last sync: a transaction
+# that was still open then may have committed rows with an older updated_at
+SYNC_OVERLAP = timedelta(minutes=2)
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(created_at, pk):
+    # Cursor is "<iso timestamp>|<id>" of the last row on the page (URL safe)
+    raw = f"{created_at.isoformat()}|{pk}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        stamp, pk = raw.rsplit('|', 1)
+        created_at = parse_datetime(stamp)
+        if created_at is None:
+            raise ValueError
+        return created_at, int(pk)
+    except (ValueError, UnicodeDecodeError):
+        raise InvalidCursor('Invalid cursor.')
+
+
+def get_page_size(raw_limit):
+    if raw_limit in (None, ''):
+        return DEFAULT_PAGE_SIZE
+    try:
+        limit = int(raw_limit)
+    except (TypeError, ValueError):
+        raise InvalidCursor('limit must be a number.')
+    # Clamp into [1, MAX_PAGE_SIZE]
+    return max(1, min(limit, MAX_PAGE_SIZE))
+
+
+def paginate_keyset(queryset, cursor=None, limit=None):
+    """
+    Keyset pagination on (created_at, id), newest first.
+    Returns (rows, next_cursor). next_cursor is None on the last page.
+    `queryset` may be a model or a values() queryset, but must expose
+    `created_at` and `id`.
+    """
+    page_size = get_page_size(limit)
+    queryset = queryset.order_by('-created_at', '-id')
+
+    if cursor:
+        created_at, pk = decode_cursor(cursor)
+        # "Strictly after the last row" in (created_at DESC, id DESC) order
+        queryset = queryset.filter(
+            Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk)
+        )
+
+    # Fetch one extra row to know whether another page exists
+    rows = list(queryset[:page_size + 1])
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        last = rows[-1]
+        if isinstance(last, dict):
+            next_cursor = encode_cursor(last['created_at'], last['id'])
+        else:
+            next_cursor = encode_cursor(last.created_at, last.id)
+    return rows, next_cursor
+
+
+def encode_since(stamp):
+    # Delta-sync cursor: opaque to clients, just the server time the last sync started
+    return base64.urlsafe_b64encode(stamp.isoformat().encode()).decode()
+
+
+def decode_since(token):
+    """Returns the datetime rows must have changed after (overlap already applied)."""
+    try:
+        stamp = parse_datetime(base64.urlsafe_b64decode(token.encode()).decode())
+    except (ValueError, UnicodeDecodeError):
+        stamp = None
+    if stamp is None:
+        raise InvalidCursor('Invalid since cursor.')
+    return stamp - SYNC_OVERLAP
@@ -0,0 +1,107 @@
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .aggregates import resolution_time
+from .models import Grievance, GrievanceDailyStat, GrievanceTombstone, JobWatermark
+
+WATERMARK_NAME = 'rollups'
+# Re-read a little before the last watermark: a transaction that started earlier
+# may commit rows stamped just before it
+SAFETY_LAG = timedelta(minutes=2)
+
+# (field, lower bound, upper bound) of each resolution-time bucket
+HISTOGRAM_BUCKETS = [
+    ('res_under_1h', None, timedelta(hours=1)),
+    ('res_1h_4h', timedelta(hours=1), timedelta(hours=4)),
+    ('res_4h_1d', timedelta(hours=4), timedelta(days=1)),
+    ('res_1d_3d', timedelta(days=1), timedelta(days=3)),
+    ('res_3d_7d', timedelta(days=3), timedelta(days=7)),
+    ('res_over_7d', timedelta(days=7), None),
+]
+HISTOGRAM_FIELDS = [name for name, _, _ in HISTOGRAM_BUCKETS]
+
+
+def _day_bounds(day):
+    start = datetime.combine(day, time.min, tzinfo=dt_timezone.utc)
+    return start, start + timedelta(days=1)
+
+
+def _bucket_filter(lower, upper):
+    resolved = Q(status='Resolved', resolved_at__isnull=False)
+    if lower is not None:
+        resolved &= Q(resolved_at__gte=F('created_at') + lower)
+    if upper is not None:
+        resolved &= Q(resolved_at__lt=F('created_at') + upper)
+    return resolved
+
+
+def touched_days(since):
+    """UTC dates whose buckets may have changed since `since` (None = every day)."""
+    if since is None:
+        changed = Grievance.objects.all()
+        deleted = GrievanceTombstone.objects.none()
+    else:
+        changed = Grievance.objects.filter(updated_at__gte=since)
+        deleted = GrievanceTombstone.objects.filter(deleted_at__gte=since)
+
+    days = set(
+        changed.annotate(day=TruncDate('created_at', tzinfo=dt_timezone.utc))
+        .values_list('day', flat=True).distinct()
+    )
+    days |= set(
+        deleted.annotate(day=TruncDate('grievance_created_at', tzinfo=dt_timezone.utc))
+        .values_list('day', flat=True).distinct()
+    )
+    return sorted(days)
+
+
+def rebuild_day(day):
+    """Replaces the rollup rows of one day with a fresh GROUP BY over that day's grievances."""
+    start, end = _day_bounds(day)
+    aggregates = {
+        'count': Count('id'),
+        'resolution_seconds': Sum(resolution_time(), filter=Q(status='Resolved', resolved_at__isnull=False)),
+    }
+    for name, lower, upper in HISTOGRAM_BUCKETS:
+        aggregates[name] = Count('id', filter=_bucket_filter(lower, upper))
+
+    groups = (
+        Grievance.objects.filter(created_at__gte=start, created_at__lt=end)
+        .values('department_category', 'category', 'status')
+        .annotate(**aggregates)
+    )
+    rows = []
+    for group in groups:
+        total = group['resolution_seconds']
+        group['resolution_seconds'] = int(total.total_seconds()) if total else 0
+        rows.append(GrievanceDailyStat(day=day, **group))
+
+    with transaction.atomic():
+        GrievanceDailyStat.objects.filter(day=day).delete()
+        GrievanceDailyStat.objects.bulk_create(rows)
+    return len(rows)
+
+
+def build_rollups(full=False):
+    """
+    Brings GrievanceDailyStat up to date. Only days touched since the stored
+    watermark are recomputed, unless `full` is set.
+    Returns the list of rebuilt days.
+    """
+    started = timezone.now()
+    watermark = JobWatermark.objects.filter(name=WATERMARK_NAME).first()
+    since = None if full or watermark is None else watermark.value - SAFETY_LAG
+
+    if since is None:
+        GrievanceDailyStat.objects.all().delete()
+
+    days = touched_days(since)
+    for day in days:
+        rebuild_day(day)
+
+    JobWatermark.objects.update_or_create(name=WATERMARK_NAME, defaults={'value': started})
+    return days
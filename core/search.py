@@ -0,0 +1,53 @@
+import re
+
+from django.db import connection
+from django.db.models import BooleanField, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+# Longest query we bother parsing
+MAX_TERMS = 10
+TERM_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def search_terms(query):
+    return TERM_RE.findall(query or '')[:MAX_TERMS]
+
+
+def search_grievances(grievances, query):
+    """
+    Narrows `grievances` to rows matching every term of `query` (each term also
+    matches as a prefix: "elec" finds "Electrical") and annotates `rank`
+    (higher = better). Uses the full-text index from migration 0015.
+    """
+    terms = search_terms(query)
+    if not terms:
+        return grievances.none().annotate(rank=Value(0.0, output_field=FloatField()))
+
+    if connection.vendor == 'postgresql':
+        tsquery = ' & '.join(f"{term}:*" for term in terms)
+        # search_vector is a generated column the model doesn't declare, hence RawSQL
+        return grievances.filter(
+            RawSQL("core_grievance.search_vector @@ to_tsquery('english', %s)", [tsquery], output_field=BooleanField())
+        ).annotate(
+            rank=RawSQL("ts_rank(core_grievance.search_vector, to_tsquery('english', %s))", [tsquery], output_field=FloatField())
+        )
+
+    if connection.vendor == 'sqlite':
+        # FTS5: quoted term + * = prefix match; space = AND
+        match = ' '.join('"{}"*'.format(term.replace('"', '')) for term in terms)
+        return grievances.filter(
+            id__in=RawSQL("SELECT rowid FROM core_grievance_fts WHERE core_grievance_fts MATCH %s", [match])
+        ).annotate(
+            # bm25() is "lower is better", flip it so rank sorts the same way as on PostgreSQL
+            rank=RawSQL(
+                "(SELECT -bm25(core_grievance_fts, 2.0, 1.0) FROM core_grievance_fts "
+                "WHERE core_grievance_fts MATCH %s AND rowid = core_grievance.id)",
+                [match], output_field=FloatField(),
+            )
+        )
+
+    # No full-text index on this backend: plain substring match, unranked
+    condition = Q()
+    for term in terms:
+        condition &= Q(description__icontains=term) | Q(category__icontains=term)
+    return grievances.filter(condition).annotate(rank=Value(0.0, output_field=FloatField()))
@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from django.utils import timezone
 from .models import CustomUser, StudentProfile, AuthorityProfile, Grievance
 from .models import SiteSettings
 
@@ -23,10 +24,11 @@ class AuthoritySerializer(serializers.ModelSerializer):
     name = serializers.CharField(source='user.first_name', read_only=True)
 
     profile_pic = serializers.ImageField(source='user.profile_pic', read_only=True)
+    profile_pic_thumb = serializers.ImageField(source='user.profile_pic_thumb', read_only=True)
 
     class Meta:
         model = AuthorityProfile
-        fields = ['employee_id', 'department', 'designation', 'gender', 'email', 'name', 'profile_pic']
+        fields = ['employee_id', 'department', 'designation', 'gender', 'email', 'name', 'profile_pic', 'profile_pic_thumb']
 
 # 4. GRIEVANCE SERIALIZER
 class GrievanceSerializer(serializers.ModelSerializer):
@@ -37,6 +39,71 @@ class GrievanceSerializer(serializers.ModelSerializer):
         model = Grievance
         fields = '__all__'
 
+# 4b. LEAN GRIEVANCE LIST PROJECTION
+# Columns pulled with .values() in ONE joined query (student + user), instead of
+# ModelSerializer walking grievance.student.user for every row.
+GRIEVANCE_LIST_FIELDS = (
+    'id', 'student_id', 'category', 'description',
+    'image', 'image_thumb', 'resolved_image', 'resolved_image_thumb',
+    'status', 'authority_reply', 'feedback_stars', 'current_handler_designation',
+    'department_category', 'department_id', 'category_ref_id', 'created_at', 'resolved_at', 'escalated_at', 'updated_at',
+    'student__student_id', 'student__user__first_name',
+)
+
+
+def _file_url(field_name, name):
+    if not name:
+        return None
+    return Grievance._meta.get_field(field_name).storage.url(name)
+
+
+def _datetime(value):
+    # Same format DRF's DateTimeField produces ("...Z" for UTC)
+    if value is None:
+        return None
+    value = timezone.localtime(value)
+    text = value.isoformat()
+    if text.endswith('+00:00'):
+        text = text[:-6] + 'Z'
+    return text
+
+
+def grievance_list_queryset(grievances):
+    return grievances.values(*GRIEVANCE_LIST_FIELDS)
+
+
+def serialize_grievance_rows(rows):
+    """
+    Turns grievance_list_queryset() rows into the same JSON shape as
+    GrievanceSerializer, without building a serializer per row.
+    """
+    return [
+        {
+            'id': row['id'],
+            'student_id': row['student__student_id'],
+            'student_name': row['student__user__first_name'],
+            'category': row['category'],
+            'description': row['description'],
+            'image': _file_url('image', row['image']),
+            'image_thumb': _file_url('image_thumb', row['image_thumb']),
+            'resolved_image': _file_url('resolved_image', row['resolved_image']),
+            'resolved_image_thumb': _file_url('resolved_image_thumb', row['resolved_image_thumb']),
+            'status': row['status'],
+            'authority_reply': row['authority_reply'],
+            'feedback_stars': row['feedback_stars'],
+            'current_handler_designation': row['current_handler_designation'],
+            'department_category': row['department_category'],
+            'department': row['department_id'],
+            'category_ref': row['category_ref_id'],
+            'created_at': _datetime(row['created_at']),
+            'resolved_at': _datetime(row['resolved_at']),
+            'escalated_at': _datetime(row['escalated_at']),
+            'updated_at': _datetime(row['updated_at']),
+            'student': row['student_id'],
+        }
+        for row in rows
+    ]
+
 class SiteSettingsSerializer(serializers.ModelSerializer):
     class Meta:
         model = SiteSettings
@@ -0,0 +1,151 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .caching import response_cache, student_list_tag, handler_list_tag, ALL_GRIEVANCES_TAG
+from .events import publish_grievance_event
+from .models import CustomUser, StudentProfile, AuthorityProfile, Grievance, DashboardCounters, GrievanceTombstone, Department
+
+# Keep DashboardCounters in step with the tables it summarises.
+# Each handler is one UPDATE ... SET x = x + n, so it joins whatever transaction the write is in.
+# NOTE: queryset.update()/bulk_create() skip these signals - callers must DashboardCounters.bump() themselves.
+
+
+@receiver(post_save, sender=StudentProfile)
+def student_created(sender, instance, created, **kwargs):
+    if created:
+        DashboardCounters.bump(students=1)
+
+
+@receiver(post_delete, sender=StudentProfile)
+def student_deleted(sender, instance, **kwargs):
+    DashboardCounters.bump(students=-1)
+
+
+@receiver(post_save, sender=AuthorityProfile)
+def authority_created(sender, instance, created, **kwargs):
+    if created:
+        DashboardCounters.bump(authorities=1)
+
+
+@receiver(post_delete, sender=AuthorityProfile)
+def authority_deleted(sender, instance, **kwargs):
+    DashboardCounters.bump(authorities=-1)
+
+
+@receiver(post_save, sender=Grievance)
+def grievance_saved(sender, instance, created, **kwargs):
+    was_resolved = not created and getattr(instance, '_loaded_status', None) == 'Resolved'
+    is_resolved = instance.status == 'Resolved'
+
+    DashboardCounters.bump(
+        grievances=1 if created else 0,
+        resolved=int(is_resolved) - int(was_resolved),
+    )
+
+    # Live push (core/events.py) once the change is actually committed
+    if created:
+        event_type = 'created'
+    elif getattr(instance, '_loaded_status', None) != instance.status:
+        event_type = 'status_changed'
+    elif getattr(instance, '_loaded_handler', None) != instance.current_handler_designation:
+        event_type = 'reassigned'
+    else:
+        event_type = None
+    if event_type:
+        args = (event_type, instance.id, instance.status, instance.current_handler_designation, instance.student_id)
+        transaction.on_commit(lambda: publish_grievance_event(*args))
+
+    # Cached lists it shows up in, plus the previous handler's if it was reassigned
+    tags = [ALL_GRIEVANCES_TAG, student_list_tag(instance.student.student_id),
+            handler_list_tag(instance.current_handler_designation)]
+    previous_handler = getattr(instance, '_loaded_handler', None)
+    if not created and previous_handler != instance.current_handler_designation:
+        tags.append(handler_list_tag(previous_handler))
+        # Delta sync tells the previous handler to drop it
+        if previous_handler:
+            GrievanceTombstone.objects.create(
+                grievance_id=instance.id, grievance_created_at=instance.created_at,
+                handler_designation=previous_handler, reassigned=True,
+            )
+    _invalidate('stats', *tags)
+
+    instance._loaded_status = instance.status
+    instance._loaded_handler = instance.current_handler_designation
+
+
+@receiver(post_delete, sender=Grievance)
+def grievance_tombstoned(sender, instance, **kwargs):
+    GrievanceTombstone.objects.create(
+        grievance_id=instance.id, grievance_created_at=instance.created_at,
+        student_id=instance.student_id, handler_designation=instance.current_handler_designation,
+    )
+
+
+@receiver(post_delete, sender=Grievance)
+def grievance_deleted(sender, instance, **kwargs):
+    DashboardCounters.bump(
+        grievances=-1,
+        resolved=-1 if getattr(instance, '_loaded_status', instance.status) == 'Resolved' else 0,
+    )
+
+
+# Release content-addressed uploads (core/storage.py) when their row goes away.
+# Files from before the blob store are left alone, as they always were.
+def _release_files(instance, field_names):
+    for field_name in field_names:
+        field_file = getattr(instance, field_name)
+        if field_file and getattr(field_file.storage, 'is_managed', lambda name: False)(field_file.name):
+            field_file.storage.delete(field_file.name)
+
+
+@receiver(post_delete, sender=Grievance)
+def grievance_files_released(sender, instance, **kwargs):
+    _release_files(instance, ['image', 'image_thumb', 'resolved_image', 'resolved_image_thumb'])
+
+
+@receiver(post_delete, sender=CustomUser)
+def user_files_released(sender, instance, **kwargs):
+    _release_files(instance, ['profile_pic', 'profile_pic_thumb'])
+
+
+# Department routing is cached per process (core/taxonomy.py): tell every worker to reload
+@receiver(post_save, sender=Department)
+@receiver(post_delete, sender=Department)
+def department_changed(sender, instance, **kwargs):
+    from .taxonomy import routing_cache
+    routing_cache.publish()
+
+
+
+# Response cache (core/caching.py): re-stamp the tags a change is visible under.
+# After commit, so a concurrent reader cannot re-cache the old rows under the new stamp.
+def _invalidate(*tags):
+    transaction.on_commit(lambda: response_cache.invalidate(*tags))
+
+
+@receiver(post_save, sender=StudentProfile)
+def student_cache_invalidated(sender, instance, created, **kwargs):
+    # Edits don't move the dashboard counts, creates do
+    _invalidate('students', *(['stats'] if created else []))
+
+
+@receiver(post_delete, sender=StudentProfile)
+def student_deleted_cache_invalidated(sender, instance, **kwargs):
+    _invalidate('students', 'stats')
+
+
+@receiver(post_save, sender=AuthorityProfile)
+def authority_cache_invalidated(sender, instance, created, **kwargs):
+    _invalidate('authorities', *(['stats'] if created else []))
+
+
+@receiver(post_delete, sender=AuthorityProfile)
+def authority_deleted_cache_invalidated(sender, instance, **kwargs):
+    _invalidate('authorities', 'stats')
+
+
+@receiver(post_delete, sender=Grievance)
+def grievance_deleted_cache_invalidated(sender, instance, **kwargs):
+    _invalidate('stats', ALL_GRIEVANCES_TAG, student_list_tag(instance.student.student_id),
+                handler_list_tag(instance.current_handler_designation))
@@ -0,0 +1,90 @@
+import hashlib
+import os
+
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.db import transaction
+from django.db.models import F
+
+BLOB_PREFIX = 'blobs/'
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    Stores every upload under the SHA-256 of its bytes, so the same picture is kept
+    once no matter how many grievances / profiles use it. StoredBlob.refcount tracks
+    the users; delete() only removes the file when the last one lets go.
+
+    Files saved before this storage existed (e.g. grievance_imgs/ARR.jpeg) keep their
+    names and are read and deleted exactly as FileSystemStorage would.
+    """
+
+    def is_managed(self, name):
+        return bool(name) and name.startswith(BLOB_PREFIX)
+
+    def _blob_name(self, name, content):
+        digest = hashlib.sha256()
+        content.seek(0)
+        for chunk in content.chunks():
+            digest.update(chunk)
+        content.seek(0)
+        ext = os.path.splitext(name)[1].lower()
+        sha = digest.hexdigest()
+        return f"{BLOB_PREFIX}{sha[:2]}/{sha[2:4]}/{sha}{ext}"
+
+    def save(self, name, content, max_length=None):
+        from .models import StoredBlob
+
+        if name is None:
+            name = content.name
+        if not hasattr(content, 'chunks'):
+            content = File(content, name)
+
+        blob_name = self._blob_name(name, content)
+        with transaction.atomic():
+            blob, created = StoredBlob.objects.select_for_update().get_or_create(
+                name=blob_name, defaults={'size': content.size, 'refcount': 1}
+            )
+            if not created:
+                StoredBlob.objects.filter(name=blob_name).update(refcount=F('refcount') + 1)
+            # Only touch the disk for bytes we have not seen before
+            if created or not self.exists(blob_name):
+                self._write_blob(blob_name, content)
+        return blob_name
+
+    def add_references(self, name, count):
+        """Records `count` more rows pointing at an already saved blob (one upload shared by many)."""
+        from .models import StoredBlob
+
+        if self.is_managed(name) and count:
+            StoredBlob.objects.filter(name=name).update(refcount=F('refcount') + count)
+
+    def _write_blob(self, blob_name, content):
+        if self.exists(blob_name):
+            # Left behind by an earlier rolled-back save: identical bytes by definition
+            return
+        stored = self._save(blob_name, content)
+        if stored != blob_name:
+            # Lost a race to another process writing the same bytes; keep theirs
+            super().delete(stored)
+
+    def delete(self, name):
+        from .models import StoredBlob
+
+        if not self.is_managed(name):
+            return super().delete(name)
+
+        with transaction.atomic():
+            updated = StoredBlob.objects.filter(name=name, refcount__gt=1).update(refcount=F('refcount') - 1)
+            if updated:
+                return
+            StoredBlob.objects.filter(name=name).delete()
+            # Last reference gone: remove the bytes once the row deletion is committed
+            transaction.on_commit(lambda: self._delete_if_unreferenced(name))
+
+    def _delete_if_unreferenced(self, name):
+        from .models import StoredBlob
+
+        # Someone may have uploaded the same bytes again in the meantime
+        if not StoredBlob.objects.filter(name=name).exists():
+            super().delete(name)
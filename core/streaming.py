@@ -0,0 +1,38 @@
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+
+
+def is_asgi(request):
+    # DRF's Request wraps the Django one
+    return isinstance(getattr(request, '_request', request), ASGIRequest)
+
+
+def stream_for(request, iterator, batch_size=1):
+    """
+    Body for a StreamingHttpResponse that really streams under both servers.
+    WSGI iterates a plain iterator lazily. Under ASGI Django would drain a sync
+    iterator into a list before sending, so hand it an async generator that pulls
+    `batch_size` items per hop onto the request's sync thread (where its DB
+    connection / server-side cursor lives) and sends them as one chunk.
+    """
+    if not is_asgi(request):
+        return iterator
+
+    iterator = iter(iterator)
+    take = sync_to_async(lambda: list(islice(iterator, batch_size)), thread_sensitive=True)
+
+    async def stream():
+        try:
+            while True:
+                items = await take()
+                if not items:
+                    break
+                yield items[0][:0].join(items)
+        finally:
+            close = getattr(iterator, 'close', None)
+            if close is not None:
+                await sync_to_async(close, thread_sensitive=True)()
+
+    return stream()
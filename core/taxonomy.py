@@ -0,0 +1,34 @@
+from .caching import VersionedLocalCache
+from .models import Category, Department
+
+# Fallback for departments nobody has set up (same default the POST always had)
+DEFAULT_HANDLER = 'AO'
+
+routing_cache = VersionedLocalCache('core:department_routing:version', ttl=60)
+
+
+def _load_routing():
+    return {
+        name: (dept_id, handler)
+        for dept_id, name, handler in Department.objects.values_list('id', 'name', 'initial_handler')
+    }
+
+
+def route(full_category):
+    """
+    'Hostel - I1 - Electrical' -> (department_id or None, 'Hostel', 'Chief Warden').
+    Served from a per-process lookup table; no query in the common case.
+    """
+    dept_name = Category.parse(full_category)[0]
+    dept_id, handler = routing_cache.get(_load_routing).get(dept_name, (None, DEFAULT_HANDLER))
+    return dept_id, dept_name, handler
+
+
+def category_for(full_category, department_id):
+    """The Category row for this exact string, created the first time it is seen."""
+    dept_name, location, issue = Category.parse(full_category)
+    category, created = Category.objects.get_or_create(
+        name=full_category,
+        defaults={'department_id': department_id, 'location': location[:100], 'issue': issue[:100]},
+    )
+    return category
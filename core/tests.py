@@ -1,3 +1,1086 @@
-from django.test import TestCase
+import asyncio
+import json
+from datetime import timedelta
 
-# Create your tests here.
+import csv
+import io
+import os
+import shutil
+import tempfile
+import warnings
+from io import BytesIO
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from PIL import Image
+
+from django.core import mail
+from django.core.mail import EmailMessage
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.db.models import Sum
+from django.test import AsyncClient, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from .models import CustomUser, StudentProfile, Grievance, DashboardCounters, SiteSettings, EmailOutbox, StoredBlob, AuthorityProfile, GrievanceDailyStat, Department
+from .backends import get_user_by_username
+from .outbox import MAX_ATTEMPTS, deliver_batch
+from .images import MAX_DIMENSION, THUMB_SIZE
+from .rollups import build_rollups
+from .escalation import escalate_overdue
+from .taxonomy import route, routing_cache
+from . import events
+from . import models as core_models
+from .pagination import encode_since
+from .serializers import GrievanceSerializer, grievance_list_queryset, serialize_grievance_rows
+
+
+def make_student(student_id='N180001', name='Ravi'):
+    user = CustomUser.objects.create_user(
+        username=student_id, password=None, first_name=name,
+        email=f'{student_id.lower()}@example.com', user_type='student'
+    )
+    return StudentProfile.objects.create(user=user, student_id=student_id, year='E1', gender='Male')
+
+
+def make_grievance(student, **kwargs):
+    defaults = {
+        'category': 'Hostel - I1 - Electrical',
+        'description': 'Fan not working',
+        'department_category': 'Hostel',
+        'current_handler_designation': 'Chief Warden',
+    }
+    defaults.update(kwargs)
+    return Grievance.objects.create(student=student, **defaults)
+
+
+class GrievanceListQueryTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+    def _seed(self, count, start=0):
+        for i in range(start, start + count):
+            student = make_student(f'N18{i:04d}', f'Student {i}')
+            make_grievance(student)
+
+    def test_admin_list_query_count_is_constant(self):
+        # ETag aggregate + the list itself
+        self._seed(3)
+        with self.assertNumQueries(2):
+            small = self.client.get('/api/grievances/?role=admin')
+
+        self._seed(20, start=3)
+        with self.assertNumQueries(2):
+            large = self.client.get('/api/grievances/?role=admin')
+
+        self.assertEqual(len(small.json()), 3)
+        self.assertEqual(len(large.json()), 23)
+
+    def test_paginated_list_query_count_is_constant(self):
+        self._seed(30)
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/grievances/?role=admin&limit=10')
+        self.assertEqual(len(response.json()['results']), 10)
+
+    def test_projection_matches_model_serializer(self):
+        self._seed(2)
+        queryset = Grievance.objects.order_by('id')
+        lean = serialize_grievance_rows(grievance_list_queryset(queryset))
+        full = GrievanceSerializer(queryset, many=True).data
+        self.assertEqual(lean, [dict(row) for row in full])
+
+
+class GrievancePaginationTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.student = make_student()
+
+    def test_cursor_continues_across_rows_with_equal_created_at(self):
+        ids = [make_grievance(self.student).id for _ in range(5)]
+        Grievance.objects.update(created_at=timezone.now())
+
+        seen, cursor = [], None
+        while True:
+            params = {'role': 'admin', 'limit': 2, **({'cursor': cursor} if cursor else {})}
+            page = self.client.get('/api/grievances/', params).json()
+            seen += [row['id'] for row in page['results']]
+            cursor = page['next_cursor']
+            if cursor is None:
+                break
+        # Ties on created_at fall back to id, so every row comes exactly once
+        self.assertEqual(seen, sorted(ids, reverse=True))
+
+    def test_date_to_is_inclusive(self):
+        late = make_grievance(self.student)
+        next_day = make_grievance(self.student)
+        day = timezone.now().replace(year=2026, month=3, day=10, hour=23, minute=59)
+        Grievance.objects.filter(id=late.id).update(created_at=day)
+        Grievance.objects.filter(id=next_day.id).update(created_at=day + timedelta(minutes=2))
+
+        def ids(**params):
+            page = self.client.get('/api/grievances/', {'role': 'admin', 'limit': 10, **params}).json()
+            return [row['id'] for row in page['results']]
+
+        self.assertEqual(ids(date_to='2026-03-10'), [late.id])
+        self.assertEqual(ids(date_from='2026-03-11'), [next_day.id])
+        self.assertEqual(ids(date_from='2026-03-10', date_to='2026-03-11'), [next_day.id, late.id])
+
+    def test_handler_and_status_filters(self):
+        warden = make_grievance(self.student)
+        dsw = make_grievance(self.student, current_handler_designation='DSW', status='Escalated')
+        make_grievance(self.student, current_handler_designation='DSW')
+
+        page = self.client.get('/api/grievances/?role=admin&limit=10&handler=Chief+Warden').json()
+        self.assertEqual([row['id'] for row in page['results']], [warden.id])
+        page = self.client.get('/api/grievances/?role=admin&limit=10&handler=DSW&status=Escalated').json()
+        self.assertEqual([row['id'] for row in page['results']], [dsw.id])
+
+    def test_bad_cursor_or_limit_is_rejected(self):
+        make_grievance(self.student)
+        for query in ('cursor=not-a-cursor', 'limit=ten', 'date_to=yesterday'):
+            response = self.client.get(f'/api/grievances/?role=admin&{query}')
+            self.assertEqual(response.status_code, 400, query)
+            self.assertEqual(response.json()['status'], 'error')
+
+
+class AuthorityPerformanceTests(TestCase):
+    def test_metrics_grouped_by_designation(self):
+        student = make_student()
+        for hours in (1, 2, 3):
+            grievance = make_grievance(student, status='Resolved', feedback_stars=4)
+            Grievance.objects.filter(id=grievance.id).update(
+                resolved_at=grievance.created_at + timedelta(hours=hours)
+            )
+        make_grievance(student, status='Escalated')
+        make_grievance(student, status='Pending', current_handler_designation='AO', department_category='Others')
+
+        response = APIClient().get('/api/stats/performance/')
+        by_designation = {row['designation']: row for row in response.json()}
+
+        warden = by_designation['Chief Warden']
+        self.assertEqual((warden['total'], warden['resolved'], warden['escalated'], warden['pending']), (4, 3, 1, 0))
+        self.assertEqual(warden['rate'], 75)
+        self.assertEqual(warden['avg_resolution_hours'], 2.0)
+        self.assertEqual(warden['p50_resolution_hours'], 2.0)
+        self.assertEqual(warden['avg_feedback_stars'], 4.0)
+        self.assertIsNone(by_designation['AO']['avg_resolution_hours'])
+
+
+class DashboardCountersTests(TestCase):
+    def assertCountersMatchLiveTables(self):
+        counters = DashboardCounters.objects.get(pk=1)
+        live = DashboardCounters.live_counts()
+        self.assertEqual({name: getattr(counters, name) for name in live}, live)
+
+    def test_counters_follow_creates_status_changes_and_deletes(self):
+        student = make_student()
+        grievance = make_grievance(student)
+        make_grievance(student)
+        self.assertCountersMatchLiveTables()
+
+        grievance.status = 'Resolved'
+        grievance.save()
+        self.assertEqual(DashboardCounters.objects.get(pk=1).resolved, 1)
+
+        reloaded = Grievance.objects.get(id=grievance.id)
+        reloaded.status = 'Escalated'
+        reloaded.save()
+        self.assertEqual(DashboardCounters.objects.get(pk=1).resolved, 0)
+
+        # Deleting the student cascades to its grievances
+        student.user.delete()
+        self.assertCountersMatchLiveTables()
+
+    def test_dashboard_stats_reads_single_row(self):
+        make_grievance(make_student(), status='Resolved')
+        with self.assertNumQueries(1):
+            response = APIClient().get('/api/stats/')
+        self.assertEqual(response.json(), {'students': 1, 'authorities': 0, 'complaints': 1, 'rate': '100%'})
+
+
+class SiteSettingsCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        SiteSettings.invalidate()
+
+    def test_load_is_served_from_memory(self):
+        SiteSettings.load()
+        with self.assertNumQueries(0):
+            SiteSettings.load()
+
+    def test_save_invalidates_cached_copy(self):
+        self.assertTrue(SiteSettings.load().allow_registration)
+        APIClient().post('/api/settings/', {
+            'allow_registration': False, 'maintenance_mode': False,
+            'auto_escalation': False, 'email_alerts': True,
+        }, format='json')
+        self.assertFalse(SiteSettings.load().allow_registration)
+
+    def test_other_worker_save_is_seen_after_ttl(self):
+        SiteSettings.load()
+        # Simulate another process saving: the row and stamp change, our memory copy does not
+        SiteSettings.objects.filter(pk=1).update(maintenance_mode=True)
+        cache.set(core_models.settings_cache.version_key, 'other-worker', None)
+        self.assertFalse(SiteSettings.load().maintenance_mode)
+
+        core_models.settings_cache.expires = 0.0
+        self.assertTrue(SiteSettings.load().maintenance_mode)
+
+
+class EmailOutboxTests(TestCase):
+    # Django's test runner swaps in the locmem email backend, so nothing leaves the machine
+
+    def setUp(self):
+        cache.clear()
+        SiteSettings.invalidate()
+
+    def test_status_update_only_queues_mail(self):
+        grievance = make_grievance(make_student())
+        APIClient().patch('/api/grievances/', {'id': grievance.id, 'status': 'Resolved', 'reply': 'Fixed'}, format='json')
+
+        self.assertEqual(len(mail.outbox), 0)
+        queued = EmailOutbox.objects.get()
+        self.assertEqual(queued.recipient_list(), ['n180001@example.com'])
+
+        self.assertEqual(deliver_batch(), (1, 0))
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(EmailOutbox.objects.get().status, 'sent')
+
+    def test_batch_reuses_one_connection(self):
+        for i in range(3):
+            EmailOutbox.enqueue('Subject', 'Body', [f'user{i}@example.com'])
+        with mock.patch('core.outbox.get_connection', wraps=mail.get_connection) as get_connection:
+            self.assertEqual(deliver_batch(), (3, 0))
+        get_connection.assert_called_once()
+
+    def test_failures_back_off_then_go_dead(self):
+        item = EmailOutbox.enqueue('Subject', 'Body', ['user@example.com'])
+        with mock.patch('core.outbox.EmailMessage.send', side_effect=OSError('SMTP down')):
+            self.assertEqual(deliver_batch(), (0, 1))
+            item.refresh_from_db()
+            self.assertEqual((item.status, item.attempts), ('pending', 1))
+            self.assertGreater(item.next_attempt_at, item.created_at)
+
+            # Not due yet: nothing happens
+            self.assertEqual(deliver_batch(), (0, 0))
+
+            for _ in range(MAX_ATTEMPTS - 1):
+                EmailOutbox.objects.filter(id=item.id).update(next_attempt_at=item.created_at)
+                deliver_batch()
+        item.refresh_from_db()
+        self.assertEqual((item.status, item.attempts, item.last_error), ('dead', MAX_ATTEMPTS, 'SMTP down'))
+
+    def test_rows_are_claimed_before_sending(self):
+        EmailOutbox.enqueue('First', 'Body', ['one@example.com'])
+        EmailOutbox.enqueue('Second', 'Body', ['two@example.com'])
+        concurrent = []
+        original_send = EmailMessage.send
+
+        def send(message, *args, **kwargs):
+            # Another worker polling mid-batch finds nothing due
+            concurrent.append(deliver_batch())
+            return original_send(message, *args, **kwargs)
+
+        with mock.patch('core.outbox.EmailMessage.send', send):
+            self.assertEqual(deliver_batch(), (2, 0))
+        self.assertEqual(concurrent, [(0, 0), (0, 0)])
+        self.assertEqual(set(EmailOutbox.objects.values_list('status', flat=True)), {'sent'})
+
+    def test_claim_lease_lets_a_crashed_batch_retry(self):
+        item = EmailOutbox.enqueue('Subject', 'Body', ['user@example.com'])
+        with mock.patch('core.outbox.get_connection', side_effect=KeyboardInterrupt):
+            with self.assertRaises(KeyboardInterrupt):
+                deliver_batch()
+        item.refresh_from_db()
+        self.assertEqual((item.status, item.attempts), ('pending', 0))
+        self.assertEqual(deliver_batch(), (0, 0))
+
+        EmailOutbox.objects.filter(id=item.id).update(next_attempt_at=timezone.now())
+        self.assertEqual(deliver_batch(), (1, 0))
+
+
+class SendOtpTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        make_student('N180001')
+
+    def test_otp_is_queued_not_sent_inline(self):
+        response = self.client.post('/api/forgot-password/send-otp/', {'id': 'n180001'}, format='json')
+        self.assertEqual(response.json()['delivery'], 'queued')
+        self.assertEqual(len(mail.outbox), 0)
+
+        deliver_batch()
+        status = self.client.get('/api/forgot-password/status/?id=N180001').json()
+        self.assertEqual(status['delivery'], 'sent')
+
+    def test_repeated_clicks_do_not_queue_duplicates(self):
+        for _ in range(3):
+            self.client.post('/api/forgot-password/send-otp/', {'id': 'N180001'}, format='json')
+        self.assertEqual(EmailOutbox.objects.count(), 1)
+
+
+class MediaRootTestCase(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.override = override_settings(MEDIA_ROOT=self.media_root)
+        self.override.enable()
+
+    def tearDown(self):
+        self.override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def _photo(self, size=(4000, 3000)):
+        exif = Image.Exif()
+        exif[0x010F] = 'PhoneMaker'  # Make
+        buffer = BytesIO()
+        Image.new('RGB', size, 'red').save(buffer, 'JPEG', exif=exif)
+        return SimpleUploadedFile('photo.jpg', buffer.getvalue(), content_type='image/jpeg')
+
+
+class ImagePipelineTests(MediaRootTestCase):
+    def test_upload_is_downscaled_stripped_and_thumbnailed(self):
+        grievance = make_grievance(make_student(), image=self._photo())
+
+        with Image.open(grievance.image.path) as stored:
+            self.assertEqual(max(stored.size), MAX_DIMENSION)
+            self.assertEqual(len(stored.getexif()), 0)
+        with Image.open(grievance.image_thumb.path) as thumb:
+            self.assertEqual(thumb.size, THUMB_SIZE)
+
+        row = APIClient().get('/api/grievances/?role=admin').json()[0]
+        self.assertEqual(row['image_thumb'], grievance.image_thumb.url)
+
+    def test_non_image_upload_is_rejected(self):
+        student = make_student()
+        response = APIClient().post('/api/grievances/', {
+            'student_id': student.student_id, 'category': 'Hostel - I1 - Electrical',
+            'description': 'x', 'image': SimpleUploadedFile('bad.jpg', b'not an image'),
+        })
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Grievance.objects.exists())
+
+
+    def test_optimise_images_keeps_shared_legacy_originals(self):
+        # Pre-blob-store uploads: plain files, no StoredBlob row
+        os.makedirs(os.path.join(self.media_root, 'grievance_imgs'))
+        for name in ('grievance_imgs/shared.jpg', 'grievance_imgs/alone.jpg'):
+            with open(os.path.join(self.media_root, name), 'wb') as f:
+                f.write(self._photo(size=(300, 200)).read())
+        student = make_student()
+        shared = make_grievance(student)
+        alone = make_grievance(student)
+        Grievance.objects.filter(pk=shared.pk).update(image='grievance_imgs/shared.jpg')
+        Grievance.objects.filter(pk=alone.pk).update(image='grievance_imgs/alone.jpg')
+        # Already has a thumbnail, so the command leaves this row alone
+        CustomUser.objects.filter(pk=student.user_id).update(
+            profile_pic='grievance_imgs/shared.jpg', profile_pic_thumb='thumbs/done.jpg'
+        )
+
+        call_command('optimise_images', delete_originals=True, stdout=io.StringIO())
+
+        self.assertTrue(os.path.exists(os.path.join(self.media_root, 'grievance_imgs/shared.jpg')))
+        self.assertFalse(os.path.exists(os.path.join(self.media_root, 'grievance_imgs/alone.jpg')))
+        self.assertTrue(Grievance.objects.get(pk=shared.pk).image.name.startswith('blobs/'))
+
+class BlobStorageTests(MediaRootTestCase):
+    def test_same_upload_is_stored_once_and_refcounted(self):
+        student = make_student()
+        first = make_grievance(student, image=self._photo())
+        second = make_grievance(student, image=self._photo())
+
+        self.assertEqual(first.image.name, second.image.name)
+        self.assertEqual(StoredBlob.objects.get(name=first.image.name).refcount, 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            first.delete()
+        self.assertTrue(os.path.exists(second.image.path))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            second.delete()
+        self.assertFalse(os.path.exists(second.image.path))
+        self.assertFalse(StoredBlob.objects.exists())
+
+    def test_replaced_image_is_released(self):
+        grievance = make_grievance(make_student())
+        client = APIClient()
+        with self.captureOnCommitCallbacks(execute=True):
+            client.patch('/api/grievances/', {'id': grievance.id, 'status': 'In Progress', 'resolved_image': self._photo((800, 600))})
+        first = Grievance.objects.get(id=grievance.id).resolved_image
+        first_path = first.path
+
+        with self.captureOnCommitCallbacks(execute=True):
+            client.patch('/api/grievances/', {'id': grievance.id, 'status': 'Resolved', 'resolved_image': self._photo((600, 800))})
+        grievance = Grievance.objects.get(id=grievance.id)
+        self.assertNotEqual(grievance.resolved_image.name, first.name)
+        self.assertFalse(os.path.exists(first_path))
+        self.assertEqual(
+            set(StoredBlob.objects.values_list('name', flat=True)),
+            {grievance.resolved_image.name, grievance.resolved_image_thumb.name},
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            grievance.delete()
+        self.assertFalse(StoredBlob.objects.exists())
+
+
+@override_settings(MEDIA_ROOT=tempfile.gettempdir())
+class MediaServingTests(TestCase):
+    def setUp(self):
+        self.handle = tempfile.NamedTemporaryFile(suffix='.jpg', dir=tempfile.gettempdir(), delete=False)
+        self.handle.write(bytes(range(256)) * 4)
+        self.handle.close()
+        self.url = '/media/' + os.path.basename(self.handle.name)
+
+    def tearDown(self):
+        os.unlink(self.handle.name)
+
+    def test_full_response_is_cacheable(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertEqual(b''.join(response.streaming_content), bytes(range(256)) * 4)
+
+        again = self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(again.status_code, 304)
+
+    def test_byte_ranges(self):
+        response = self.client.get(self.url, HTTP_RANGE='bytes=10-19')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], 'bytes 10-19/1024')
+        self.assertEqual(b''.join(response.streaming_content), bytes(range(10, 20)))
+
+        self.assertEqual(self.client.get(self.url, HTTP_RANGE='bytes=5000-').status_code, 416)
+
+    @override_settings(MEDIA_ROOT=tempfile.gettempdir())
+    def test_asgi_gets_an_async_body(self):
+        @async_to_sync
+        async def read_chunks():
+            response = await AsyncClient().get(self.url)
+            return [chunk async for chunk in response.streaming_content]
+
+        with mock.patch('core.media.CHUNK_SIZE', 256), warnings.catch_warnings():
+            warnings.filterwarnings('error', message='StreamingHttpResponse must consume')
+            chunks = read_chunks()
+        self.assertEqual(b''.join(chunks), bytes(range(256)) * 4)
+        self.assertEqual(len(chunks), 4)
+
+    def test_path_traversal_is_rejected(self):
+        self.assertEqual(self.client.get('/media/../etc/passwd').status_code, 404)
+
+    @override_settings(MEDIA_ACCEL='nginx')
+    def test_nginx_offload(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response['X-Accel-Redirect'], '/protected-media/' + os.path.basename(self.handle.name))
+        self.assertEqual(response.content, b'')
+
+
+class BulkImportTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        SiteSettings.invalidate()
+        make_student('N180001')
+
+    def test_students_csv_creates_valid_rows_and_reports_bad_ones(self):
+        csv_body = (
+            "id,name,email,password,year,branch,gender\n"
+            "n180002,Asha,asha@example.com,secret123,E2,CSE,Female\n"
+            "N180003,Kiran,not-an-email,secret123,E3,ECE,Male\n"
+            "N180001,Dup,dup@example.com,secret123,E1,CSE,Male\n"
+            "N180004,Ravi,ravi@example.com,secret123,PUC1,,Male\n"
+        )
+        response = APIClient().post('/api/import/students/', {
+            'file': SimpleUploadedFile('students.csv', csv_body.encode()),
+        })
+        report = response.json()
+
+        self.assertEqual(report['created'], 2)
+        self.assertEqual([(e['line'], e['errors']) for e in report['errors']], [
+            (3, ['email is invalid']),
+            (4, ['id already exists']),
+        ])
+        student = StudentProfile.objects.select_related('user').get(student_id='N180002')
+        self.assertTrue(student.user.check_password('secret123'))
+        self.assertEqual(DashboardCounters.objects.get(pk=1).students, 3)
+
+    def test_authorities_csv_and_missing_columns(self):
+        client = APIClient()
+        bad = client.post('/api/import/authorities/', {'file': SimpleUploadedFile('a.csv', b"id,name\nE1,X\n")})
+        self.assertEqual(bad.status_code, 400)
+
+        csv_body = b"id,name,email,password,dept,designation,gender\nEMP01,Rao,rao@example.com,pw,Hostel,Warden,Male\n"
+        client.post('/api/import/authorities/', {'file': SimpleUploadedFile('a.csv', csv_body)})
+        self.assertEqual(AuthorityProfile.objects.get(employee_id='EMP01').designation, 'Warden')
+
+    def test_overlong_fields_are_row_errors(self):
+        csv_body = (
+            "id,name,email,password,year,branch,gender\n"
+            f"N180005,Asha,asha@example.com,secret123,E2,{'X' * 101},Female\n"
+            "N180006,Ravi,ravi@example.com,secret123,E2,CSE,Male\n"
+        )
+        report = APIClient().post('/api/import/students/', {
+            'file': SimpleUploadedFile('students.csv', csv_body.encode()),
+        }).json()
+
+        self.assertEqual(report['created'], 1)
+        self.assertEqual(report['errors'][0]['errors'], ['branch is longer than 100 characters'])
+        self.assertFalse(StudentProfile.objects.filter(student_id='N180005').exists())
+
+    def test_web_import_is_bounded(self):
+        csv_body = (
+            "id,name,email,password,year,branch,gender\n"
+            "N180007,Asha,asha@example.com,secret123,E2,CSE,Female\n"
+            "N180008,Ravi,ravi@example.com,secret123,E2,CSE,Male\n"
+        )
+        with mock.patch('core.views.WEB_IMPORT_MAX_ROWS', 1), \
+                mock.patch('core.bulk_import.ProcessPoolExecutor') as pool:
+            client = APIClient()
+            too_big = client.post('/api/import/students/', {'file': SimpleUploadedFile('s.csv', csv_body.encode())})
+            dry_run = client.post('/api/import/students/?dry_run=1', {'file': SimpleUploadedFile('s.csv', csv_body.encode())})
+
+        self.assertEqual(too_big.status_code, 400)
+        self.assertIn('import_users', too_big.json()['message'])
+        self.assertFalse(StudentProfile.objects.filter(student_id='N180007').exists())
+        self.assertEqual(dry_run.status_code, 200)
+        pool.assert_not_called()
+
+
+class GrievanceExportTests(TestCase):
+    def test_export_streams_filtered_csv(self):
+        student = make_student()
+        make_grievance(student, status='Resolved', description='Tap leaking, "urgent"')
+        make_grievance(student, status='Pending')
+
+        response = APIClient().get('/api/grievances/export/?status=Resolved')
+        self.assertTrue(response.streaming)
+        body = b''.join(response.streaming_content).decode('utf-8-sig')
+
+        rows = list(csv.reader(io.StringIO(body)))
+        self.assertEqual(rows[0][:3], ['ID', 'Student ID', 'Student Name'])
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[1][6], 'Resolved')
+        self.assertEqual(rows[1][10], 'Tap leaking, "urgent"')
+
+    def test_export_streams_in_chunks_under_asgi(self):
+        student = make_student()
+        for _ in range(5):
+            make_grievance(student)
+
+        @async_to_sync
+        async def read_chunks(url):
+            response = await AsyncClient().get(url)
+            return [chunk async for chunk in response.streaming_content]
+
+        with mock.patch('core.views.EXPORT_CHUNK_SIZE', 2), warnings.catch_warnings():
+            # Django warns (and buffers the whole body) when ASGI gets a sync iterator
+            warnings.filterwarnings('error', message='StreamingHttpResponse must consume')
+            chunks = read_chunks('/api/grievances/export/?role=admin')
+        self.assertEqual(len(chunks), 3)  # header + 5 rows, two lines per chunk
+        rows = list(csv.reader(io.StringIO(b''.join(chunks).decode('utf-8-sig'))))
+        self.assertEqual(len(rows), 6)
+
+
+class RollupTests(TestCase):
+    def test_incremental_rollup_follows_changes_and_deletes(self):
+        student = make_student()
+        resolved = make_grievance(student)
+        pending = make_grievance(student, category='Mess - Food Quality', department_category='Mess')
+        build_rollups()
+        self.assertEqual(GrievanceDailyStat.objects.filter(status='Pending').aggregate(n=Sum('count'))['n'], 2)
+
+        resolved.status = 'Resolved'
+        resolved.resolved_at = resolved.created_at + timedelta(hours=2)
+        resolved.save()
+        pending.delete()
+        days = build_rollups()
+        self.assertEqual(len(days), 1)
+
+        stats = {row.status: row for row in GrievanceDailyStat.objects.all()}
+        self.assertEqual(set(stats), {'Resolved'})
+        self.assertEqual(stats['Resolved'].res_1h_4h, 1)
+        self.assertEqual(stats['Resolved'].resolution_seconds, 7200)
+
+        # Re-running over the same window is idempotent
+        build_rollups()
+        self.assertEqual(GrievanceDailyStat.objects.get().count, 1)
+
+        response = APIClient().get('/api/stats/trends/?period=week&group_by=department')
+        body = response.json()
+        self.assertEqual(body['series'][0]['department'], 'Hostel')
+        self.assertEqual(body['avg_resolution_hours'], 2.0)
+        self.assertEqual(body['resolution_histogram']['res_1h_4h'], 1)
+
+        pending_only = APIClient().get('/api/stats/trends/?period=week&status=Pending').json()
+        self.assertEqual(pending_only['series'], [])
+
+
+class GrievanceSearchTests(TestCase):
+    def setUp(self):
+        student = make_student()
+        self.fan = make_grievance(student, description='Ceiling fan not working in room 204')
+        self.food = make_grievance(student, category='Mess - Food Quality', department_category='Mess',
+                                   description='Food served cold at dinner')
+
+    def search(self, query, **params):
+        return APIClient().get('/api/grievances/search/', {'q': query, **params}).json()['results']
+
+    def test_prefix_match_and_ranking(self):
+        results = self.search('elec')
+        self.assertEqual([r['id'] for r in results], [self.fan.id])
+        self.assertGreater(results[0]['rank'], 0)
+
+    def test_index_follows_update_and_delete(self):
+        self.food.description = 'Water cooler broken'
+        self.food.save()
+        self.assertEqual(self.search('dinner'), [])
+        self.assertEqual([r['id'] for r in self.search('cooler')], [self.food.id])
+
+        self.food.delete()
+        self.assertEqual(self.search('cooler'), [])
+
+    def test_combines_with_filters(self):
+        self.assertEqual(self.search('not working', department_category='Mess'), [])
+        self.assertEqual(len(self.search('not working', department_category='Hostel')), 1)
+
+
+def make_authority(employee_id, designation, department='Hostel'):
+    user = CustomUser.objects.create_user(
+        username=employee_id, password=None, first_name=designation,
+        email=f'{employee_id.lower()}@example.com', user_type='authority'
+    )
+    return AuthorityProfile.objects.create(user=user, employee_id=employee_id, department=department,
+                                           designation=designation, gender='Male')
+
+
+class EscalationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        SiteSettings.invalidate()
+
+    def test_overdue_pending_moves_one_level_with_one_mail_per_handler(self):
+        make_authority('EMP01', 'DSW')
+        student = make_student()
+        old = timezone.now() - timedelta(days=8)
+        overdue = [make_grievance(student) for _ in range(3)]
+        fresh = make_grievance(student)
+        resolved = make_grievance(student, status='Resolved')
+        Grievance.objects.filter(id__in=[g.id for g in overdue] + [resolved.id]).update(created_at=old)
+
+        moved = escalate_overdue()
+
+        self.assertEqual(sorted(moved['DSW']), sorted(g.id for g in overdue))
+        self.assertEqual(Grievance.objects.filter(current_handler_designation='DSW').count(), 3)
+        self.assertEqual(Grievance.objects.get(id=fresh.id).current_handler_designation, 'Chief Warden')
+        self.assertEqual(Grievance.objects.get(id=resolved.id).current_handler_designation, 'Chief Warden')
+        self.assertEqual(EmailOutbox.objects.get().recipient_list(), ['emp01@example.com'])
+
+        # The new handler gets a fresh deadline: a second run moves nothing
+        self.assertEqual(escalate_overdue(), {})
+
+
+class TaxonomyTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        routing_cache.clear()
+
+    def test_post_links_department_and_category(self):
+        student = make_student()
+        APIClient().post('/api/grievances/', {
+            'student_id': student.student_id, 'category': 'Hostel - I1 - Electrical', 'description': 'Fan',
+        })
+        grievance = Grievance.objects.select_related('department', 'category_ref').get()
+        self.assertEqual(grievance.current_handler_designation, 'Chief Warden')
+        self.assertEqual(grievance.department.name, 'Hostel')
+        self.assertEqual((grievance.category_ref.location, grievance.category_ref.issue), ('I1', 'Electrical'))
+
+        rows = APIClient().get('/api/grievances/?location=I1').json()
+        self.assertEqual([row['id'] for row in rows], [grievance.id])
+
+    def test_routing_is_cached_and_invalidated_on_change(self):
+        route('Mess - Food Quality')
+        with self.assertNumQueries(0):
+            self.assertEqual(route('Mess - Food Quality')[2], 'Chief Mess Coordinator')
+        self.assertEqual(route('Unknown - Thing')[2], 'AO')
+
+        Department.objects.update_or_create(name='Mess', defaults={'initial_handler': 'Mess Supervisor'})
+        self.assertEqual(route('Mess - Food Quality')[2], 'Mess Supervisor')
+
+
+class GrievanceEventsTests(TestCase):
+    def setUp(self):
+        # Fresh in-process broker per test
+        patcher = mock.patch.object(events, '_broker', events.InMemoryBroker())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_changes_are_published_after_commit(self):
+        student = make_student()
+        with mock.patch('core.signals.publish_grievance_event') as publish:
+            with self.captureOnCommitCallbacks(execute=True):
+                grievance = make_grievance(student)
+            grievance = Grievance.objects.get(id=grievance.id)
+            with self.captureOnCommitCallbacks(execute=True):
+                grievance.status = 'In Progress'
+                grievance.save()
+            with self.captureOnCommitCallbacks(execute=True):
+                grievance.description = 'Edited'
+                grievance.save()
+        self.assertEqual(
+            [c.args[0] for c in publish.call_args_list], ['created', 'status_changed']
+        )
+        self.assertEqual(publish.call_args.args[4], student.id)
+
+    def test_stream_delivers_events_for_the_callers_channel(self):
+        student = make_student()
+        other = make_student('N180002')
+
+        @async_to_sync
+        async def read_stream():
+            response = await AsyncClient().get(f'/api/grievances/events/?role=student&user_id={student.student_id}')
+            self.assertEqual(response['Content-Type'], 'text/event-stream')
+            chunks = response.streaming_content.__aiter__()
+            first = await chunks.__anext__()
+            # Subscription is live once the first chunk is out
+            events.publish_grievance_event('status_changed', 7, 'Resolved', 'DSW', other.id)
+            events.publish_grievance_event('status_changed', 8, 'Resolved', 'DSW', student.id)
+            second = await asyncio.wait_for(chunks.__anext__(), timeout=2)
+            await chunks.aclose()
+            return first, second
+
+        first, second = read_stream()
+        self.assertIn(b'retry:', first)
+        self.assertIn(b'event: status_changed', second)
+        self.assertEqual(json.loads(second.split(b'data: ')[1])['id'], 8)
+
+    def test_broker_outage_does_not_fail_the_write(self):
+        student = make_student()
+        broken = mock.Mock(publish=mock.Mock(side_effect=ConnectionError('redis down')))
+        with mock.patch.object(events, '_broker', broken), self.assertLogs('core.events', 'ERROR'):
+            with self.captureOnCommitCallbacks(execute=True):
+                response = APIClient().post('/api/grievances/', {
+                    'student_id': student.student_id, 'category': 'Hostel - I1 - Electrical', 'description': 'x',
+                })
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(Grievance.objects.exists())
+
+    def test_unknown_user_is_rejected(self):
+        response = async_to_sync(AsyncClient().get)('/api/grievances/events/?role=student&user_id=NOPE')
+        self.assertEqual(response.status_code, 400)
+
+    def test_wsgi_gets_501_instead_of_a_stream(self):
+        student = make_student()
+        response = APIClient().get(f'/api/grievances/events/?role=student&user_id={student.student_id}')
+        self.assertEqual(response.status_code, 501)
+
+
+class GrievanceDeltaSyncTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        SiteSettings.invalidate()
+
+    def test_unchanged_list_is_a_304_after_one_query(self):
+        student = make_student()
+        make_grievance(student)
+        client = APIClient()
+        url = f'/api/grievances/?role=student&user_id={student.student_id}'
+        etag = client.get(url)['ETag']
+
+        with self.assertNumQueries(2):  # student lookup + the validator aggregate
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        make_grievance(student).delete()
+        self.assertEqual(client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_since_returns_changes_and_deletions(self):
+        student = make_student()
+        kept, edited, deleted, moved = (make_grievance(student) for _ in range(4))
+        make_authority('EMP01', 'Chief Warden')
+        client = APIClient()
+        url = '/api/grievances/?role=authority&user_id=EMP01'
+        first = client.get(url + '&since=' + encode_since(timezone.now() - timedelta(days=1))).json()
+        self.assertEqual(len(first['results']), 4)
+
+        # Pretend the last sync was long enough ago that `kept` falls outside the overlap
+        old = timezone.now() - timedelta(hours=1)
+        Grievance.objects.filter(id=kept.id).update(updated_at=old)
+        edited.description = 'Edited'
+        edited.save()
+        deleted_id = deleted.id
+        deleted.delete()
+        moved.current_handler_designation = 'DSW'
+        moved.save()
+
+        delta = client.get(url + '&since=' + encode_since(timezone.now() - timedelta(seconds=1))).json()
+        self.assertEqual([row['id'] for row in delta['results']], [edited.id])
+        self.assertEqual(delta['deleted'], sorted([deleted_id, moved.id]))
+        self.assertTrue(delta['next_since'])
+
+    def test_deltas_only_carry_ids_that_left_the_callers_list(self):
+        ravi, asha = make_student('N180001', 'Ravi'), make_student('N180002', 'Asha')
+        make_authority('EMP01', 'Chief Warden')
+        make_authority('EMP02', 'DSW')
+        ravi_deleted = make_grievance(ravi)
+        ravi_moved = make_grievance(ravi)
+        ravi_escalated = make_grievance(ravi)
+        asha_deleted = make_grievance(asha, current_handler_designation='DSW')
+        asha_kept = make_grievance(asha, current_handler_designation='DSW')
+        Grievance.objects.filter(id=ravi_escalated.id).update(created_at=timezone.now() - timedelta(days=30))
+        # Last synced before the sync overlap
+        Grievance.objects.filter(id=asha_kept.id).update(updated_at=timezone.now() - timedelta(hours=1))
+        since = encode_since(timezone.now())
+
+        ids = {'ravi': ravi_deleted.id, 'asha': asha_deleted.id}
+        ravi_deleted.delete()
+        asha_deleted.delete()
+        ravi_moved.current_handler_designation = 'DSW'
+        ravi_moved.save()
+        escalate_overdue()
+
+        def delta(query):
+            return APIClient().get(f'/api/grievances/?{query}&since={since}').json()
+
+        self.assertEqual(delta('role=student&user_id=N180001')['deleted'], [ids['ravi']])
+        self.assertEqual(delta('role=student&user_id=N180002')['deleted'], [ids['asha']])
+        self.assertEqual(delta('role=authority&user_id=EMP01')['deleted'],
+                         sorted([ids['ravi'], ravi_moved.id, ravi_escalated.id]))
+        dsw = delta('role=authority&user_id=EMP02')
+        self.assertEqual(dsw['deleted'], [ids['asha']])
+        self.assertEqual({row['id'] for row in dsw['results']}, {ravi_moved.id, ravi_escalated.id})
+        self.assertEqual(delta('role=admin')['deleted'], sorted(ids.values()))
+        # Leaving the ?status filter is reported only to callers who can see the grievance
+        asha_kept.status = 'Resolved'
+        asha_kept.save()
+        self.assertEqual(delta('role=student&user_id=N180002&status=Pending')['deleted'], sorted([ids['asha'], asha_kept.id]))
+        self.assertEqual(delta('role=student&user_id=N180001&status=Pending')['deleted'], [ids['ravi']])
+
+    def test_renaming_a_student_changes_the_etag(self):
+        student = make_student()
+        make_grievance(student)
+        client = APIClient()
+        url = f'/api/grievances/?role=student&user_id={student.student_id}'
+        etag = client.get(url)['ETag']
+
+        client.put('/api/students/', {'id': student.student_id, 'name': 'Ravi Kumar'}, format='json')
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()[0]['student_name'], 'Ravi Kumar')
+
+    def test_bad_since_is_rejected(self):
+        self.assertEqual(APIClient().get('/api/grievances/?since=nope').status_code, 400)
+
+
+@override_settings(RESPONSE_CACHE=True, CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class ResponseCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        SiteSettings.invalidate()
+        self.client = APIClient()
+
+    def test_repeat_read_is_served_without_queries(self):
+        student = make_student()
+        make_grievance(student)
+        url = f'/api/grievances/?role=student&user_id={student.student_id}'
+        self.assertEqual(self.client.get(url)['X-Cache'], 'MISS')
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+        self.assertEqual(response['X-Cache'], 'HIT')
+        self.assertEqual(len(response.json()), 1)
+
+    def test_writes_invalidate_only_affected_lists(self):
+        ravi, asha = make_student(), make_student('N180002', 'Asha')
+        ravi_url = f'/api/grievances/?role=student&user_id={ravi.student_id}'
+        asha_url = f'/api/grievances/?role=student&user_id={asha.student_id}'
+        for url in (ravi_url, asha_url, '/api/grievances/?role=admin', '/api/stats/'):
+            self.client.get(url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post('/api/grievances/', {
+                'student_id': ravi.student_id, 'category': 'Mess - Food Quality', 'description': 'Cold',
+            })
+
+        self.assertEqual(self.client.get(asha_url)['X-Cache'], 'HIT')
+        response = self.client.get(ravi_url)
+        self.assertEqual((response['X-Cache'], len(response.json())), ('MISS', 1))
+        self.assertEqual(self.client.get('/api/grievances/?role=admin')['X-Cache'], 'MISS')
+        self.assertEqual(self.client.get('/api/stats/').json()['complaints'], 1)
+
+    def test_hit_and_miss_counters(self):
+        self.client.get('/api/students/')
+        self.client.get('/api/students/')
+        stats = self.client.get('/api/stats/cache/').json()
+        self.assertEqual(stats['students'], {'hits': 1, 'misses': 1, 'hit_rate': 0.5})
+
+
+class LoginBackendTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        SiteSettings.invalidate()
+        make_student()
+
+    def test_any_case_logs_in_with_one_password_check(self):
+        # Stand-in for PBKDF2: counts how many hashes each attempt costs
+        with mock.patch.object(CustomUser, 'check_password', autospec=True, side_effect=lambda user, raw: raw == 'secret') as check:
+            ok = APIClient().post('/api/login/', {'username': 'n180001', 'password': 'secret'}, format='json')
+            bad = APIClient().post('/api/login/', {'username': 'n180001', 'password': 'nope'}, format='json')
+        self.assertIn('token', ok.json())
+        self.assertEqual(bad.status_code, 401)
+        self.assertEqual(check.call_count, 2)
+
+    def test_lookup_prefers_exact_spelling(self):
+        other = CustomUser.objects.create_user(username='n180001', password=None, user_type='student')
+        self.assertEqual(get_user_by_username('n180001'), other)
+        self.assertEqual(get_user_by_username('N180001').username, 'N180001')
+        with self.assertRaises(CustomUser.DoesNotExist):
+            get_user_by_username('N999999')
+
+
+@override_settings(HASHING_THROTTLE_RATES={'ip': (100, 100), 'username': (2, 1)}, HASHING_CONCURRENCY=1)
+class HashingThrottleTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        SiteSettings.invalidate()
+        make_student()
+
+    def _login(self, username='N180001', **extra):
+        return APIClient().post('/api/login/', {'username': username, 'password': 'nope'}, format='json', **extra)
+
+    def test_username_bucket_returns_429_with_retry_after(self):
+        self.assertEqual([self._login('n180001').status_code for _ in range(2)], [401, 401])
+        response = self._login('N180001', REMOTE_ADDR='10.0.0.9')
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], '60')
+        self.assertEqual(response.json()['status'], 'error')
+        # Another account from the same address is unaffected
+        self.assertEqual(self._login('N180002').status_code, 401)
+
+    def test_busy_hashing_slots_fail_fast(self):
+        cache.add('throttle:hashing-slot:0', 'other-worker', 30)
+        response = self._login()
+        self.assertEqual((response.status_code, response['Retry-After']), (429, '1'))
+
+        cache.delete('throttle:hashing-slot:0')
+        self.assertEqual(self._login().status_code, 401)
+        # Slot handed back after the request
+        self.assertIsNone(cache.get('throttle:hashing-slot:0'))
+
+
+class MeEndpointTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        SiteSettings.invalidate()
+
+    def _client_for(self, user):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=user).key}')
+        return client
+
+    def test_profile_comes_from_the_token_in_one_query(self):
+        student = make_student()
+        make_student('N180002', 'Asha')
+        client = self._client_for(student.user)
+        with self.assertNumQueries(1):
+            data = client.get('/api/me/').json()
+        self.assertEqual((data['user_type'], data['profile']['student_id']), ('student', 'N180001'))
+
+        authority = make_authority('EMP01', 'DSW')
+        data = self._client_for(authority.user).get('/api/me/').json()
+        self.assertEqual(data['profile']['designation'], 'DSW')
+
+    def test_grievances_are_scoped_by_the_token(self):
+        ravi, asha = make_student(), make_student('N180002', 'Asha')
+        mine = make_grievance(ravi)
+        make_grievance(asha)
+        rows = self._client_for(ravi.user).get('/api/me/grievances/').json()
+        self.assertEqual([row['id'] for row in rows], [mine.id])
+
+        warden = make_authority('EMP01', 'Chief Warden')
+        self.assertEqual(len(self._client_for(warden.user).get('/api/me/grievances/').json()), 2)
+
+    def test_requires_a_token(self):
+        self.assertEqual(APIClient().get('/api/me/').status_code, 401)
+
+
+class RosterTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        for i, name in enumerate(['Ravi', 'Asha', 'Arun', 'Bala', 'Anil']):
+            student = make_student(f'N18{i:04d}', name)
+            student.year = 'E1' if i % 2 else 'E2'
+            student.save()
+
+    def test_full_list_without_params_in_constant_queries(self):
+        with self.assertNumQueries(1):
+            rows = self.client.get('/api/students/').json()
+        self.assertEqual([row['student_id'] for row in rows], [f'N18{i:04d}' for i in range(5)])
+
+    def test_search_filter_sort_and_paginate(self):
+        page = self.client.get('/api/students/?q=a&sort=-name&limit=2').json()
+        self.assertEqual([row['name'] for row in page['results']], ['Asha', 'Arun'])
+        self.assertEqual((page['count'], page['next_offset']), (3, 2))
+        rest = self.client.get('/api/students/?q=a&sort=-name&limit=2&offset=2').json()
+        self.assertEqual(([row['name'] for row in rest['results']], rest['next_offset']), (['Anil'], None))
+
+        by_id = self.client.get('/api/students/?q=n180003&year=E1').json()
+        self.assertEqual([row['name'] for row in by_id], ['Bala'])
+
+    def test_bad_sort_is_rejected(self):
+        self.assertEqual(self.client.get('/api/students/?sort=password').status_code, 400)
+
+    def test_mixed_case_employee_id_matches_in_any_case(self):
+        make_authority('emp-Ab1', 'Chief Warden')
+        make_authority('EMP-X9', 'DSW')
+        with CaptureQueriesContext(connection) as queries:
+            rows = self.client.get('/api/authorities/?q=EMP-ab').json()
+        self.assertEqual([row['employee_id'] for row in rows], ['emp-Ab1'])
+        # SQLite's LIKE ignores case anyway; PostgreSQL's doesn't, so the column must be upper-cased
+        self.assertIn('UPPER("core_authorityprofile"."employee_id")', queries[0]['sql'])
+
+
+class GrievanceBatchTests(MediaRootTestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        SiteSettings.invalidate()
+        make_authority('EMP01', 'Chief Warden')
+
+    def test_batch_resolves_in_scope_and_mails_each_student_once(self):
+        ravi, asha = make_student(), make_student('N180002', 'Asha')
+        mine = [make_grievance(ravi), make_grievance(ravi), make_grievance(asha)]
+        other = make_grievance(asha, current_handler_designation='DSW')
+
+        response = APIClient().post('/api/grievances/batch/', {
+            'ids': [g.id for g in mine] + [other.id], 'status': 'Resolved', 'reply': 'Fixed',
+            'role': 'authority', 'user_id': 'EMP01',
+        }, format='json').json()
+
+        self.assertEqual(sorted(response['updated']), sorted(g.id for g in mine))
+        self.assertEqual(response['skipped'], [other.id])
+        self.assertEqual(Grievance.objects.filter(status='Resolved', resolved_at__isnull=False).count(), 3)
+        self.assertEqual(DashboardCounters.load().resolved, 3)
+        self.assertEqual(sorted(m.recipient_list()[0] for m in EmailOutbox.objects.all()),
+                         ['n180001@example.com', 'n180002@example.com'])
+
+    def test_shared_image_is_stored_once_for_all(self):
+        student = make_student()
+        grievances = [make_grievance(student) for _ in range(3)]
+        APIClient().post('/api/grievances/batch/', {
+            'ids': ','.join(str(g.id) for g in grievances), 'status': 'Resolved', 'resolved_image': self._photo(),
+        })
+        names = set(Grievance.objects.values_list('resolved_image', flat=True))
+        self.assertEqual(len(names), 1)
+        self.assertEqual(StoredBlob.objects.get(name=names.pop()).refcount, 3)
+
+        # Deleting one grievance keeps the file for the other two
+        Grievance.objects.get(id=grievances[0].id).delete()
+        self.assertEqual(StoredBlob.objects.get(name=Grievance.objects.first().resolved_image.name).refcount, 2)
+
+    def test_rejects_bad_input(self):
+        client = APIClient()
+        self.assertEqual(client.post('/api/grievances/batch/', {'ids': [], 'status': 'Resolved'}, format='json').status_code, 400)
+        self.assertEqual(client.post('/api/grievances/batch/', {'ids': [1], 'status': 'Done'}, format='json').status_code, 400)
@@ -0,0 +1,120 @@
+import functools
+import math
+import os
+import random
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.exceptions import Throttled
+from rest_framework.throttling import BaseThrottle
+from rest_framework.views import exception_handler as drf_exception_handler
+
+# Longest a hashing slot can stay taken if its worker dies mid-request
+SLOT_TIMEOUT = 30
+
+
+class HashingBusy(Throttled):
+    default_detail = 'Server is busy, please retry shortly.'
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Token bucket in the shared cache: `burst` requests at once, refilled at
+    `per_minute`. Subclasses say which setting and which identity to bucket on.
+    Read-modify-write, so two workers racing may each spend the same token;
+    it bounds abuse, it is not an exact meter.
+    """
+    rate_name = None
+
+    def get_ident_key(self, request, view):
+        raise NotImplementedError
+
+    def allow_request(self, request, view):
+        self.wait_seconds = None
+        ident = self.get_ident_key(request, view)
+        if not ident:
+            return True
+        burst, per_minute = settings.HASHING_THROTTLE_RATES[self.rate_name]
+        refill = per_minute / 60.0
+        key = f'throttle:{self.rate_name}:{ident}'
+
+        now = time.time()
+        tokens, stamp = cache.get(key, (burst, now))
+        tokens = min(burst, tokens + (now - stamp) * refill)
+        if tokens < 1:
+            self.wait_seconds = (1 - tokens) / refill
+            return False
+        # Expire once it would have refilled anyway
+        cache.set(key, (tokens - 1, now), math.ceil(burst / refill))
+        return True
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class HashingIPThrottle(TokenBucketThrottle):
+    # Generous: a whole hostel behind one NAT address logs in after results
+    rate_name = 'ip'
+
+    def get_ident_key(self, request, view):
+        return self.get_ident(request)
+
+
+class HashingUsernameThrottle(TokenBucketThrottle):
+    # Tight: guessing one account's password (or OTP) from many addresses
+    rate_name = 'username'
+
+    def get_ident_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            username = request.user.username
+        else:
+            username = request.data.get('username') or request.data.get('id')
+        return str(username).upper() if username else None
+
+
+HASHING_THROTTLES = [HashingIPThrottle, HashingUsernameThrottle]
+
+
+def hashing_slots():
+    # PBKDF2 is CPU-bound: more hashes in flight than cores only makes each one slower
+    return getattr(settings, 'HASHING_CONCURRENCY', None) or os.cpu_count() or 1
+
+
+def limit_hashing(view_func):
+    """
+    Runs the view only if one of the site-wide hashing slots is free, else a fast
+    429. Slots are cache keys taken with add(), so the cap holds across workers.
+    Goes under @api_view so DRF turns Throttled into 429 + Retry-After.
+    """
+    @functools.wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        count = hashing_slots()
+        token = uuid.uuid4().hex
+        # Random start spreads workers over the slots instead of all fighting for slot 0
+        first = random.randrange(count)
+        for offset in range(count):
+            key = f'throttle:hashing-slot:{(first + offset) % count}'
+            if cache.add(key, token, SLOT_TIMEOUT):
+                break
+        else:
+            raise HashingBusy(wait=1)
+        try:
+            return view_func(request, *args, **kwargs)
+        finally:
+            # Only free our own slot (it may have timed out and been re-taken)
+            if cache.get(key) == token:
+                cache.delete(key)
+    return wrapper
+
+
+def exception_handler(exc, context):
+    """DRF's handler, with 429s in the {'status', 'message'} shape the frontend reads."""
+    response = drf_exception_handler(exc, context)
+    if isinstance(exc, HashingBusy):
+        response.data = {'status': 'error', 'message': HashingBusy.default_detail}
+    elif isinstance(exc, Throttled):
+        wait = f" Try again in {math.ceil(exc.wait)} seconds." if exc.wait else ''
+        response.data = {'status': 'error', 'message': f"Too many attempts.{wait}"}
+    return response
@@ -1,4 +1,4 @@
-from rest_framework.decorators import api_view, parser_classes, permission_classes
+from rest_framework.decorators import api_view, authentication_classes, parser_classes, permission_classes, throttle_classes
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
@@ -8,47 +8,48 @@ from django.contrib.auth import get_user_model
 from django.utils import timezone  # <--- Add this at the top
 from django.contrib.humanize.templatetags.humanize import naturaltime
 from django.utils import timezone
-from .models import CustomUser, StudentProfile, AuthorityProfile, Grievance,  SiteSettings
-from .serializers import GrievanceSerializer, StudentSerializer, AuthoritySerializer, SiteSettingsSerializer
-from datetime import timedelta # Add this if missing
-from django.core.mail import send_mail
+from .models import CustomUser, StudentProfile, AuthorityProfile, Grievance,  SiteSettings, DashboardCounters, EmailOutbox, GrievanceDailyStat, GrievanceTombstone
+from .serializers import StudentSerializer, AuthoritySerializer, SiteSettingsSerializer
+from .serializers import grievance_list_queryset, serialize_grievance_rows, GRIEVANCE_LIST_FIELDS
+from datetime import timedelta, datetime, time # Add this if missing
+from django.utils.dateparse import parse_date
+from .pagination import paginate_keyset, get_page_size, InvalidCursor, encode_since, decode_since
+from .search import search_grievances
+from .aggregates import PercentileCont, percentile, resolution_time
+from .bulk_import import import_csv
+from .batch import apply_batch, BATCH_STATUSES, MAX_BATCH_SIZE
+from .taxonomy import route, category_for
+from .backends import get_user_by_username, ProfileTokenAuthentication
+from .throttling import HASHING_THROTTLES, limit_hashing
+from .caching import response_cache, student_list_tag, handler_list_tag, ALL_GRIEVANCES_TAG, CACHED_ENDPOINTS
+from .streaming import is_asgi, stream_for
+from .events import get_broker, student_channel, handler_channel, ALL_CHANNEL
+from django.db import connection, transaction
+from django.db.models import Avg, Count, F, Max, Q, Subquery, Sum
+from django.db.models.functions import TruncMonth, TruncWeek, Upper
+from .rollups import HISTOGRAM_FIELDS
 from django.conf import settings
-import threading
+from django.http import HttpResponseNotModified, JsonResponse, StreamingHttpResponse
+from django.utils.http import http_date, parse_http_date_safe
+import asyncio
+import csv
+import hashlib
+import json
 import random
 
 
-# --- HELPER CLASS: Send Email in Background (So UI doesn't lag) ---
-class EmailThread(threading.Thread):
-    def __init__(self, subject, message, recipient_list):
-        self.subject = subject
-        self.message = message
-        self.recipient_list = recipient_list
-        threading.Thread.__init__(self)
-
-    def run(self):
-        try:
-            send_mail(
-                self.subject,
-                self.message,
-                settings.EMAIL_HOST_USER,
-                self.recipient_list,
-                fail_silently=False,
-            )
-        except Exception as e:
-            print(f"Error sending email: {e}")
-
 # ==========================
 # 1. AUTHENTICATION
 # ==========================
 @api_view(['POST'])
+@throttle_classes(HASHING_THROTTLES)
+@limit_hashing
 def login_api(request):
     raw_username = request.data.get('username')
     password = request.data.get('password')
     
-    # Authenticate User
+    # Authenticate User (IDs match in any case: core/backends.py)
     user = authenticate(username=raw_username, password=password)
-    if user is None and raw_username:
-        user = authenticate(username=raw_username.upper(), password=password)
     
     if user:
         # =================================================
@@ -89,6 +90,8 @@ def login_api(request):
 # ==========================
 
 @api_view(['POST'])
+@throttle_classes(HASHING_THROTTLES)
+@limit_hashing
 def register_student(request):
     # --- CHECK SETTINGS ---
     if not SiteSettings.load().allow_registration:
@@ -99,14 +102,16 @@ def register_student(request):
     try:
         # Force ID to Uppercase for consistency
         s_id = data['id'].upper()
-        user = CustomUser.objects.create_user(
-            username=s_id, email=data['email'], password=data['password'],
-            first_name=data['name'], user_type='student'
-        )
-        StudentProfile.objects.create(
-            user=user, student_id=s_id, year=data['year'],
-            branch=data.get('branch', ''), gender=data['gender']
-        )
+        # User + profile together or not at all
+        with transaction.atomic():
+            user = CustomUser.objects.create_user(
+                username=s_id, email=data['email'], password=data['password'],
+                first_name=data['name'], user_type='student'
+            )
+            StudentProfile.objects.create(
+                user=user, student_id=s_id, year=data['year'],
+                branch=data.get('branch', ''), gender=data['gender']
+            )
         return Response({'status': 'success'})
     except Exception as e:
         return Response({'status': 'error', 'message': str(e)}, status=400)
@@ -114,6 +119,8 @@ def register_student(request):
 
 @api_view(['POST'])
 @parser_classes([MultiPartParser, FormParser]) 
+@throttle_classes(HASHING_THROTTLES)
+@limit_hashing
 def register_authority(request):
     # --- CHECK SETTINGS ---
     if not SiteSettings.load().allow_registration:
@@ -122,55 +129,303 @@ def register_authority(request):
 
     data = request.data
     try:
-        user = CustomUser.objects.create_user(
-            username=data['id'], email=data['email'], password=data['password'],
-            first_name=data['name'], user_type='authority'
-        )
-        
-        # Handle Photo if sent during registration
-        if 'image' in request.FILES:
-            user.profile_pic = request.FILES['image']
-            user.save()
+        with transaction.atomic():
+            user = CustomUser.objects.create_user(
+                username=data['id'], email=data['email'], password=data['password'],
+                first_name=data['name'], user_type='authority'
+            )
 
-        AuthorityProfile.objects.create(
-            user=user, employee_id=data['id'], department=data['dept'],
-            designation=data['designation'], gender=data['gender']
-        )
+            # Handle Photo if sent during registration
+            if 'image' in request.FILES:
+                user.profile_pic = request.FILES['image']
+                user.save()
+
+            AuthorityProfile.objects.create(
+                user=user, employee_id=data['id'], department=data['dept'],
+                designation=data['designation'], gender=data['gender']
+            )
         return Response({'status': 'success'})
     except Exception as e:
         return Response({'status': 'error', 'message': str(e)}, status=400)
 
+# Rows one web import may create: hashed one after another in a single hashing slot,
+# so this bounds the request's duration. Bigger files go through `manage.py import_users`.
+WEB_IMPORT_MAX_ROWS = 100
+
+
+@api_view(['POST'])
+@parser_classes([MultiPartParser, FormParser])
+@throttle_classes(HASHING_THROTTLES)
+@limit_hashing
+def bulk_import(request, kind):
+    """
+    CSV onboarding: POST a 'file' to /api/import/students/ or /api/import/authorities/.
+    Columns match the register forms. ?dry_run=1 validates without writing (any size).
+    """
+    if not SiteSettings.load().allow_registration:
+        return Response({'status': 'error', 'message': 'Registration is currently disabled.'}, status=403)
+
+    upload = request.FILES.get('file')
+    if upload is None:
+        return Response({'status': 'error', 'message': 'Attach the CSV as "file".'}, status=400)
+
+    dry_run = request.GET.get('dry_run') in ('1', 'true')
+    try:
+        # workers=1: no process pool inside a web worker, hashing stays under limit_hashing's cap
+        report = import_csv(kind, upload, dry_run=dry_run, workers=1,
+                            max_rows=None if dry_run else WEB_IMPORT_MAX_ROWS)
+    except (ValueError, UnicodeDecodeError, csv.Error) as e:
+        return Response({'status': 'error', 'message': str(e)}, status=400)
+
+    return Response({'status': 'success', **report})
+
 # ==========================
 # 3. GRIEVANCE HANDLING
 # ==========================
+def scoped_grievances(params):
+    """
+    Base queryset for the caller's role:
+    students see their own, authorities see what is assigned to their designation,
+    admins see everything. Returns None if the user_id is unknown.
+    """
+    user_id = params.get('user_id')
+    role = params.get('role')
+
+    grievances = Grievance.objects.all()
+
+    if role == 'student' and user_id:
+        try:
+            student_profile = StudentProfile.objects.get(student_id=user_id)
+        except StudentProfile.DoesNotExist:
+            return None
+        grievances = grievances.filter(student=student_profile)
+    elif role == 'authority' and user_id:
+        try:
+            # Find out who this authority is (e.g., "Chief Warden")
+            auth_profile = AuthorityProfile.objects.get(employee_id=user_id)
+        except AuthorityProfile.DoesNotExist:
+            return None
+        # Only show grievances assigned to THIS designation
+        grievances = grievances.filter(current_handler_designation=auth_profile.designation)
+
+    return grievances
+
+
+def scoped_tombstones(params):
+    """
+    Tombstones of grievances that left the caller's list (same ?role / ?user_id as
+    scoped_grievances): a student's deleted ones, those deleted or moved off an
+    authority's designation, every deletion for admins. Profiles are matched in a
+    subquery, so this adds no round trip of its own.
+    """
+    user_id = params.get('user_id')
+    role = params.get('role')
+
+    tombstones = GrievanceTombstone.objects.all()
+    if role == 'student' and user_id:
+        return tombstones.filter(student_id__in=StudentProfile.objects.filter(student_id=user_id).values('id'))
+    if role == 'authority' and user_id:
+        designations = AuthorityProfile.objects.filter(employee_id=user_id).values('designation')
+        return tombstones.filter(handler_designation__in=designations)
+    # Admins see every grievance wherever it is assigned
+    return tombstones.filter(reassigned=False)
+
+
+def _parse_day(value, name):
+    day = parse_date(value)
+    if day is None:
+        raise ValueError(f"{name} must be a date (YYYY-MM-DD).")
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def filter_grievances(grievances, params):
+    """
+    Optional server-side filters shared by the grievance list endpoints:
+    ?status=  ?department_category=  ?department_id=  ?category_id=  ?location=
+    ?handler=  ?date_from=  ?date_to=  (dates inclusive)
+    Raises ValueError on a malformed date or id.
+    """
+    if params.get('status'):
+        grievances = grievances.filter(status=params['status'])
+    if params.get('department_category'):
+        grievances = grievances.filter(department_category=params['department_category'])
+    if params.get('department_id'):
+        grievances = grievances.filter(department_id=params['department_id'])
+    if params.get('category_id'):
+        grievances = grievances.filter(category_ref_id=params['category_id'])
+    if params.get('location'):
+        grievances = grievances.filter(category_ref__location=params['location'])
+    if params.get('handler'):
+        grievances = grievances.filter(current_handler_designation=params['handler'])
+
+    # Compare against datetime bounds (not __date) so an index on created_at stays usable
+    if params.get('date_from'):
+        grievances = grievances.filter(created_at__gte=_parse_day(params['date_from'], 'date_from'))
+    if params.get('date_to'):
+        end = _parse_day(params['date_to'], 'date_to') + timedelta(days=1)
+        grievances = grievances.filter(created_at__lt=end)
+
+    return grievances
+
+
+def _list_validators(params, validators):
+    """(ETag, Last-Modified) for a grievance list; role, user_id and filters are part of the tag."""
+    stamps = [stamp for stamp in (validators['changed'], validators['deleted']) if stamp]
+    newest = max(stamps) if stamps else None
+    raw = f"{params.urlencode()}|{validators['count']}|{newest.isoformat() if newest else ''}"
+    etag = '"%s"' % hashlib.md5(raw.encode(), usedforsecurity=False).hexdigest()
+    return etag, newest
+
+
+def _not_modified(request, etag, last_modified):
+    # If-None-Match wins over If-Modified-Since (RFC 9110). Last-Modified cannot see a row
+    # leaving the caller's scope, so ETag is the validator clients should rely on.
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if if_none_match:
+        tags = [tag.strip() for tag in if_none_match.split(',')]
+        return etag in tags or '*' in tags
+    since = parse_http_date_safe(request.META.get('HTTP_IF_MODIFIED_SINCE', ''))
+    return since is not None and last_modified is not None and int(last_modified.timestamp()) <= since
+
+
+def _with_validators(response, etag, last_modified):
+    response['ETag'] = etag
+    if last_modified:
+        response['Last-Modified'] = http_date(last_modified.timestamp())
+    # Private: lists are per user. no-cache: always revalidate (cheap thanks to the 304 path)
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+def _grievance_list(request, params, grievances=None):
+    """
+    A grievance list GET: plain, cursor-paginated or a ?since delta.
+    `params` carry role / user_id and the filters; `grievances` is the already
+    resolved scope when the caller has one (the /me endpoints).
+    """
+    if grievances is None:
+        grievances = scoped_grievances(params)
+    if grievances is None:
+        return Response([])
+
+    scope = grievances
+    tombstones = scoped_tombstones(params)
+    try:
+        grievances = filter_grievances(grievances, params)
+    except ValueError as e:
+        return Response({'status': 'error', 'message': str(e)}, status=400)
+
+    # Conditional GET: (row count, newest updated_at, newest exit from this list) changes
+    # whenever the list could. Checked with one aggregate query before any rows are fetched.
+    validators = grievances.aggregate(
+        count=Count('id'),
+        changed=Max('updated_at'),
+        deleted=Max(Subquery(tombstones.order_by('-deleted_at').values('deleted_at')[:1])),
+    )
+    etag, last_modified = _list_validators(params, validators)
+    if _not_modified(request, etag, last_modified):
+        response = HttpResponseNotModified()
+        response['ETag'] = etag
+        return response
+
+    # Lean projection: one joined query, no per-row student/user lookups
+    rows = grievance_list_queryset(grievances)
+
+    # Delta sync: rows changed since the last sync, plus ids the client should drop
+    if 'since' in params:
+        started = timezone.now()
+        try:
+            since = decode_since(params['since'])
+        except InvalidCursor as e:
+            return Response({'status': 'error', 'message': str(e)}, status=400)
+        changed = list(rows.filter(updated_at__gte=since).order_by('-created_at', '-id'))
+        # Deleted, or moved off this designation, since the last sync
+        deleted = set(tombstones.filter(deleted_at__gte=since).values_list('grievance_id', flat=True))
+        # Still the caller's, but no longer matching the filters (status changed, ...)
+        deleted |= set(
+            scope.filter(updated_at__gte=since)
+            .exclude(id__in=grievances.values('id'))
+            .values_list('id', flat=True)
+        )
+        # Moved away and back again: it is in the list
+        deleted -= {row['id'] for row in changed}
+        response = Response({
+            'results': serialize_grievance_rows(changed),
+            'deleted': sorted(deleted),
+            'next_since': encode_since(started),
+        })
+        return _with_validators(response, etag, last_modified)
+
+    # Paginated mode: only when the client asks for it (keeps old dashboards working)
+    if 'cursor' in params or 'limit' in params:
+        try:
+            rows, next_cursor = paginate_keyset(
+                rows, params.get('cursor'), params.get('limit')
+            )
+        except InvalidCursor as e:
+            return Response({'status': 'error', 'message': str(e)}, status=400)
+        response = Response({'results': serialize_grievance_rows(rows), 'next_cursor': next_cursor})
+        return _with_validators(response, etag, last_modified)
+
+    response = Response(serialize_grievance_rows(rows.order_by('-created_at', '-id')))
+    return _with_validators(response, etag, last_modified)
+
+
+# Response headers kept with a cached body
+CACHED_HEADERS = ('ETag', 'Last-Modified', 'Cache-Control')
+
+
+def _cached(request, endpoint, tags, build, params=None):
+    """
+    Answers a GET from response_cache (core/caching.py), calling build() on a miss.
+    Only 200s are stored. A hit still honours If-None-Match against the stored ETag.
+    `params` (default: the query string) supply the role / user_id / filters of the key.
+    """
+    cached, token = response_cache.lookup(endpoint, request.GET if params is None else params, tags)
+    if cached is None:
+        response = build()
+        if token is None:
+            return response  # caching switched off
+        if response.status_code == 200:
+            response_cache.store(token, {
+                'data': response.data,
+                'headers': {name: response[name] for name in CACHED_HEADERS if response.has_header(name)},
+            })
+        response['X-Cache'] = 'MISS'
+        return response
+
+    etag = cached['headers'].get('ETag')
+    if etag and _not_modified(request, etag, None):
+        response = HttpResponseNotModified()
+        response['ETag'] = etag
+    else:
+        response = Response(cached['data'], headers=cached['headers'])
+    response['X-Cache'] = 'HIT'
+    return response
+
+
+def _grievance_list_tags(params):
+    """Cache tags for a grievance list request, None if it should not be cached."""
+    role, user_id = params.get('role'), params.get('user_id')
+    if role == 'student' and user_id:
+        return ['grievances', student_list_tag(user_id)]
+    if role == 'authority' and user_id:
+        designation = AuthorityProfile.objects.filter(employee_id=user_id).values_list('designation', flat=True).first()
+        if designation is None:
+            return None
+        return ['grievances', handler_list_tag(designation)]
+    return ['grievances', ALL_GRIEVANCES_TAG]
+
+
 @api_view(['GET', 'POST', 'PATCH', 'DELETE'])
 @parser_classes([MultiPartParser, FormParser, JSONParser])
 def grievance_api(request):
     if request.method == 'GET':
-        user_id = request.GET.get('user_id')
-        role = request.GET.get('role')
-        
-        grievances = Grievance.objects.all().order_by('-created_at')
-
-        if role == 'student' and user_id:
-             try:
-                 student_profile = StudentProfile.objects.get(student_id=user_id)
-                 grievances = grievances.filter(student=student_profile)
-             except:
-                 return Response([])
-        elif role == 'authority' and user_id:
-             try:
-                 # Find out who this authority is (e.g., "Chief Warden")
-                 auth_profile = AuthorityProfile.objects.get(employee_id=user_id)
-                 my_designation = auth_profile.designation
-                 
-                 # Only show grievances assigned to THIS designation
-                 grievances = grievances.filter(current_handler_designation=my_designation)
-             except:
-                 return Response([])
-
-        serializer = GrievanceSerializer(grievances, many=True)
-        return Response(serializer.data)
+        tags = _grievance_list_tags(request.GET)
+        # Deltas are per-client by nature; don't fill the cache with them
+        if tags is None or 'since' in request.GET:
+            return _grievance_list(request, request.GET)
+        return _cached(request, 'grievances', tags, lambda: _grievance_list(request, request.GET))
 
     elif request.method == 'POST':
         try:
@@ -178,29 +433,18 @@ def grievance_api(request):
             student = StudentProfile.objects.get(student_id=student_id)
             
             full_category = request.data.get('category') # e.g. "Hostel - I1 - Electrical"
-            
-            # 1. Determine Hierarchy Start Point
-            # Logic: Extract the first word to find Department
-            dept_map = {
-                'Hostel': 'Chief Warden',
-                'Mess': 'Chief Mess Coordinator',
-                'Academic': 'Dean Academics',
-                'Hospital': 'Chief Medical Officer',
-                'Sports/Gym': 'Chief Sports Coordinator',
-                'Ragging': 'DIRECTOR',
-                'Others': 'AO',
-                'Administration': 'AO'
-            }
-            
-            # Extract dept from string "Hostel - I1..."
-            main_dept = full_category.split(' - ')[0] 
-            initial_handler = dept_map.get(main_dept, 'AO') # Default to AO if unknown
+
+            # 1. Determine Hierarchy Start Point from the (cached) department table
+            department_id, main_dept, initial_handler = route(full_category)
+            category = category_for(full_category, department_id)
 
             Grievance.objects.create(
                 student=student,
                 category=full_category,
+                category_ref=category,
                 description=request.data.get('description'),
                 image=request.data.get('image'),
+                department_id=department_id,
                 department_category=main_dept,       # Save Dept
                 current_handler_designation=initial_handler # Assign to Lowest Level
             )
@@ -258,9 +502,9 @@ Regards,
 Smart Grievance Management System
                         """
                         
-                        # Send Email in Background
-                        EmailThread(subject, message, [grievance.student.user.email]).start()
-                        print("Email notification sent.")
+                        # Queue it; `manage.py send_outbox` does the SMTP work
+                        EmailOutbox.enqueue(subject, message, [grievance.student.user.email])
+                        print("Email notification queued.")
                 else:
                     print("Email notifications are disabled in settings. Skipping.")
 
@@ -298,15 +542,213 @@ Smart Grievance Management System
         except Exception as e:
             return Response({'status': 'error', 'message': str(e)}, status=500)
 
+@api_view(['POST'])
+@parser_classes([MultiPartParser, FormParser, JSONParser])
+def grievance_batch(request):
+    """
+    Resolve / escalate / reject many grievances at once:
+    {ids: [..] (or "1,2,3"), status, reply, resolved_image (optional, shared), role, user_id}.
+    One transaction, one UPDATE, one digest mail per student (core/batch.py).
+    role / user_id scope it like grievance_api GET; ids outside the scope come back as skipped.
+    """
+    data = request.data
+    raw_ids = data.getlist('ids') if hasattr(data, 'getlist') else data.get('ids')
+    if isinstance(raw_ids, str):
+        raw_ids = [raw_ids]
+    try:
+        ids = [int(part) for value in (raw_ids or []) for part in str(value).split(',') if part.strip()]
+    except ValueError:
+        return Response({'status': 'error', 'message': 'ids must be numbers.'}, status=400)
+    if not ids:
+        return Response({'status': 'error', 'message': 'ids is required.'}, status=400)
+    if len(ids) > MAX_BATCH_SIZE:
+        return Response({'status': 'error', 'message': f'At most {MAX_BATCH_SIZE} ids per batch.'}, status=400)
+
+    status = data.get('status')
+    if status not in BATCH_STATUSES:
+        return Response({'status': 'error', 'message': f"status must be one of: {', '.join(BATCH_STATUSES)}"}, status=400)
+
+    grievances = scoped_grievances(data)
+    if grievances is None:
+        return Response({'status': 'error', 'message': 'User not found'}, status=404)
+
+    try:
+        updated, skipped = apply_batch(
+            grievances, ids, status, data.get('reply') or 'No remarks provided.',
+            image=request.FILES.get('resolved_image'),
+        )
+    except ValueError as e:
+        return Response({'status': 'error', 'message': str(e)}, status=400)
+    return Response({'status': 'success', 'updated': updated, 'skipped': skipped})
+
+
+@api_view(['GET'])
+def search_grievances_api(request):
+    """
+    Ranked full-text search over category + description.
+    ?q= (terms ANDed, prefix matched) plus the usual grievance_api scope/filters.
+    ?limit= (capped) and ?offset= page through the ranked results.
+    """
+    grievances = scoped_grievances(request.GET)
+    if grievances is None:
+        return Response({'results': [], 'next_offset': None})
+    try:
+        grievances = filter_grievances(grievances, request.GET)
+        limit = get_page_size(request.GET.get('limit'))
+        offset = max(int(request.GET.get('offset', 0)), 0)
+    except ValueError as e:
+        return Response({'status': 'error', 'message': str(e)}, status=400)
+
+    matches = search_grievances(grievances, request.GET.get('q'))
+    rows = list(
+        matches.values(*GRIEVANCE_LIST_FIELDS, 'rank')
+        .order_by('-rank', '-created_at', '-id')[offset:offset + limit + 1]
+    )
+    next_offset = offset + limit if len(rows) > limit else None
+    rows = rows[:limit]
+
+    results = serialize_grievance_rows(rows)
+    for result, row in zip(results, rows):
+        result['rank'] = row['rank']
+    return Response({'results': results, 'next_offset': next_offset})
+
+
+class Echo:
+    """File-like object whose write() hands the line back, for streaming csv.writer output."""
+    def write(self, value):
+        return value
+
+
+EXPORT_COLUMNS = [
+    ('ID', 'id'),
+    ('Student ID', 'student__student_id'),
+    ('Student Name', 'student__user__first_name'),
+    ('Category', 'category'),
+    ('Department', 'department_category'),
+    ('Current Handler', 'current_handler_designation'),
+    ('Status', 'status'),
+    ('Created At', 'created_at'),
+    ('Resolved At', 'resolved_at'),
+    ('Feedback Stars', 'feedback_stars'),
+    ('Description', 'description'),
+    ('Authority Reply', 'authority_reply'),
+]
+EXPORT_CHUNK_SIZE = 2000
+
+
+@api_view(['GET'])
+def export_grievances(request):
+    """
+    CSV of the grievance table, same ?role / ?user_id / filters as grievance_api GET.
+    Rows are streamed from a server-side cursor, so memory stays flat for any size.
+    """
+    grievances = scoped_grievances(request.GET)
+    if grievances is None:
+        grievances = Grievance.objects.none()
+    try:
+        grievances = filter_grievances(grievances, request.GET)
+    except ValueError as e:
+        return Response({'status': 'error', 'message': str(e)}, status=400)
+
+    rows = (
+        grievances.order_by('-created_at', '-id')
+        .values_list(*[field for _, field in EXPORT_COLUMNS])
+        .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    )
+
+    def stream():
+        writer = csv.writer(Echo())
+        # BOM so Excel opens the file as UTF-8
+        yield '\ufeff' + writer.writerow([title for title, _ in EXPORT_COLUMNS])
+        for row in rows:
+            yield writer.writerow(
+                [value.isoformat() if isinstance(value, datetime) else value for value in row]
+            )
+
+    # EXPORT_CHUNK_SIZE lines per chunk under ASGI, one fetch's worth of rows
+    response = StreamingHttpResponse(stream_for(request, stream(), EXPORT_CHUNK_SIZE), content_type='text/csv; charset=utf-8')
+    filename = f"grievances_{timezone.now():%Y%m%d_%H%M}.csv"
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+# Comment line sent when nothing happened for this long, so proxies keep the stream open
+EVENTS_KEEPALIVE_SECONDS = 15
+
+
+async def _event_channels(params):
+    """Same ?role / ?user_id scoping as scoped_grievances, as pub/sub channel names."""
+    role = params.get('role')
+    user_id = params.get('user_id')
+    if role == 'student' and user_id:
+        student = await StudentProfile.objects.filter(student_id=user_id).only('id').afirst()
+        return [student_channel(student.id)] if student else None
+    if role == 'authority' and user_id:
+        authority = await AuthorityProfile.objects.filter(employee_id=user_id).only('designation').afirst()
+        return [handler_channel(authority.designation)] if authority else None
+    if role == 'admin':
+        return [ALL_CHANNEL]
+    return None
+
+
+async def grievance_events(request):
+    """
+    Server-Sent Events stream of grievance changes (created / status_changed / reassigned)
+    for the caller. Replaces polling GET /api/grievances/; needs an ASGI server (backend/asgi.py).
+    """
+    if request.method != 'GET':
+        return JsonResponse({'status': 'error', 'message': 'Method not allowed'}, status=405)
+    # Under WSGI the never-ending stream is drained before sending, pinning a worker per client
+    if not is_asgi(request):
+        return JsonResponse({'status': 'error', 'message': 'Live updates need the ASGI server; poll /api/grievances/ instead.'}, status=501)
+    channels = await _event_channels(request.GET)
+    if channels is None:
+        return JsonResponse({'status': 'error', 'message': 'Unknown role or user_id'}, status=400)
+
+    async def stream():
+        events = get_broker().subscribe(channels).__aiter__()
+        next_event = None
+        try:
+            yield 'retry: 5000\n\n'
+            while True:
+                if next_event is None:
+                    next_event = asyncio.ensure_future(events.__anext__())
+                done, _ = await asyncio.wait({next_event}, timeout=EVENTS_KEEPALIVE_SECONDS)
+                if not done:
+                    yield ': keepalive\n\n'
+                    continue
+                event = next_event.result()
+                next_event = None
+                yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+        finally:
+            # Client went away: stop waiting and drop the subscription
+            if next_event is not None:
+                next_event.cancel()
+                await asyncio.gather(next_event, return_exceptions=True)
+            await events.aclose()
+
+    response = StreamingHttpResponse(stream(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # nginx would otherwise buffer the stream
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
 # ==========================
 # 4. DASHBOARD STATS
 # ==========================
 @api_view(['GET'])
 def dashboard_stats(request):
-    total_students = StudentProfile.objects.count()
-    total_authorities = AuthorityProfile.objects.count()
-    total_grievances = Grievance.objects.count()
-    resolved_count = Grievance.objects.filter(status='Resolved').count()
+    return _cached(request, 'stats', ['stats'], _dashboard_stats)
+
+
+def _dashboard_stats():
+    # One row read instead of four COUNT(*) scans (kept current by core/signals.py)
+    counters = DashboardCounters.load()
+    total_students = counters.students
+    total_authorities = counters.authorities
+    total_grievances = counters.grievances
+    resolved_count = counters.resolved
     
     resolve_rate = 0
     if total_grievances > 0:
@@ -319,17 +761,241 @@ def dashboard_stats(request):
         'rate': f"{resolve_rate}%"
     })
 
+
+@api_view(['GET'])
+def response_cache_stats(request):
+    """Hit / miss counts of the read-endpoint response cache, per endpoint (for tuning its TTL and tags)."""
+    return Response(response_cache.stats(CACHED_ENDPOINTS))
+
+# Which Grievance column each ?group_by= value aggregates on
+PERFORMANCE_GROUPS = {
+    'designation': 'current_handler_designation',
+    'department': 'department_category',
+}
+
+
+def _hours(duration):
+    if duration is None:
+        return None
+    return round(duration.total_seconds() / 3600, 2)
+
+
+@api_view(['GET'])
+def authority_performance(request):
+    """
+    Per-designation (default) or per-department metrics in one GROUP BY:
+    total / resolved / escalated / pending counts, resolve rate,
+    average + p50 / p90 resolution time in hours, average feedback stars.
+    """
+    group_by = request.GET.get('group_by', 'designation')
+    column = PERFORMANCE_GROUPS.get(group_by)
+    if column is None:
+        return Response({'status': 'error', 'message': 'group_by must be designation or department.'}, status=400)
+
+    resolved = Q(status='Resolved', resolved_at__isnull=False)
+    aggregates = {
+        'total': Count('id'),
+        'resolved': Count('id', filter=Q(status='Resolved')),
+        'escalated': Count('id', filter=Q(status='Escalated')),
+        'pending': Count('id', filter=Q(status='Pending')),
+        'avg_resolution': Avg(resolution_time(), filter=resolved),
+        # 0 stars means "no feedback given yet", so leave those out of the mean
+        'avg_stars': Avg('feedback_stars', filter=Q(feedback_stars__gt=0)),
+    }
+    use_db_percentiles = connection.vendor == 'postgresql'
+    if use_db_percentiles:
+        aggregates['p50_resolution'] = PercentileCont(resolution_time(), 0.5, filter=resolved)
+        aggregates['p90_resolution'] = PercentileCont(resolution_time(), 0.9, filter=resolved)
+
+    rows = list(
+        Grievance.objects.values(column).annotate(**aggregates).order_by(column)
+    )
+
+    if not use_db_percentiles:
+        # No ordered-set aggregates on SQLite: one pass over resolved durations instead
+        durations = {}
+        resolved_rows = Grievance.objects.filter(resolved).values_list(column, 'created_at', 'resolved_at')
+        for key, created_at, resolved_at in resolved_rows.iterator():
+            durations.setdefault(key, []).append(resolved_at - created_at)
+        for row in rows:
+            values = sorted(durations.get(row[column], []))
+            row['p50_resolution'] = percentile(values, 0.5)
+            row['p90_resolution'] = percentile(values, 0.9)
+
+    results = []
+    for row in rows:
+        total = row['total']
+        results.append({
+            group_by: row[column],
+            'total': total,
+            'resolved': row['resolved'],
+            'escalated': row['escalated'],
+            'pending': row['pending'],
+            'rate': int((row['resolved'] / total) * 100) if total else 0,
+            'avg_resolution_hours': _hours(row['avg_resolution']),
+            'p50_resolution_hours': _hours(row['p50_resolution']),
+            'p90_resolution_hours': _hours(row['p90_resolution']),
+            'avg_feedback_stars': round(row['avg_stars'], 2) if row['avg_stars'] is not None else None,
+        })
+    return Response(results)
+
+# ?period= shortcuts for the trends endpoint: (days back, default bucket size)
+TREND_PERIODS = {
+    'week': (7, 'day'),
+    'month': (30, 'day'),
+    'semester': (182, 'week'),
+}
+TREND_GRANULARITY = {
+    'day': None,
+    'week': TruncWeek,
+    'month': TruncMonth,
+}
+TREND_GROUPS = {
+    'status': 'status',
+    'department': 'department_category',
+    'category': 'category',
+}
+
+
+@api_view(['GET'])
+def grievance_trends(request):
+    """
+    Trend series from the GrievanceDailyStat rollup (never scans Grievance):
+    ?period=week|month|semester  or  ?date_from=&date_to=  (YYYY-MM-DD)
+    ?granularity=day|week|month  ?group_by=status|department|category  ?department_category=  ?status=
+    """
+    period = request.GET.get('period', 'month')
+    if period not in TREND_PERIODS and not request.GET.get('date_from'):
+        return Response({'status': 'error', 'message': 'period must be week, month or semester.'}, status=400)
+    days_back, default_granularity = TREND_PERIODS.get(period, (None, 'day'))
+
+    today = timezone.now().date()
+    try:
+        date_from = parse_date(request.GET['date_from']) if request.GET.get('date_from') else today - timedelta(days=days_back - 1)
+        date_to = parse_date(request.GET['date_to']) if request.GET.get('date_to') else today
+    except ValueError:
+        date_from = date_to = None
+    if date_from is None or date_to is None:
+        return Response({'status': 'error', 'message': 'Dates must be YYYY-MM-DD.'}, status=400)
+
+    granularity = request.GET.get('granularity', default_granularity)
+    group_by = request.GET.get('group_by', 'status')
+    if granularity not in TREND_GRANULARITY or group_by not in TREND_GROUPS:
+        return Response({'status': 'error', 'message': 'Unknown granularity or group_by.'}, status=400)
+    column = TREND_GROUPS[group_by]
+
+    stats = GrievanceDailyStat.objects.filter(day__gte=date_from, day__lte=date_to)
+    if request.GET.get('department_category'):
+        stats = stats.filter(department_category=request.GET['department_category'])
+    if request.GET.get('status'):
+        stats = stats.filter(status=request.GET['status'])
+
+    trunc = TREND_GRANULARITY[granularity]
+    bucket = trunc('day') if trunc else F('day')
+    series = (
+        stats.annotate(bucket=bucket)
+        .values('bucket', column)
+        .annotate(count=Sum('count'))
+        .order_by('bucket', column)
+    )
+
+    totals = stats.aggregate(
+        resolved=Sum('count', filter=Q(status='Resolved')),
+        resolution_seconds=Sum('resolution_seconds'),
+        **{name: Sum(name) for name in HISTOGRAM_FIELDS}
+    )
+    resolved = totals.pop('resolved') or 0
+    resolution_seconds = totals.pop('resolution_seconds') or 0
+
+    return Response({
+        'from': date_from,
+        'to': date_to,
+        'granularity': granularity,
+        'series': [
+            {'bucket': row['bucket'], group_by: row[column], 'count': row['count']}
+            for row in series
+        ],
+        'resolved': resolved,
+        'avg_resolution_hours': round(resolution_seconds / resolved / 3600, 2) if resolved else None,
+        'resolution_histogram': {name: totals[name] or 0 for name in HISTOGRAM_FIELDS},
+    })
+
 # ==========================
 # 5. USER MANAGEMENT (Edit/Delete)
 # ==========================
 
+# Directory listing options: ?sort= key -> column, ?<filter>= -> column
+STUDENT_ROSTER = {
+    'id_field': 'student_id',
+    'sorts': {'id': 'student_id', 'name': 'user__first_name', 'year': 'year', 'branch': 'branch'},
+    'filters': {'year': 'year', 'branch': 'branch'},
+}
+AUTHORITY_ROSTER = {
+    'id_field': 'employee_id',
+    'sorts': {'id': 'employee_id', 'name': 'user__first_name', 'department': 'department', 'designation': 'designation'},
+    'filters': {'department': 'department', 'designation': 'designation'},
+}
+
+
+def roster_page(queryset, params, roster, serializer_class):
+    """
+    GET body of manage_students / manage_authorities.
+    ?q= prefix-matches ID, name or email (case-insensitive, index-backed: migrations 0019/0020),
+    plus the roster's exact-match filters and ?sort=[-]key. Paginated with ?limit/?offset
+    ({'results', 'count', 'next_offset'}); without them the whole list, as before.
+    """
+    id_field = roster['id_field']
+    queryset = queryset.select_related('user')
+
+    for param, column in roster['filters'].items():
+        if params.get(param):
+            queryset = queryset.filter(**{column: params[param]})
+
+    prefix = (params.get('q') or '').strip().upper()
+    if prefix:
+        # Name/email matches come from their own indexes on core_customuser,
+        # rather than an OR across the join that no index can serve
+        users = CustomUser.objects.alias(
+            name_key=Upper('first_name'), email_key=Upper('email')
+        ).filter(Q(name_key__startswith=prefix) | Q(email_key__startswith=prefix)).values('id')
+        # Employee IDs are stored as typed, so the ID is upper-cased too (LIKE is case-sensitive on PostgreSQL)
+        queryset = queryset.alias(id_key=Upper(id_field)).filter(Q(id_key__startswith=prefix) | Q(user_id__in=users))
+
+    sort = params.get('sort') or 'id'
+    descending = sort.startswith('-')
+    column = roster['sorts'].get(sort.lstrip('-'))
+    if column is None:
+        raise ValueError(f"sort must be one of: {', '.join(roster['sorts'])}")
+    # The unique ID breaks ties so pages never overlap
+    order = [column, id_field] if column != id_field else [id_field]
+    queryset = queryset.order_by(*[f'-{name}' if descending else name for name in order])
+
+    if 'limit' not in params and 'offset' not in params:
+        return serializer_class(queryset, many=True).data
+
+    limit = get_page_size(params.get('limit'))
+    try:
+        offset = max(int(params.get('offset') or 0), 0)
+    except ValueError:
+        raise ValueError('offset must be a number.')
+    rows = list(queryset[offset:offset + limit + 1])
+    return {
+        'results': serializer_class(rows[:limit], many=True).data,
+        'count': queryset.count(),
+        'next_offset': offset + limit if len(rows) > limit else None,
+    }
+
+
 @api_view(['GET', 'DELETE', 'PUT'])
 def manage_students(request):
     # GET: List all students
     if request.method == 'GET':
-        students = StudentProfile.objects.all().order_by('student_id')
-        serializer = StudentSerializer(students, many=True)
-        return Response(serializer.data)
+        def build():
+            try:
+                return Response(roster_page(StudentProfile.objects.all(), request.GET, STUDENT_ROSTER, StudentSerializer))
+            except ValueError as e:
+                return Response({'status': 'error', 'message': str(e)}, status=400)
+        return _cached(request, 'students', ['students'], build)
     
     # PUT: Edit a student
     elif request.method == 'PUT':
@@ -337,6 +1003,7 @@ def manage_students(request):
         try:
             student = StudentProfile.objects.get(student_id=data['id'])
             user = student.user
+            old_name = user.first_name
             
             # Update User Table
             user.first_name = data.get('name', user.first_name)
@@ -351,6 +1018,14 @@ def manage_students(request):
             student.branch = data.get('branch', student.branch)
             student.gender = data.get('gender', student.gender)
             student.save()
+
+            # Grievance lists show the student's name: drop the ones their grievances are in
+            if user.first_name != old_name:
+                # ...and re-stamp the rows, so ETags change and delta sync re-sends them
+                Grievance.objects.filter(student=student).update(updated_at=timezone.now())
+                handlers = Grievance.objects.filter(student=student).values_list('current_handler_designation', flat=True).distinct()
+                response_cache.invalidate(ALL_GRIEVANCES_TAG, student_list_tag(student.student_id),
+                                          *[handler_list_tag(handler) for handler in handlers])
             
             return Response({'status': 'success', 'message': 'Student Updated Successfully'})
         except StudentProfile.DoesNotExist:
@@ -374,9 +1049,12 @@ def manage_students(request):
 def manage_authorities(request):
     # GET: List all authorities
     if request.method == 'GET':
-        authorities = AuthorityProfile.objects.all().order_by('employee_id')
-        serializer = AuthoritySerializer(authorities, many=True)
-        return Response(serializer.data)
+        def build():
+            try:
+                return Response(roster_page(AuthorityProfile.objects.all(), request.GET, AUTHORITY_ROSTER, AuthoritySerializer))
+            except ValueError as e:
+                return Response({'status': 'error', 'message': str(e)}, status=400)
+        return _cached(request, 'authorities', ['authorities'], build)
 
     # PUT: Edit an authority
     elif request.method == 'PUT':
@@ -459,6 +1137,8 @@ def site_settings_api(request):
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
+@throttle_classes(HASHING_THROTTLES)
+@limit_hashing
 def admin_change_password(request):
     user = request.user
     old_pass = request.data.get('old_password')
@@ -478,36 +1158,118 @@ def admin_change_password(request):
 
 
 
+# ==========================
+# 6. CURRENT USER (/api/me/)
+# ==========================
+# Resolved from the auth token (one query: token + user + profile), so dashboards
+# no longer download the whole roster to find their own row.
+
+def _role_of(user):
+    # Same rules as login_api
+    if user.is_superuser:
+        return 'admin'
+    return user.user_type or 'student'
+
+
+def _my_scope(user):
+    """(role, user_id, grievance queryset, cache tags) for the logged-in user."""
+    role = _role_of(user)
+    student = getattr(user, 'student_profile', None)
+    authority = getattr(user, 'authority_profile', None)
+    if role == 'student' and student:
+        return (role, student.student_id, Grievance.objects.filter(student_id=student.pk),
+                ['grievances', student_list_tag(student.student_id)])
+    if role == 'authority' and authority:
+        return (role, authority.employee_id,
+                Grievance.objects.filter(current_handler_designation=authority.designation),
+                ['grievances', handler_list_tag(authority.designation)])
+    if role == 'admin':
+        return role, user.username, Grievance.objects.all(), ['grievances', ALL_GRIEVANCES_TAG]
+    return role, user.username, None, None
+
+
+@api_view(['GET'])
+@authentication_classes([ProfileTokenAuthentication])
+@permission_classes([IsAuthenticated])
+def me(request):
+    user = request.user
+    role = _role_of(user)
+    profile = None
+    if role == 'student' and getattr(user, 'student_profile', None):
+        profile = StudentSerializer(user.student_profile).data
+    elif role == 'authority' and getattr(user, 'authority_profile', None):
+        profile = AuthoritySerializer(user.authority_profile).data
+    return Response({
+        'user_type': role,
+        'username': user.username,
+        'name': user.first_name,
+        'email': user.email,
+        'profile': profile,
+    })
+
+
+@api_view(['GET'])
+@authentication_classes([ProfileTokenAuthentication])
+@permission_classes([IsAuthenticated])
+def me_grievances(request):
+    """The caller's grievance list; same filters, pagination and ?since as grievance_api GET."""
+    role, user_id, grievances, tags = _my_scope(request.user)
+    if grievances is None:
+        return Response([])
+    params = request.GET.copy()
+    params['role'], params['user_id'] = role, user_id
+    if 'since' in params:
+        return _grievance_list(request, params, grievances)
+    return _cached(request, 'grievances', tags, lambda: _grievance_list(request, params, grievances), params)
+
+
 # ==========================================
 # FORGOT PASSWORD FEATURE
 # ==========================================
 
+# Repeated "Send OTP" clicks inside this window reuse the OTP already on its way
+OTP_RESEND_COOLDOWN = timedelta(seconds=60)
+
+# Outbox status -> what the login page shows
+OTP_DELIVERY_STATUS = {
+    'pending': 'queued',
+    'sent': 'sent',
+    'dead': 'failed',
+}
+
+
 @api_view(['POST'])
 @permission_classes([AllowAny]) # Anyone can access this
 def send_otp_api(request):
     user_id = request.data.get('id')
-    
-    # 1. Find User by ID (Student ID or Employee ID)
-    try:
-        # Try finding exact match or uppercase match
-        user = CustomUser.objects.get(username__iexact=user_id)
-    except CustomUser.DoesNotExist:
-        return Response({'status': 'error', 'message': 'User ID not found!'}, status=404)
 
-    if not user.email:
-        return Response({'status': 'error', 'message': 'No email registered for this ID. Contact Admin.'}, status=400)
-
-    # 2. Generate 6-Digit OTP
-    otp = str(random.randint(100000, 999999))
-    
-    # 3. Save OTP to DB
-    user.otp_code = otp
-    user.otp_created_at = timezone.now()
-    user.save()
-
-    # 4. Send Email
-    subject = "Password Reset OTP - Grievance System"
-    message = f"""
+    with transaction.atomic():
+        # 1. Find User by ID (Student ID or Employee ID)
+        # Row lock (on the user row only: FOR UPDATE may not cover the nullable outer join) so two
+        # quick clicks cannot both queue a mail
+        try:
+            user = get_user_by_username(user_id, CustomUser.objects.select_for_update(of=('self',)).select_related('otp_email'))
+        except CustomUser.DoesNotExist:
+            return Response({'status': 'error', 'message': 'User ID not found!'}, status=404)
+
+        if not user.email:
+            return Response({'status': 'error', 'message': 'No email registered for this ID. Contact Admin.'}, status=400)
+
+        # De-duplicate: an OTP requested moments ago is still valid and still being delivered
+        recent = user.otp_created_at and timezone.now() - user.otp_created_at < OTP_RESEND_COOLDOWN
+        if recent and user.otp_email and user.otp_email.status != 'dead':
+            return Response({
+                'status': 'success',
+                'message': f'OTP already sent to {user.email}',
+                'delivery': OTP_DELIVERY_STATUS[user.otp_email.status],
+            })
+
+        # 2. Generate 6-Digit OTP
+        otp = str(random.randint(100000, 999999))
+
+        # 3. Queue the Email (delivered by `manage.py send_outbox`, not on this request)
+        subject = "Password Reset OTP - Grievance System"
+        message = f"""
 Hello {user.first_name},
 
 You requested to reset your password.
@@ -517,23 +1279,43 @@ This code is valid for 10 minutes.
 
 If you did not request this, please ignore this email.
     """
-    
+        outbox = EmailOutbox.enqueue(subject, message, [user.email])
+
+        # 4. Save OTP to DB
+        user.otp_code = otp
+        user.otp_created_at = timezone.now()
+        user.otp_email = outbox
+        user.save(update_fields=['otp_code', 'otp_created_at', 'otp_email'])
+
+    return Response({'status': 'success', 'message': f'OTP sent to {user.email}', 'delivery': 'queued'})
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def otp_status_api(request):
+    user_id = request.GET.get('id')
     try:
-        send_mail(subject, message, settings.EMAIL_HOST_USER, [user.email])
-        return Response({'status': 'success', 'message': f'OTP sent to {user.email}'})
-    except Exception as e:
-        return Response({'status': 'error', 'message': 'Failed to send email. Check server logs.'}, status=500)
+        user = get_user_by_username(user_id, CustomUser.objects.select_related('otp_email'))
+    except CustomUser.DoesNotExist:
+        return Response({'status': 'error', 'message': 'User ID not found!'}, status=404)
+
+    if user.otp_email is None:
+        return Response({'status': 'error', 'message': 'No OTP has been requested.'}, status=404)
+
+    return Response({'status': 'success', 'delivery': OTP_DELIVERY_STATUS[user.otp_email.status]})
 
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes(HASHING_THROTTLES)
+@limit_hashing
 def reset_password_with_otp(request):
     user_id = request.data.get('id')
     otp_input = request.data.get('otp')
     new_password = request.data.get('new_password')
 
     try:
-        user = CustomUser.objects.get(username__iexact=user_id)
+        user = get_user_by_username(user_id)
     except CustomUser.DoesNotExist:
         return Response({'status': 'error', 'message': 'User ID not found!'}, status=404)
 
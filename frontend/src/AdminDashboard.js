@@ -34,6 +34,21 @@ ChartJS.register(
 
 // API CONFIG
 const API_BASE = 'https://grievancemanagementsystemrguktnuzvid.onrender.com/api';
+// Grievance Log rows fetched per "Load more" (the server caps it at 200)
+const GRIEVANCE_PAGE_SIZE = 50;
+
+// Does this authority answer for grievances of department category `dept`?
+const handlesDepartment = (auth, dept) => {
+  if (!dept) return false;
+  // DIRECTOR handles ONLY 'Ragging'
+  if (auth.designation === 'DIRECTOR') return dept.startsWith('Ragging');
+  // AO handles 'Administration' AND 'Others'
+  if (auth.designation === 'AO' || auth.designation === 'Administrative Officer') {
+    return dept.startsWith('Administration') || dept.startsWith('Others');
+  }
+  // Standard Departments (Hostel, Mess, Academic, etc.)
+  return dept.startsWith(auth.department);
+};
 
 function AdminDashboard() {
   // ... (State Management - largely same, just updated studentForm logic)
@@ -55,6 +70,9 @@ function AdminDashboard() {
   const [students, setStudents] = useState([]);      
   const [authorities, setAuthorities] = useState([]); 
   const [allGrievances, setGrievances] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [deptTotals, setDeptTotals] = useState([]);           // /stats/performance/?group_by=department
+  const [monthlyResolved, setMonthlyResolved] = useState([]); // /stats/trends/ series for selectedYear
   const [isLoading, setIsLoading] = useState(false);
 
   // --- VIEW MODAL STATE ---
@@ -162,34 +180,15 @@ function AdminDashboard() {
 
   // --- DATA PROCESSING HELPERS ---
   
-  // 1. Process Data for Global Graph (Month-wise Resolved)
-  const getMonthlyResolvedData = (year, dept = null, designation = null) => {
+  // 1. Process Data for Global Graph (Month-wise Resolved; pass an authority for their share)
+  const getMonthlyResolvedData = (auth = null) => {
     const months = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'];
     const data = new Array(12).fill(0);
 
-    allGrievances.forEach(g => {
-        const d = new Date(g.resolved_at || g.created_at);
-        const isResolved = g.status === 'Resolved';
-        const matchesYear = d.getFullYear() === parseInt(year);
-        
-        // --- FIXED FILTERING LOGIC ---
-        let matchesCategory = true;
-
-        if (dept) { // If we are in the Modal View (Specific Authority)
-            if (designation === 'DIRECTOR') {
-                matchesCategory = g.category.startsWith('Ragging');
-            } 
-            else if (designation === 'AO' || designation === 'Administrative Officer') {
-                matchesCategory = g.category.startsWith('Administration') || g.category.startsWith('Others');
-            } 
-            else {
-                matchesCategory = g.category.startsWith(dept);
-            }
-        }
-
-        if (isResolved && matchesYear && matchesCategory) {
-            data[d.getMonth()]++;
-        }
+    monthlyResolved.forEach(row => {
+        if (auth && !handlesDepartment(auth, row.department)) return;
+        // bucket is "YYYY-MM-01"; read the month directly so the local timezone can't shift it
+        data[parseInt(row.bucket.slice(5, 7), 10) - 1] += row.count;
     });
     return { labels: months, datasets: [{ label: 'Resolved Cases', data, backgroundColor: '#3b82f6', borderRadius: 4 }] };
   };
@@ -198,16 +197,14 @@ function AdminDashboard() {
   const getDeptPieData = () => {
     const depts = { 'Hostel': 0, 'Mess': 0, 'Academic': 0, 'Hospital': 0, 'Sports': 0, 'Administration': 0 };
     
-    allGrievances.forEach(g => {
-        if (g.status === 'Resolved') {
-            let cat = g.category.split(' - ')[0]; // Get main category
-            if (['Hostel', 'Mess', 'Academic', 'Hospital'].includes(cat)) {
-                depts[cat]++;
-            } else if (cat.startsWith('Sports')) {
-                depts['Sports']++;
-            } else {
-                depts['Administration']++; // "Others" mapped to Administration
-            }
+    deptTotals.forEach(row => {
+        const cat = row.department || '';
+        if (['Hostel', 'Mess', 'Academic', 'Hospital'].includes(cat)) {
+            depts[cat] += row.resolved;
+        } else if (cat.startsWith('Sports')) {
+            depts['Sports'] += row.resolved;
+        } else {
+            depts['Administration'] += row.resolved; // "Others" mapped to Administration
         }
     });
 
@@ -223,26 +220,13 @@ function AdminDashboard() {
 
   // 3. Authority Modal Logic (Calculates Stats on Click)
   const openAuthorityStats = (auth) => {
-    const authGrievances = allGrievances.filter(g => {
-        
-        // CASE 1: DIRECTOR (Handles ONLY 'Ragging')
-        if (auth.designation === 'DIRECTOR') {
-            return g.category.startsWith('Ragging');
-        }
+    const rows = deptTotals.filter(row => handlesDepartment(auth, row.department));
+    const sum = (key) => rows.reduce((total, row) => total + row[key], 0);
 
-        // CASE 2: AO (Handles 'Administration' AND 'Others')
-        if (auth.designation === 'AO' || auth.designation === 'Administrative Officer') {
-            return g.category.startsWith('Administration') || g.category.startsWith('Others');
-        }
-
-        // CASE 3: Standard Departments (Hostel, Mess, Academic, etc.)
-        return g.category.startsWith(auth.department);
-    });
-
-    const total = authGrievances.length;
-    const resolved = authGrievances.filter(g => g.status === 'Resolved').length;
-    const escalated = authGrievances.filter(g => g.status === 'Escalated').length;
-    const pending = authGrievances.filter(g => g.status === 'Pending').length;
+    const total = sum('total');
+    const resolved = sum('resolved');
+    const escalated = sum('escalated');
+    const pending = sum('pending');
     const rate = total === 0 ? 0 : Math.round((resolved / total) * 100);
 
     setSelectedAuthorityStats({
@@ -354,7 +338,7 @@ function AdminDashboard() {
                 fetchStats(),
                 fetchStudents(false), 
                 fetchAuthorities(false), 
-                fetchAllGrievances(false)
+                fetchDeptTotals()
             ]);
         } catch (e) {
             console.error("Error loading initial data", e);
@@ -373,6 +357,15 @@ function AdminDashboard() {
     return () => window.removeEventListener('storage', handleStorageChange);
   }, [navigate, systemTheme]);
 
+  // Grievance Log: first page again whenever a server-side filter changes
+  useEffect(() => {
+    fetchGrievances();
+  }, [statusFilter, categoryFilter, dateFilter]);
+
+  useEffect(() => {
+    fetchMonthlyResolved(selectedYear);
+  }, [selectedYear]);
+
 
   // --- API FUNCTIONS ---
   // --- 1. Fetch Stats (Dashboard Home) ---
@@ -403,19 +396,43 @@ function AdminDashboard() {
     finally { if (showLoading) setIsLoading(false); }
   };
 
-  // --- 4. Fetch Grievances ---
-  const fetchAllGrievances = async (showLoading = true) => {
-    if (showLoading) setIsLoading(true);
+  // --- 4. Fetch Grievances (one page; pass the cursor to append the next) ---
+  const fetchGrievances = async (cursor = null) => {
+    if (!cursor) setIsLoading(true);
+    const params = { role: 'admin', limit: GRIEVANCE_PAGE_SIZE };
+    if (statusFilter !== 'All') params.status = statusFilter;
+    if (categoryFilter !== 'All') params.department_category = categoryFilter;
+    if (dateFilter) { params.date_from = dateFilter; params.date_to = dateFilter; }
+    if (cursor) params.cursor = cursor;
     try {
-        const res = await axios.get(`${API_BASE}/grievances/?role=admin`);
-        setGrievances(res.data); 
+        const res = await axios.get(`${API_BASE}/grievances/`, { params });
+        setGrievances(prev => cursor ? [...prev, ...res.data.results] : res.data.results);
+        setNextCursor(res.data.next_cursor);
     } catch (error) { 
         console.error("Error fetching grievances:", error); 
     } finally { 
-        if (showLoading) setIsLoading(false);
+        if (!cursor) setIsLoading(false);
     }
   };
 
+  // --- 5. Fetch Chart Data (aggregated on the server) ---
+  const fetchDeptTotals = async () => {
+    try {
+        const res = await axios.get(`${API_BASE}/stats/performance/?group_by=department`);
+        setDeptTotals(res.data);
+    } catch (error) { console.error("Error fetching department totals:", error); }
+  };
+
+  const fetchMonthlyResolved = async (year) => {
+    try {
+        const res = await axios.get(`${API_BASE}/stats/trends/`, { params: {
+            date_from: `${year}-01-01`, date_to: `${year}-12-31`,
+            granularity: 'month', group_by: 'department', status: 'Resolved'
+        } });
+        setMonthlyResolved(res.data.series);
+    } catch (error) { console.error("Error fetching monthly resolutions:", error); }
+  };
+
   const handleLogout = () => {
     localStorage.removeItem('admin_token');
     navigate('/admin-login'); 
@@ -720,34 +737,10 @@ function AdminDashboard() {
     }
   };
 
-  // 2. Export Data to CSV
+  // 2. Export Data to CSV (streamed by the server, every row)
   const exportGrievancesCSV = () => {
-    if (!allGrievances.length) { alert("No data to export."); return; }
-
-    // Define Headers
-    const headers = ["ID", "Student ID", "Category", "Description", "Status", "Date", "Resolved Date"];
-    
-    // Map Data
-    const rows = allGrievances.map(g => [
-        g.id,
-        g.student_id,
-        `"${g.category}"`, // Quote to handle commas in text
-        `"${g.description.replace(/"/g, '""')}"`, // Escape quotes
-        g.status,
-        new Date(g.created_at).toLocaleDateString(),
-        g.resolved_at ? new Date(g.resolved_at).toLocaleDateString() : "-"
-    ]);
-
-    // Build CSV String
-    const csvContent = "data:text/csv;charset=utf-8," 
-        + headers.join(",") + "\n" 
-        + rows.map(e => e.join(",")).join("\n");
-
-    // Trigger Download
-    const encodedUri = encodeURI(csvContent);
     const link = document.createElement("a");
-    link.setAttribute("href", encodedUri);
-    link.setAttribute("download", `Grievance_Report_${new Date().toISOString().slice(0,10)}.csv`);
+    link.setAttribute("href", `${API_BASE}/grievances/export/?role=admin`);
     document.body.appendChild(link);
     link.click();
     document.body.removeChild(link);
@@ -813,7 +806,7 @@ function AdminDashboard() {
                 {chartView === 'graph' ? (
                     /* --- MAIN GRAPH (No Department Filter) --- */
                     <Bar 
-                        data={getMonthlyResolvedData(selectedYear)} 
+                        data={getMonthlyResolvedData()} 
                         options={{
                             responsive: true, 
                             maintainAspectRatio: false,
@@ -915,12 +908,7 @@ function AdminDashboard() {
                     <div style={{height: "250px", width: "100%"}}>
                         <h5 style={{marginBottom: "10px", color: "#64748b"}}>Monthly Performance ({selectedYear})</h5>
                         <Bar 
-                            /* --- THIS IS WHERE THE ERROR WAS HAPPENING --- */
-                            data={getMonthlyResolvedData(
-                                selectedYear, 
-                                selectedAuthorityStats.department, 
-                                selectedAuthorityStats.designation
-                            )}
+                            data={getMonthlyResolvedData(selectedAuthorityStats)}
                             options={{
                                 responsive: true, maintainAspectRatio: false,
                                 plugins: { legend: { display: false } },
@@ -1055,29 +1043,13 @@ function AdminDashboard() {
   );
 
   const renderGrievanceLog = () => {
-    // --- ADVANCED FILTERING LOGIC ---
-    const filteredGrievances = allGrievances.filter(g => {
-        // 1. Text Search (ID or Student ID)
-        const matchesSearch = 
-            (g.category && g.category.toLowerCase().includes(searchTerm.toLowerCase())) || 
-            (g.student_id && g.student_id.toLowerCase().includes(searchTerm.toLowerCase())) ||
-            g.id.toString().includes(searchTerm);
-
-        // 2. Status Filter
-        const matchesStatus = statusFilter === 'All' || g.status === statusFilter;
-
-        // 3. Category Filter
-        const matchesCategory = categoryFilter === 'All' || g.category.startsWith(categoryFilter);
-
-        // 4. Date Filter
-        let matchesDate = true;
-        if (dateFilter) {
-            const gDate = new Date(g.created_at).toISOString().split('T')[0];
-            matchesDate = gDate === dateFilter;
-        }
-
-        return matchesSearch && matchesStatus && matchesCategory && matchesDate;
-    });
+    // Status, department and date are filtered by the server (fetchGrievances);
+    // the search box narrows the pages loaded so far
+    const filteredGrievances = allGrievances.filter(g =>
+        (g.category && g.category.toLowerCase().includes(searchTerm.toLowerCase())) || 
+        (g.student_id && g.student_id.toLowerCase().includes(searchTerm.toLowerCase())) ||
+        g.id.toString().includes(searchTerm)
+    );
 
     return (
         <div className="fade-in">
@@ -1114,7 +1086,7 @@ function AdminDashboard() {
                     <option value="Mess">Mess</option>
                     <option value="Academic">Academic</option>
                     <option value="Hospital">Hospital</option>
-                    <option value="Sports">Sports/Gym</option>
+                    <option value="Sports/Gym">Sports/Gym</option>
                     <option value="Ragging">Ragging</option>
                     <option value="Others">Others</option>
                 </select>
@@ -1141,7 +1113,7 @@ function AdminDashboard() {
 
             {/* --- RESULTS COUNT --- */}
             <div style={{marginBottom: '15px', color: '#64748b', fontSize: '0.9rem', fontWeight: '500'}}>
-                Showing {filteredGrievances.length} results
+                Showing {filteredGrievances.length} results{nextCursor ? " (load more for older)" : ""}
             </div>
 
             {/* --- TABLE CARD --- */}
@@ -1210,6 +1182,15 @@ function AdminDashboard() {
                     </table>
                 )}
             </div>
+
+            {/* --- NEXT PAGE --- */}
+            {!isLoading && nextCursor && (
+                <div style={{textAlign: 'center', marginTop: '15px'}}>
+                    <button className="login-btn" style={{width: 'auto', padding: '8px 20px'}} onClick={() => fetchGrievances(nextCursor)}>
+                        Load more
+                    </button>
+                </div>
+            )}
         </div>
     );
   };
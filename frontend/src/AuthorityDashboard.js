@@ -84,13 +84,14 @@ const [isProfileDropdownOpen, setIsProfileDropdownOpen] = useState(false);
     return () => window.removeEventListener('storage', handleStorageChange);
   }, [navigate]);
 
+  // The auth token tells the server who we are: no need to download every authority
+  const authHeaders = () => ({ headers: { 'Authorization': `Token ${localStorage.getItem('authority_token')}` } });
+
   const fetchAuthorityProfile = async (empId) => {
       try {
-          const res = await axios.get(`${API_BASE}/authorities/`);
-          // Filter client-side to find *this* authority
-          const myProfile = res.data.find(a => a.employee_id === empId);
-          if (myProfile) {
-              setFullProfile(myProfile);
+          const res = await axios.get(`${API_BASE}/me/`, authHeaders());
+          if (res.data.profile) {
+              setFullProfile(res.data.profile);
           }
       } catch (error) {
           console.error("Error fetching profile:", error);
@@ -137,7 +138,7 @@ const [isProfileDropdownOpen, setIsProfileDropdownOpen] = useState(false);
 
   const fetchGrievances = async (empId) => {
       try {
-          const res = await axios.get(`${API_BASE}/grievances/?role=authority&user_id=${empId}`);
+          const res = await axios.get(`${API_BASE}/me/grievances/`, authHeaders());
           const allData = res.data;
           
           const pending = allData.filter(g => g.status === 'Pending');
@@ -121,12 +121,14 @@ function StudentDashboard() {
     };
   }, [navigate]);
 
+  // The auth token tells the server who we are: no need to download every student
+  const authHeaders = () => ({ headers: { 'Authorization': `Token ${localStorage.getItem('student_token')}` } });
+
   const fetchFullProfile = async (studentId) => {
     try {
-        const response = await axios.get(`${API_BASE}/students/`);
-        const myProfile = response.data.find(s => s.student_id === studentId);
-        if (myProfile) {
-            setFullProfile(myProfile);
+        const response = await axios.get(`${API_BASE}/me/`, authHeaders());
+        if (response.data.profile) {
+            setFullProfile(response.data.profile);
         }
     } catch (error) {
         console.error("Error fetching profile details", error);
@@ -136,7 +138,7 @@ function StudentDashboard() {
   const fetchUserGrievances = async (studentId) => {
     setIsLoading(true); // 1. Start Loading
     try {
-        const response = await axios.get(`${API_BASE}/grievances/?role=student&user_id=${studentId}`);
+        const response = await axios.get(`${API_BASE}/me/grievances/`, authHeaders());
         setRealGrievances(response.data);
     } catch (error) { 
         console.error("Error fetching grievances", error); 